@@ -0,0 +1,246 @@
+"""
+Description:    This python file benchmarks the canvas' rendering performance.
+                A generated project is loaded into an offscreen window, and the repaint cost per CanvasItem is measured.
+
+                Run from the Inspire Canvas root folder:
+                    python Benchmarks/canvasBenchmark.py [benchmark name] [--items N] [--frames N]
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# --Imports--
+import argparse
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))     # Allow imports from the Inspire Canvas root folder
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+#PySide
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+from PySide6.QtCore import *
+
+from Utility import StartupProfiler, ConsoleLog
+from Utility.ManageJSON import *
+from inspireCanvasMain import MainWindow
+from UI_Components.Canvas.CanvasUtility.RenderCache import ReservePixmapCache
+
+StartupProfiler.Stop()  # Importing inspireCanvasMain starts the startup profiler
+ConsoleLog.softwareLogLocation = os.path.join(tempfile.gettempdir(), "inspireCanvasBenchmark.log")  # Benchmark runs do not write to the app's log
+
+
+# ----- Setup -----
+def CreateTestImages(folder: str, count: int, size = QSize(800, 600)):
+    """Create images used by the benchmark project
+
+    Returns:
+        str[]: paths to the created images
+    """
+    imagePaths = []
+    for i in range(count):
+        image = QImage(size, QImage.Format_RGB888)
+        image.fill(QColor.fromHsv((i * 37) % 360, 160, 200))
+        imagePath = os.path.join(folder, "image_" + str(i) + ".png")
+        image.save(imagePath)
+        imagePaths.append(imagePath)
+    return imagePaths
+
+def CreateTestProject(imagePaths, textCount: int, columns = 20, spacing = 700):
+    """Create project data with the passed images and textCount text nodes laid out in a grid
+
+    Returns:
+        dict: project data that can be passed to MainContent.LoadProject
+    """
+    nodes = [CreateImageData(imagePath) for imagePath in imagePaths]
+    nodes += [CreateTextData("Benchmark text " + str(i) + "\nSecond line of text") for i in range(textCount)]
+
+    canvasItems = []
+    for i, node in enumerate(nodes):
+        position = QPointF(1000 + (i % columns) * spacing, 1000 + (i // columns) * spacing)
+        canvasItems.append(CreateCIData(node["nodeID"], position, 0.5))
+
+    tabID = GenerateID()
+    tab = CreateTabData("Benchmark", tabID, canvasItems, viewportPos = [0, 0], viewportZoom = 0.1)
+    return NewProjectData("Benchmark", tabID, [100000,100000], [tab], nodes)["Project"]
+
+def CreateBenchmarkWindow(itemCount: int):
+    """Create an offscreen window with a loaded benchmark project. Half of the items are images, half are text.
+
+    Returns:
+        (MainWindow, TemporaryDirectory): The window, and the folder containing the test images. The folder is deleted when it is garbage collected.
+    """
+    imageFolder = tempfile.TemporaryDirectory()
+    imagePaths = CreateTestImages(imageFolder.name, itemCount // 2)
+
+    window = MainWindow()
+    window.resize(1600, 1000)
+    window.show()
+    window.mainContent.LoadProject(JSONData = CreateTestProject(imagePaths, itemCount - len(imagePaths)))
+    while window.mainContent.canvas.isLoadingTab:   # Files of the tab are checked on a background thread before the CanvasItems are created
+        QApplication.processEvents(QEventLoop.AllEvents, 50)
+    QApplication.processEvents()
+
+    return window, imageFolder
+
+def TimeFunction(function, repeat: int):
+    """Returns the average time in milliseconds to call function"""
+    start = perf_counter()
+    for i in range(repeat):
+        function()
+    return (perf_counter() - start) * 1000 / repeat
+
+
+# ----- Benchmarks -----
+def BenchmarkRepaint(itemCount: int, frames: int):
+    """Measure the time to repaint the whole viewport, and the cost per visible CanvasItem"""
+    window, imageFolder = CreateBenchmarkWindow(itemCount)
+    canvas = window.mainContent.canvas
+    visibleItems = len(canvas.GetCanvasItemsFromList(canvas.items(canvas.viewport().rect())))
+
+    frameTime = TimeFunction(canvas.viewport().repaint, frames)
+    print("Repaint: {:.2f} ms per frame, {:.4f} ms per item ({} visible items)".format(frameTime, frameTime / max(visibleItems, 1), visibleItems))
+
+def BenchmarkPaintQueries(itemCount: int, frames: int):
+    """Compare the per item cost of calculating the visible rect and zoom in paint(), with reading them from the render context.
+    Both versions map the visible rect with the same call (mapRectFromScene), so only the cost of calculating the visible rect and zoom is compared."""
+    window, imageFolder = CreateBenchmarkWindow(itemCount)
+    canvas = window.mainContent.canvas
+    items = canvas.canvasItems
+
+    def PerItemQueries():   # Without the render context: each item calculates the visible rect and zoom
+        for item in items:
+            item.mapRectFromScene(canvas.GetVisibleScreenRect())
+            canvas.GetZoomScale()
+
+    def RenderContextQueries(): # With the render context: the visible rect and zoom are calculated once per frame
+        canvas.renderContext.Update(canvas)
+        context = canvas.renderContext
+        for item in items:
+            item.mapRectFromScene(context.visibleSceneRect)
+            context.zoomScale
+
+    perItemTime = TimeFunction(PerItemQueries, frames)
+    renderContextTime = TimeFunction(RenderContextQueries, frames)
+    print("Per item queries:       {:.4f} ms per item".format(perItemTime / len(items)))
+    print("Render context queries: {:.4f} ms per item ({:.1f}x faster)".format(renderContextTime / len(items), perItemTime / max(renderContextTime, 1e-9)))
+
+
+def BenchmarkImageFormats(itemCount: int, frames: int):
+    """Compare the cost of drawing images in the formats they are loaded in, with drawing them after PrepareImage converted them"""
+    from Utility.ImageLoader import PrepareImage
+
+    target = QImage(1600, 1000, QImage.Format_ARGB32_Premultiplied)
+    source = QImage(800, 600, QImage.Format_RGB888)
+    source.fill(QColor(120, 160, 200))
+    loadedFormats = {
+        "Indexed8": source.convertToFormat(QImage.Format_Indexed8),
+        "RGB888": source,
+        "ARGB32": source.convertToFormat(QImage.Format_ARGB32),
+    }
+
+    def DrawImage(image):
+        painter = QPainter(target)
+        for i in range(itemCount):
+            painter.drawImage(QPointF((i * 37) % 800, (i * 23) % 400), image)
+        painter.end()
+
+    for name, image in loadedFormats.items():
+        prepared = PrepareImage(image)
+        loadedTime = TimeFunction(lambda: DrawImage(image), frames)
+        preparedTime = TimeFunction(lambda: DrawImage(prepared), frames)
+        print("{:9} {:.4f} ms per paint, prepared: {:.4f} ms per paint ({:.1f}x faster)".format(name, loadedTime / itemCount, preparedTime / itemCount, loadedTime / max(preparedTime, 1e-9)))
+
+def BenchmarkPlacement(itemCount: int, frames: int, timeBudget: float = 1):
+    """Measure the time to find free space for a new CanvasItem, on a board of randomly placed items and on a fully packed grid of items.
+    Run with --items 10000 for dense 10k item boards.
+
+    Args:
+        timeBudget (float, optional): max average time in ms to find free space for an item. 95% of items must also be placed within it. Defaults to 1.
+    """
+    from random import Random
+    from UI_Components.Canvas.CanvasUtility.Placement import PlacementGrid
+
+    random = Random(0)
+    boardSize = (itemCount * 90000) ** 0.5  # 10000 items of 200-800 pixels cover a 30000x30000 board about 3 times
+    randomRects = [QRectF(random.uniform(0, boardSize), random.uniform(0, boardSize), random.uniform(200, 800), random.uniform(200, 800)) for i in range(itemCount)]
+    columns = max(1, round(itemCount ** 0.5))
+    packedRects = [QRectF((i % columns) * 620, (i // columns) * 420, 600, 400) for i in range(itemCount)]  # No gaps, so every new item is placed outside the grid
+
+    for name, rects, boardWidth, boardHeight in (("Random", randomRects, boardSize, boardSize), ("Packed", packedRects, columns * 620, (itemCount + columns - 1) // columns * 420)):
+        buildStart = perf_counter()
+        grid = PlacementGrid()
+        for i, rect in enumerate(rects):
+            grid.Insert(i, rect)
+        buildTime = (perf_counter() - buildStart) * 1000
+
+        placeTimes = []
+        for i in range(frames):     # New items dropped at random positions on the board
+            newRect = QRectF(random.uniform(0, boardWidth), random.uniform(0, boardHeight), random.uniform(200, 800), random.uniform(200, 800))
+            placeStart = perf_counter()
+            grid.FindFreePosition(newRect)
+            placeTimes.append((perf_counter() - placeStart) * 1000)
+
+        updateTime = TimeFunction(lambda: grid.Insert(random.randrange(itemCount), QRectF(random.uniform(0, boardWidth), random.uniform(0, boardHeight), 600, 400)), frames)  # Move an item
+        averageTime, slowTime = sum(placeTimes) / len(placeTimes), sorted(placeTimes)[int(len(placeTimes) * 0.95)]
+        print("{:6} build grid: {:.2f} ms ({} items), find free position: {:.3f} ms average, {:.3f} ms 95th percentile, {:.3f} ms worst, move item: {:.4f} ms".format(
+            name, buildTime, itemCount, averageTime, slowTime, max(placeTimes), updateTime))
+        assert averageTime < timeBudget, "{} board: finding free space takes {:.3f} ms per item on average, over the {} ms budget".format(name, averageTime, timeBudget)
+        assert slowTime < timeBudget, "{} board: 5% of items take over {:.3f} ms to place, over the {} ms budget".format(name, slowTime, timeBudget)
+
+def BenchmarkText(itemCount: int, frames: int):
+    """Measure the time to lay out the static text of text CanvasItems, and check that multi-line text is drawn and sized on separate lines"""
+    from UI_Components.Canvas.CanvasItem.text_CanvasItem import TextCanvasItem, textMargin
+
+    window, imageFolder = CreateBenchmarkWindow(itemCount)
+    textItems = [item for item in window.mainContent.canvas.canvasItems if isinstance(item, TextCanvasItem)]
+
+    for item in textItems:  # The item is sized like the editor (QTextDocument), which breaks lines at newlines
+        document = QTextDocument()
+        document.setDefaultFont(item.font())
+        document.setDocumentMargin(textMargin)
+        document.setPlainText(item.nodeText)
+        lineCount = item.nodeText.count("\n") + 1
+        lineHeight = QFontMetricsF(item.font()).height()
+        assert item.boundingRect().height() >= lineCount * lineHeight, "Text CanvasItem is not sized for {} lines".format(lineCount)
+        assert abs(item.boundingRect().height() - document.size().height()) <= lineHeight / 2, "Text CanvasItem height {:.1f} does not match the editor height {:.1f}".format(item.boundingRect().height(), document.size().height())
+
+    item = textItems[0]     # Check that the second line is drawn below the first line
+    size = item.boundingRect().size().toSize()
+    image = QImage(size, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    item.paint(painter, QStyleOptionGraphicsItem(), None)
+    painter.end()
+    textRows = [y for y in range(size.height()) if any(QColor(image.pixel(x, y)).red() > 128 for x in range(size.width()))]
+    assert len(textRows) > 0 and textRows[-1] > textMargin + QFontMetricsF(item.font()).height(), "Multi-line text is drawn on a single line"
+
+    layoutTime = TimeFunction(lambda: [item.SetStaticText(item.nodeText) for item in textItems], frames)
+    print("Text layout: {:.4f} ms per item ({} multi-line text items, sizes match the editor)".format(layoutTime / max(len(textItems), 1), len(textItems)))
+
+
+benchmarks = {
+    "repaint": BenchmarkRepaint,
+    "paintQueries": BenchmarkPaintQueries,
+    "imageFormats": BenchmarkImageFormats,
+    "placement": BenchmarkPlacement,
+    "text": BenchmarkText,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspire Canvas rendering benchmarks")
+    parser.add_argument("benchmark", nargs="?", choices=list(benchmarks.keys()), help="benchmark to run. Runs every benchmark if not passed")
+    parser.add_argument("--items", type=int, default=400, help="number of CanvasItems in the benchmark project")
+    parser.add_argument("--frames", type=int, default=50, help="number of frames to average")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    ReservePixmapCache()
+
+    for name, benchmark in benchmarks.items():
+        if args.benchmark == None or args.benchmark == name:
+            print("----- " + name + " -----")
+            benchmark(args.items, args.frames)
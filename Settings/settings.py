@@ -37,4 +37,41 @@ minMaxZoom = [0.01, 10]
 cornerResizeButtonRadius = 4
 minimumImageSize = [100, 100]   # pixels
 defaultImageSize = QSizeF(600, 600)   # Sets the default size of a dragged in image. This ensures that images that are too big default to a smaller size
-imageFileTypes = [".jpg", ".png", ".jpeg", ".bmp", ".gif", ".webp"]
\ No newline at end of file
+imageFileTypes = [".jpg", ".png", ".jpeg", ".bmp", ".gif", ".webp"]
+
+# Performance
+startupImportBudget = 0.75  # seconds. If startup imports take longer than this, a warning is logged (See Utility/StartupProfiler.py)
+interactionIdleTime = 150   # ms. While panning, zooming or dragging, items are drawn in low quality. Full quality is restored after this amount of time without interaction
+interactivePreviewSize = 512    # pixels. Max size of the low resolution image that is drawn while interacting with the canvas
+renderCacheZoomBands = [0.25, 2]    # Zoom levels where the CanvasItem cache mode changes (See UI_Components/Canvas/CanvasUtility/RenderCache.py)
+renderCacheLimit = 65536    # KB. Max memory used by CanvasItem render caches
+tiledImageThreshold = 8192  # pixels. Images wider or taller than this are decoded and drawn in tiles (See UI_Components/Canvas/CanvasUtility/TiledImage.py)
+imageTileSize = 512         # pixels. Width and height of an image tile
+imageTileMemoryLimit = 256  # Max number of decoded tiles kept in memory per image
+imageTileCacheEnabled = True    # Store decoded tiles on disk, so very large images do not need to be decoded again
+imageTileCacheLocation = "Data/TileCache"
+imageTileCacheLimit = 2048  # MB. Max size of the disk tile cache. Least recently used images are removed first
+imageTileCacheMaxAge = 30   # days. Tiles of images that have not been drawn for this long are removed from the disk cache
+imageFullDecodeLimit = 512  # MB. Max memory used to decode a tiled image whose format can not be decoded in parts (i.e. PNG). Larger images are not displayed
+animationTimerInterval = 20     # ms. Interval of the timer that steps every visible animated image (See UI_Components/Canvas/CanvasUtility/AnimationManager.py)
+animationFrameLimit = 512   # Max number of frames decoded per animated image
+fileIconResolveTime = 8   # ms. Time spent resolving file icons per event loop, so many FileCanvasItems do not block the GUI (See Utility/FileIconService.py)
+fileStatTTL = 30    # seconds. Time a file's cached existence and metadata is used before the file is checked again (See Utility/FileMetadata.py)
+fileStatWorkers = 16    # Number of threads used to check the files of a tab in parallel
+assetWatchDebounce = 300  # ms. Changes to watched files are collected for this amount of time before the changed files are reloaded (See UI_Components/Canvas/CanvasUtility/AssetWatcher.py)
+bulkImportWorkers = max(1, QThread.idealThreadCount() - 1)  # Number of processes used to read images when importing many images (See Utility/BulkImport.py)
+bulkImportProcessThreshold = 16     # Imports with fewer images than this read the images on threads, as starting processes is slow
+bulkImportDialogDelay = 500 # ms. The import progress dialog is only displayed if the import takes longer than this
+bulkImportSpacing = 40      # pixels. Space between imported images
+placementCellSize = 512     # pixels. Cell size of the grid used to find free space for new CanvasItems (See UI_Components/Canvas/CanvasUtility/Placement.py)
+placementSpacing = 20       # pixels. Space kept between new CanvasItems and the CanvasItems on the canvas
+placementOccupancyCellSize = 128   # pixels. Cell size of the occupancy rows searched for free blocks around a new CanvasItem
+placementSearchDistance = 4096  # pixels. Max distance searched for free space between CanvasItems. Further away, new CanvasItems are placed at the edge of the occupied area
+textEditUpdateInterval = 16 # ms. While typing, text CanvasItems are resized at most once per interval (See UI_Components/Canvas/CanvasItem/text_CanvasItem.py)
+filterDimOpacity = 0.15     # Opacity of CanvasItems that do not match the filter (See Utility/MetadataIndex.py)
+searchResultLimit = 500     # Max number of nodes found by a search (See Utility/SearchIndex.py)
+searchDelay = 150   # ms. The search bar searches once typing pauses for this amount of time
+autosaveInterval = 60000    # ms. Time between autosaves of a modified project to a separate autosave file, the project file is only written when saved. 0 disables autosave
+duplicateImageDistance = 6  # Max number of bits that differ between the hashes of near-duplicate images (See Utility/ImageHash.py)
+arrangeSpacing = 20         # pixels. Space between CanvasItems arranged in a grid, masonry, or packed layout (See UI_Components/Canvas/CanvasUtility/Arrange.py)
+snapDistance = 6            # screen pixels. Dragged CanvasItems snap to the edges and centers of visible CanvasItems within this distance. Hold Alt to drag without snapping (See UI_Components/Canvas/CanvasUtility/SnapGuides.py)
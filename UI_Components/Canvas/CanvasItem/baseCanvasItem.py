@@ -49,6 +49,8 @@ class CanvasItem(QGraphicsWidget):
         self.initialScale = self.GetScale()
         self.canDrag = True
         self.initialPos = self.scenePos() # This is the offset used when items are moved
+        self.isDirty = False    # If self was moved, scaled or edited since its data was last written to the database
+        self.isValid = True     # Set to False by subclasses if their file can not be loaded. Invalid CanvasItems are not added to the canvas (See MainCanvas.InsertCanvasItem)
 
         # INIT
         self.setPos(self.itemPos)
@@ -78,6 +80,7 @@ class CanvasItem(QGraphicsWidget):
         tempPadding = self.itemPadding/self.scale()/self.GetScale()
         self.itemRect = QRectF(tempPadding/2, tempPadding/2, rect.width() +  -tempPadding, rect.height() -tempPadding)
         self.setGeometry(rect)
+        self.mainCanvas.PlacementItemChanged(self)  # i.e. an image was reloaded with a different size
 
     def GetScale(self):
         """ Get and return the scale of this object.
@@ -92,11 +95,11 @@ class CanvasItem(QGraphicsWidget):
     def paint(self, painter, option, widget) -> None:
         painter.save()
 
-        painter.setRenderHint(painter.Antialiasing, True)
+        self.mainCanvas.SetRenderQuality(painter)
 
         # If is selected, Draw the border
         if self.isSelected_:   
-            borderWidth = 1 / self.mainCanvas.GetZoomScale() / self.GetScale()
+            borderWidth = 1 / self.mainCanvas.renderContext.zoomScale / self.GetScale()
             painter.setPen(QPen(QBrush(defaultAccentColor), borderWidth))
             painter.drawRect(self.boundingRect())
 
@@ -104,6 +107,14 @@ class CanvasItem(QGraphicsWidget):
     
         return super().paint(painter, option, widget)
 
+    def canCache(self) -> bool:
+        """Get if the CanvasItem can use a render cache (See RenderCache.py)"""
+        return True
+
+    def GetCachedItems(self):
+        """Get the items that the render cache mode is set on. Subclasses add child items that are slow to paint."""
+        return [self]
+
     def GetIsSelected(self) -> bool:
         """Get if the current item is selected. Returns bool."""
         return self.isSelected_
@@ -116,8 +127,29 @@ class CanvasItem(QGraphicsWidget):
         """
         self.isSelected_ = selected
         self.setCanDrag(True)
+        self.update()   # Redraw the selection border
+
+    def SetDirty(self):
+        """Mark that the user changed self (i.e. moved, scaled, or edited), so its data is written by SaveChanges"""
+        self.isDirty = True
+
+    def SaveChanges(self):
+        """Write the data of self to the database, if self was changed. The project is marked as modified.
+
+        Returns:
+            bool: If the data was written
+        """
+        if not self.isDirty:
+            return False
+
+        self.isDirty = False
+        self.SetData()
+        self.mainCanvas.SetModified()
+        return True
 
     def SetData(self):
         """When the user changes data, update the data in the database"""
         self.canvasItemData["itemPos"] = [self.scenePos().x(),self.scenePos().y()]
         self.canvasItemData["itemScale"] = self.GetScale()
+        self.mainCanvas.renderCachePolicy.ItemChanged(self)     # Item may have been edited or scaled
+        self.mainCanvas.PlacementItemChanged(self)
@@ -10,6 +10,7 @@ import os
 
 #Components Used:
 from UI_Components.Canvas.CanvasItem.baseCanvasItem import *  
+from Utility.FileIconService import GetFileIconService
 
 class FileCanvasItem(CanvasItem):
     def __init__(self, parent, canvasItemData) -> None:
@@ -29,30 +30,24 @@ class FileCanvasItem(CanvasItem):
 
         # Properties
         self.fileName = self.GetFileName(self.filePath)
-        self.fileIcon = self.GetFileIcon(self.fileName).pixmap(QSize(50,50),QIcon.Normal,QIcon.On)
 
-        if CheckFileExists(self.filePath) and self.fileIcon != None and self.fileName != None:  # IF file path is valid, and successfully retrieves icon and filename
-            # Icon
+        if CheckFileExists(self.filePath) and self.fileName != None:  # IF file path is valid, and successfully retrieves filename
+            # Icon. A generic icon is drawn until the file's icon is resolved
             self.icon = QGraphicsPixmapItem(self)
-            self.scaled = QPixmap(self.fileIcon).scaled(50,50,Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.icon.setPixmap(self.scaled)
-            self.icon.setPos(12, self.boundingRect().height()/2 - self.icon.boundingRect().height()/2)
+            self.SetIcon(GetFileIconService().GetIcon(self.filePath, self.SetIcon))
 
             ConsoleLog.log("Added FileCanvasItem", "Successfully added File. canvasItem: " + str(self.canvasItemData) + " filePath: " + self.filePath) 
         else:
             ConsoleLog.error("Unable to add ImageCanvasItem", "imagePath is invalid: "  + str(self.canvasItemData) + " filePath: " + self.filePath) 
-           
-            del self.canvasItemData
-            del self.nodeData
-            self.deleteLater()
+            self.isValid = False    # The canvas does not add self
 
 
 
     def paint(self, painter, option, widget) -> None:
-        painter.setRenderHint(painter.Antialiasing, True)
-
         painter.save()
 
+        self.mainCanvas.SetRenderQuality(painter)
+
         # Draw Background
         painter.setBrush(QBrush("black"))
         painter.drawRoundedRect(self.boundingRect(), 5,5)
@@ -70,23 +65,14 @@ class FileCanvasItem(CanvasItem):
         painter.restore()
         return super().paint(painter, option, widget)
 
-    def GetFileIcon(self, filePath) -> QIcon:
-        """Function that gets the icon from a filepath.
+    def SetIcon(self, pixmap: QPixmap):
+        """Set the file icon. Called by the FileIconService when the icon is resolved.
 
         Args:
-            filePath (_type_): _description_
-
-        Returns:
-            QIcon: _description_
+            pixmap (QPixmap): scaled file icon
         """
-        try:
-            fileInfo = QFileInfo(filePath)
-            iconProvider = QFileIconProvider()
-            icon = iconProvider.icon(fileInfo)
-            return icon
-        except:
-            ConsoleLog.error("Unable to access File Icon", str(filePath) + " - This path does not have a valid icon.")
-            return None        
+        self.icon.setPixmap(pixmap)
+        self.icon.setPos(12, self.boundingRect().height()/2 - self.icon.boundingRect().height()/2)
 
     def GetFileName(self, filePath):
         """ Get name of file from filePath
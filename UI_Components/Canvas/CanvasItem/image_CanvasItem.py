@@ -7,6 +7,9 @@ Date Updated: 11/22/22
 
 #Components Used:
 from UI_Components.Canvas.CanvasItem.baseCanvasItem import *  
+from UI_Components.Canvas.CanvasUtility.TiledImage import TiledImage
+from Utility.ImageLoader import *
+from Utility.BackgroundTasks import RunInBackground
 
 class ImageCanvasItem(CanvasItem):
     def __init__(self, parent, canvasItemData) -> None:
@@ -21,48 +24,131 @@ class ImageCanvasItem(CanvasItem):
         self.imagePath = self.nodeData["imagePath"]
 
         # Properties
-        self.imageSize = QSize()
+        self.image = None           # Decoded image. None until the first decode finishes, a placeholder is drawn instead
+        self.imageSize = QSize()    # Full resolution size of the image, read from the node metadata. Item coordinates are full resolution image coordinates
+        self.decodeScale = 0        # Scale that self.image was decoded at (See Utility/ImageLoader.py)
+        self.pendingDecodeScale = None  # Scale of the image being decoded on a background thread
+        self.decodeRequestID = 0    # Incremented for each decode, results of older decodes are ignored
+        self.previewImage = None    # Low resolution copy of self.image, drawn while the canvas is being interacted with. Created with the decode on a background thread
+        self.tiledImage = None      # Very large images are drawn in tiles, instead of being decoded into self.image
+        self.isAnimated = False     # Animated images are drawn from the frame cache of the canvas' AnimationManager
 
         # INIT 
-        self.image = self.getImage(self.imagePath)
-        self.SetRect(QRectF(QPointF(self.itemPos.x(),self.itemPos.y()), QSize(self.imageSize.width(), self.imageSize.height())))
-
-        if self.image == None:
+        if not self.LoadImage():
             ConsoleLog.error("Unable to add ImageCanvasItem", "imagePath is invalid: " + str(self.canvasItemData) + "  imagePath: " + str(self.imagePath)) 
-            
-            del self.nodeData   # If unable to create image, delete self and data
-            del self.canvasItemData
-            self.deleteLater()
+            self.isValid = False    # The canvas does not add self
 
 
     def paint(self, painter, option, widget) -> None:
 
         painter.save()
 
-        painter.setRenderHint(QPainter.Antialiasing,True)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform,True)
-        painter.setRenderHint(QPainter.LosslessImageRendering,True)
-
-        painter.setClipRect(self.mapFromScene(self.mainCanvas.GetVisibleScreenRect()).boundingRect())
-
-        painter.drawImage(self.image.rect(), self.image, self.image.rect())
+        self.mainCanvas.SetRenderQuality(painter, smoothImages = True)
+
+        visibleRect = self.mapRectFromScene(self.mainCanvas.renderContext.visibleSceneRect)
+        painter.setClipRect(visibleRect)
+
+        if self.tiledImage != None:     # Only draw the visible tiles. New tiles are not decoded while interacting.
+            self.tiledImage.Paint(painter, visibleRect, canRequest = not self.mainCanvas.isInteracting)
+            painter.restore()
+            return super().paint(painter, option, widget)
+
+        imageRect = self.GetImageRect()
+        deviceScale = painter.worldTransform().m11()    # Screen pixels per image pixel
+        if self.isAnimated:
+            frame = self.mainCanvas.animationManager.GetFrame(self)
+            if frame == None:
+                painter.fillRect(imageRect, QColor(255, 255, 255, 25))
+            else:
+                painter.drawImage(imageRect, frame, QRectF(frame.rect()))
+        elif self.image == None:  # Draw a placeholder until the image is decoded
+            painter.fillRect(imageRect, QColor(255, 255, 255, 25))
+        elif self.mainCanvas.isInteracting and self.previewImage != None and self.imageSize.width() * deviceScale <= interactivePreviewSize:    # Draw the low resolution image while interacting
+            painter.drawImage(imageRect, self.previewImage)
+        else:
+            painter.drawImage(imageRect, self.image, QRectF(self.image.rect()))
+            if not self.mainCanvas.isInteracting:
+                self.RequestDecodeScale(deviceScale)
 
         painter.restore()
 
         return super().paint(painter, option, widget)
 
 
-    def getImage(self, path):
-        """ Returns the converted image from the path.
-            This is required to bypass a rendering error.
+    def canCache(self):
+        """Animated images are not cached, since every frame would invalidate the cache"""
+        return not self.isAnimated
+
+    def GetImageRect(self):
+        """Returns the rect the image is drawn in. This is the full resolution size, even if the image was decoded at a lower resolution."""
+        return QRectF(QPointF(0, 0), QSizeF(self.imageSize))
+
+    def RequestDecodeScale(self, deviceScale: float):
+        """If the image is displayed at a higher resolution than it was decoded at, decode it again on a background thread.
+
+        Args:
+            deviceScale (float): screen pixels per image pixel that the image is displayed at
+        """
+        decodeScale = GetDecodeScale(deviceScale)
+        if decodeScale > self.decodeScale and (self.pendingDecodeScale == None or decodeScale > self.pendingDecodeScale):
+            self.pendingDecodeScale = decodeScale
+            self.decodeRequestID += 1
+            RunInBackground(DecodeImageRequest, self.decodeRequestID, self.imagePath, self.imageSize, decodeScale, interactivePreviewSize, onFinished = self.ImageDecoded)
+
+    def ImageDecoded(self, result):
+        """Called when a decode has finished"""
+        requestID, image, scale, previewImage = result
+        if requestID != self.decodeRequestID:   # A newer decode was requested
+            return
+        self.pendingDecodeScale = None
+
+        if image.isNull():
+            ConsoleLog.error("Unable to decode image", "imagePath: " + str(self.imagePath))
+        elif scale > self.decodeScale:
+            self.image = image
+            self.decodeScale = scale
+            self.previewImage = previewImage
+            self.update()
+
+    def LoadImage(self):
+        """Size the item from the image metadata stored in the node, and decode the image on a background thread.
+            The item is laid out immediately, and the image is drawn when the decode finishes.
+
+        Returns:
+            bool: False if the image does not exist or can not be read
         """
-        if CheckFileExists(path): # If image does not exist, delete self.
-            try:
-                pixmap = QImage()
-                pixmap.load(path)
-                self.imageSize = pixmap.size()
-                return pixmap
-            except:
-                return None
+        if not CheckFileExists(self.imagePath):
+            return False
+
+        self.imageSize = GetImageNodeSize(self.nodeData)   # Older projects are backfilled with the image metadata
+        if not self.imageSize.isValid():
+            return False
+        self.SetRect(QRectF(self.pos(), QSizeF(self.imageSize)))
+
+        self.image = None
+        self.previewImage = None
+        self.decodeScale = 0
+        self.pendingDecodeScale = None
+        self.decodeRequestID += 1   # Ignore decodes of the previous image
+        if self.tiledImage != None:
+            self.tiledImage.TileLoaded.disconnect(self.update)
+            self.tiledImage = None
+        self.isAnimated = False
+
+        if self.imageSize.width() > tiledImageThreshold or self.imageSize.height() > tiledImageThreshold:
+            self.tiledImage = TiledImage(self.imagePath, self.imageSize)
+            self.tiledImage.TileLoaded.connect(self.update)
+        elif IsAnimated(self.imagePath):    # Frames are decoded once per node, and shared by every ImageCanvasItem of the node
+            self.isAnimated = True
+            self.mainCanvas.animationManager.AddItem(self)
         else:
-            return None 
\ No newline at end of file
+            thumbnail = GetThumbnail(self.imagePath, self.nodeData.get("fileModified"))   # Draw the thumbnail until the image is decoded (i.e. after a bulk import)
+            if thumbnail != None:
+                self.image = thumbnail
+                self.previewImage = CreatePreviewImage(thumbnail, interactivePreviewSize)   # Thumbnails are small, so this is usually the thumbnail itself
+                self.decodeScale = thumbnail.width() / self.imageSize.width()
+
+            # Only decode the resolution needed at the current zoom. A higher resolution is decoded when the image is zoomed in on.
+            self.RequestDecodeScale(self.itemScale * self.mainCanvas.GetZoomScale() * self.mainCanvas.devicePixelRatioF())
+        self.update()
+        return True
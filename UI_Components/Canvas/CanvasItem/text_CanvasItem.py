@@ -7,12 +7,16 @@ Date Updated: 11/22/22
 
 #Components Used:
 from UI_Components.Canvas.CanvasItem.baseCanvasItem import *
-from UI_Components.Canvas.CanvasUtility.ItemGroup import ItemGroup  
+
+textMargin = 4  # Same as the document margin of QGraphicsTextItem, so the text does not move when editing starts
 
 class TextCanvasItem(CanvasItem):
     def __init__(self, parent, canvasItemData) -> None:
         """ Provides the functionality for Text Canvas Items
 
+            The text is drawn from a QStaticText, which keeps the text layout cached.
+            The TextBox (QGraphicsTextItem and QTextDocument) is only created while the text is edited, as it uses much more memory and is slow to create.
+
         Args:
             canvasItemData (dict): CanvasItem data that is parsed and applied to the canvas item. 
         """
@@ -20,17 +24,19 @@ class TextCanvasItem(CanvasItem):
 
         # Set Attributes
         self.setMinimumWidth(35)
-        self.text = TextBox(self)
+        self.text = None    # TextBox, only while editing
 
         # Set Properties
         self.canEdit = False
         self.nodeData = self.mainCanvas.GetNodeData(self.nodeID) # Get Data by checking database with id
+        self.staticText = QStaticText()
+        self.staticText.setTextFormat(Qt.PlainText)
 
         # Node Data
         self.nodeText = self.nodeData["nodeText"]
 
         # INIT
-        self.text.setPlainText(self.nodeText)
+        self.SetStaticText(self.nodeText)
 
         ConsoleLog.log("Added TextCanvasItem", "Successfully added Text.  canvasItem: " + str(self.canvasItemData) + " text: " + self.nodeText) 
 
@@ -43,6 +49,38 @@ class TextCanvasItem(CanvasItem):
         """Sets the size of self. This is used when the TextBox's content has changed"""
         self.setGeometry(self.pos().x(),self.pos().y(), size.width(),size.height())
 
+    def SetStaticText(self, text: str):
+        """Set the text that is drawn while not editing, and resize self to the text.
+        Plain text QStaticText does not break lines at newlines, so they are replaced with line separators (U+2028), which it does break at."""
+        lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        self.staticText.setText("\u2028".join(lines))
+        self.staticText.prepare(QTransform(), self.font())  # Lay out the text now, instead of on the first paint
+
+        textSize = self.staticText.size()
+        lineHeight = QFontMetricsF(self.font()).height()    # Empty lines still have the height of one line
+        self.setSize(QSizeF(textSize.width() + textMargin * 2, max(textSize.height(), lineHeight * len(lines)) + textMargin * 2))
+        self.updateParentSize()
+
+    def CreateTextBox(self):
+        """Create the TextBox used to edit the text"""
+        self.text = TextBox(self)
+        self.text.setFont(self.font())
+        self.text.document().setDocumentMargin(textMargin)
+        self.text.setPlainText(self.nodeText)
+        self.text.document().contentsChanged.connect(self.text.ContentChanged)   # Connected after the text is set, as setting the text is not an edit
+
+    def ReleaseTextBox(self):
+        """Remove the TextBox once editing ends. The edited text is drawn from the QStaticText."""
+        self.text.layoutTimer.stop()
+        self.nodeText = self.text.GetText()
+        self.text.setParentItem(None)
+        if self.text.scene() != None:
+            self.text.scene().removeItem(self.text)
+        self.text.deleteLater()
+        self.text = None
+        self.SetStaticText(self.nodeText)
+        self.mainCanvas.SetSelectionHighlightPos()
+
     def setIsEditable(self, canEdit:bool):
         """Sets if the text box can be edited.
         
@@ -50,13 +88,27 @@ class TextCanvasItem(CanvasItem):
             canEdit (bool): If the text can be edited pass True
         
         """
+        if canEdit == self.canEdit:     # Called every time the item is selected
+            return
+
         self.canEdit = canEdit
         if canEdit:
+            self.CreateTextBox()
             self.text.setTextInteractionFlags(Qt.TextEditorInteraction)
             self.text.setFocus()
         else:
-            self.text.setTextInteractionFlags(Qt.TextInteractionFlag.NoTextInteraction)
-            self.text.ResetSelection()
+            self.ReleaseTextBox()
+            self.SaveChanges()          # The text is written once when editing ends, instead of on every change
+
+        self.mainCanvas.renderCachePolicy.ItemChanged(self)    # Text is not cached while editing
+
+    def canCache(self) -> bool:
+        return not self.canEdit
+
+    def GetCachedItems(self):
+        if self.text != None:
+            return [self, self.text]    # The TextBox is a child item, so it has its own cache
+        return [self]
 
     def setCanDrag(self, canDrag):
         """Sets if the canvasItem can be dragged or not."""
@@ -64,12 +116,9 @@ class TextCanvasItem(CanvasItem):
         return super().setCanDrag(canDrag)
 
     def updateParentSize(self):
-        """Used to update the geometry of the parent item group"""
-        parent = self.parentItem()
-
-        if type(parent) == ItemGroup:
-            parent.removeFromGroup(self)
-            parent.addToGroup(self)
+        """Used to update the bounding rect of the selected item group"""
+        if self.GetIsSelected():
+            self.mainCanvas.selectedItemGroup.UpdateBoundingRect()
 
     # ----- Events ----- 
     def mouseDoubleClickEvent(self, event) -> None:
@@ -82,14 +131,28 @@ class TextCanvasItem(CanvasItem):
     def paint(self, painter, option, widget) -> None:
         # Paint Background.
         painter.save()
-        painter.setRenderHint(QPainter.Antialiasing)        
+        self.mainCanvas.SetRenderQuality(painter)
         painter.setBrush(QColor(0,0,0,150))
         painter.drawRoundedRect(self.boundingRect() + QMarginsF(-.5,-.5,-.5,-.5), 1, 1) # Margins are needed to keep border within selectionBorder
+
+        if self.text == None:   # While editing, the TextBox draws the text
+            painter.setFont(self.font())
+            painter.setPen(QColor("White"))
+            painter.drawStaticText(QPointF(textMargin, textMargin), self.staticText)
         painter.restore()
         return 
 
+    def GetText(self):
+        """Get the text, including edits that have not been written to the database"""
+        if self.text != None:
+            return self.text.GetText()
+        return self.nodeText
+
     def SetData(self):
-        self.nodeData["nodeText"] = self.text.GetText()
+        self.nodeText = self.GetText()
+        if self.nodeData["nodeText"] != self.nodeText:
+            self.nodeData["nodeText"] = self.nodeText
+            self.mainCanvas.NodeChanged(self.nodeID)
         return super().SetData()
 
 class TextBox(QGraphicsTextItem):
@@ -103,8 +166,13 @@ class TextBox(QGraphicsTextItem):
         # Set Attributes
         self.setDefaultTextColor(QColor("White"))
 
+        # Properties
+        self.layoutTimer = QTimer(self)     # Coalesces the changes made while typing into one layout update
+        self.layoutTimer.setSingleShot(True)
+        self.layoutTimer.setInterval(textEditUpdateInterval)
+
         # Signals
-        self.document().contentsChanged.connect(self.ContentChanged)
+        self.layoutTimer.timeout.connect(self.UpdateLayout)
 
     def GetText(self):
         return self.document().toPlainText()
@@ -117,8 +185,19 @@ class TextBox(QGraphicsTextItem):
 
     # ----- Events -----
     def ContentChanged(self):
-        """When content has changed, update the size of the parent"""
+        """When content has changed, update the size of the parent.
+        While editing, the update is delayed by textEditUpdateInterval (settings.py) ms, so keystrokes in the same interval cause one update.
+        The text is written to the database when editing ends (See TextCanvasItem.setIsEditable).
+        """
+        if not self.textCanvasItem.isDirty:
+            self.textCanvasItem.SetDirty()
+            self.textCanvasItem.mainCanvas.SetModified()
+        if not self.layoutTimer.isActive():
+            self.layoutTimer.start()
+
+    def UpdateLayout(self):
+        """Resize the parent to the text, and update the selection highlight"""
+        self.layoutTimer.stop()
         self.textCanvasItem.setSize(self.boundingRect().size())
         self.textCanvasItem.updateParentSize()
-        self.textCanvasItem.mainCanvas.SetSelectionHighlightPos()
-        self.textCanvasItem.SetData()
\ No newline at end of file
+        self.textCanvasItem.mainCanvas.SetSelectionHighlightPos()
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+Description:    This python file provides playback of animated images (GIF and WebP).
+                The frames of each image node are decoded once and shared by all of its ImageCanvasItems,
+                and every visible animation is stepped by a single timer.
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# --Imports--
+from bisect import bisect_right
+
+#PySide
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+from PySide6.QtCore import *
+
+# Custom Imports
+from Settings.settings import *
+from Utility import ConsoleLog
+from Utility.BackgroundTasks import RunInBackground
+from Utility.ImageLoader import DecodeAnimation
+
+
+def DecodeAnimatedImage(animation, imageSize: QSize, scale: float):
+    """Decode the frames of an AnimatedImage. Run on a background thread, the AnimatedImage is not modified.
+
+    Returns:
+        (AnimatedImage, (QImage, int)[]): the AnimatedImage, and its decoded frames
+    """
+    return animation, DecodeAnimation(animation.imagePath, imageSize, scale, animationFrameLimit)
+
+
+class AnimatedImage:
+    def __init__(self, nodeID: str, imagePath: str) -> None:
+        """Frame cache of an animated image node
+
+        Args:
+            nodeID (str): ID of the image node
+            imagePath (str): path to the image
+        """
+        # Properties
+        self.nodeID = nodeID
+        self.imagePath = imagePath
+        self.frames = []        # Decoded frames (QImage)
+        self.frameEndTimes = [] # Time in ms, from the start of the animation, that each frame ends at
+        self.duration = 0       # Time in ms of one loop of the animation
+        self.isLoading = False
+
+    def SetFrames(self, frames):
+        """Set the decoded frames
+
+        Args:
+            frames ((QImage, int)[]): each frame and the time in ms it is displayed for (See Utility/ImageLoader.py DecodeAnimation)
+        """
+        self.frames = [frame for frame, delay in frames]
+        self.frameEndTimes = []
+        self.duration = 0
+        for frame, delay in frames:
+            self.duration += delay
+            self.frameEndTimes.append(self.duration)
+
+    def GetFrameIndex(self, time: int):
+        """Get the index of the frame displayed at time (ms). The animation loops, and every animation uses the same clock."""
+        if len(self.frames) <= 1:
+            return 0
+        return min(bisect_right(self.frameEndTimes, time % self.duration), len(self.frames) - 1)
+
+
+class AnimationManager(QObject):
+    def __init__(self, mainCanvas) -> None:
+        """Plays the animated ImageCanvasItems on the canvas.
+
+            Animations are only stepped while their ImageCanvasItem is visible, and the timer stops when no animations are visible.
+            The timer is restarted when an animated ImageCanvasItem is painted.
+
+        Args:
+            mainCanvas (MainCanvas): canvas that contains the ImageCanvasItems
+        """
+        super().__init__(mainCanvas)
+
+        # References
+        self.mainCanvas = mainCanvas
+
+        # Properties
+        self.animations = {}    # nodeID : AnimatedImage
+        self.items = {}         # ImageCanvasItem : index of the frame that was last painted
+        self.clock = QElapsedTimer()    # Clock shared by every animation
+        self.timer = QTimer(self)
+        self.timer.setInterval(animationTimerInterval)
+
+        # INIT
+        self.clock.start()
+        self.timer.timeout.connect(self.Step)
+
+    # ----- Items -----
+    def AddItem(self, canvasItem, scale: float = 1):
+        """Play the animation of an ImageCanvasItem. If the frames of its node are not decoded, they are decoded on a background thread.
+
+        Args:
+            canvasItem (ImageCanvasItem): animated ImageCanvasItem
+            scale (float, optional): scale to decode the frames at, if they are not decoded yet. Defaults to 1.
+        """
+        self.items[canvasItem] = -1
+        if canvasItem.nodeID in self.animations:
+            return
+
+        animation = AnimatedImage(canvasItem.nodeID, canvasItem.imagePath)
+        animation.isLoading = True
+        self.animations[canvasItem.nodeID] = animation
+        RunInBackground(DecodeAnimatedImage, animation, canvasItem.imageSize, scale, onFinished = self.AnimationDecoded)
+
+    def RemoveItem(self, canvasItem):
+        """Stop playing the animation of an ImageCanvasItem. The frames of its node are released if no other ImageCanvasItem uses them."""
+        if self.items.pop(canvasItem, None) == None:
+            return
+        if not any(item.nodeID == canvasItem.nodeID for item in self.items):
+            self.animations.pop(canvasItem.nodeID, None)
+
+    def ReleaseNode(self, nodeID: str):
+        """Release the decoded frames of a node (i.e. when the image file changed), so they are decoded again"""
+        self.animations.pop(nodeID, None)
+        for item in list(self.items.keys()):
+            if item.nodeID == nodeID:
+                del self.items[item]
+
+    def Clear(self):
+        """Stop all animations and release every frame cache. Called when the tab changes."""
+        self.items.clear()
+        self.animations.clear()
+        self.timer.stop()
+
+    # ----- Playback -----
+    def GetFrame(self, canvasItem):
+        """Get the frame of the ImageCanvasItem's animation at the current time. Called when the ImageCanvasItem is painted.
+
+        Returns:
+            QImage: the frame, or None if the frames are not decoded yet
+        """
+        animation = self.animations.get(canvasItem.nodeID)
+        if animation == None or len(animation.frames) == 0:
+            return None
+
+        frameIndex = animation.GetFrameIndex(self.clock.elapsed())
+        self.items[canvasItem] = frameIndex
+        if len(animation.frames) > 1 and not self.timer.isActive():     # The item is visible, so the animation plays
+            self.timer.start()
+        return animation.frames[frameIndex]
+
+    def Step(self):
+        """Repaint visible ImageCanvasItems whose frame changed. Stops the timer if no animations are visible."""
+        window = self.mainCanvas.window()
+        if not self.mainCanvas.isVisible() or window.isMinimized():
+            self.timer.stop()
+            return
+
+        time = self.clock.elapsed()
+        visibleRect = self.mainCanvas.renderContext.visibleSceneRect
+        isAnyVisible = False
+        for canvasItem, lastFrame in self.items.items():
+            animation = self.animations.get(canvasItem.nodeID)
+            if animation == None or len(animation.frames) <= 1 or not canvasItem.sceneBoundingRect().intersects(visibleRect):
+                continue
+
+            isAnyVisible = True
+            if animation.GetFrameIndex(time) != lastFrame:
+                canvasItem.update()     # Updates are combined into a single repaint of the viewport
+
+        if not isAnyVisible:
+            self.timer.stop()
+
+    def AnimationDecoded(self, result):
+        """Called on the GUI thread when DecodeAnimatedImage finishes"""
+        animation, frames = result
+        animation.isLoading = False
+        if self.animations.get(animation.nodeID) is not animation:  # The animation was released while decoding
+            return
+        if len(frames) == 0:
+            ConsoleLog.error("Animated Image", "Unable to decode " + animation.imagePath)
+            return
+
+        animation.SetFrames(frames)
+        for canvasItem in self.items:
+            if canvasItem.nodeID == animation.nodeID:
+                canvasItem.update()
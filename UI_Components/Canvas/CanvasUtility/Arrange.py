@@ -0,0 +1,193 @@
+"""
+Description:    This python file provides layout algorithms that position many CanvasItems at once.
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# --Imports--
+import heapq
+from math import sqrt
+
+#PySide
+from PySide6.QtCore import *
+
+
+alignments = ["left", "hCenter", "right", "top", "vCenter", "bottom"]   # Alignments used by AlignRects
+distributions = ["horizontal", "vertical"]   # Orientations used by DistributeRects
+
+def GetBounds(rects):
+    """Get the rect that contains every rect. Faster than uniting the rects one at a time.
+
+    Returns:
+        QRectF: bounding rect of rects
+    """
+    left = min(rect.left() for rect in rects)
+    top = min(rect.top() for rect in rects)
+    right = max(rect.right() for rect in rects)
+    bottom = max(rect.bottom() for rect in rects)
+    return QRectF(left, top, right - left, bottom - top)
+
+def AlignRects(rects, alignment: str):
+    """Align rects to an edge or the center of their bounding rect.
+
+    Args:
+        rects (QRectF[]): rects to align
+        alignment (str): "left", "hCenter", "right", "top", "vCenter", or "bottom"
+
+    Returns:
+        QPointF[]: new top left position of each rect
+    """
+    if len(rects) == 0:
+        return []
+    bounds = GetBounds(rects)
+
+    if alignment == "left":
+        return [QPointF(bounds.left(), rect.top()) for rect in rects]
+    elif alignment == "hCenter":
+        return [QPointF(bounds.center().x() - rect.width() / 2, rect.top()) for rect in rects]
+    elif alignment == "right":
+        return [QPointF(bounds.right() - rect.width(), rect.top()) for rect in rects]
+    elif alignment == "top":
+        return [QPointF(rect.left(), bounds.top()) for rect in rects]
+    elif alignment == "vCenter":
+        return [QPointF(rect.left(), bounds.center().y() - rect.height() / 2) for rect in rects]
+    elif alignment == "bottom":
+        return [QPointF(rect.left(), bounds.bottom() - rect.height()) for rect in rects]
+    raise ValueError("Unknown alignment: " + str(alignment))
+
+def DistributeRects(rects, orientation: str):
+    """Space rects evenly. The first and last rects do not move, and the space between each pair of neighbouring rects is equal.
+
+    Args:
+        rects (QRectF[]): rects to distribute
+        orientation (str): "horizontal" or "vertical"
+
+    Returns:
+        QPointF[]: new top left position of each rect
+    """
+    if len(rects) < 3:
+        return [rect.topLeft() for rect in rects]
+
+    horizontal = orientation == "horizontal"
+    order = sorted(range(len(rects)), key=lambda i: rects[i].center().x() if horizontal else rects[i].center().y())
+    if horizontal:
+        start, end = rects[order[0]].left(), rects[order[-1]].right()
+        totalSize = sum(rect.width() for rect in rects)
+    else:
+        start, end = rects[order[0]].top(), rects[order[-1]].bottom()
+        totalSize = sum(rect.height() for rect in rects)
+    gap = (end - start - totalSize) / (len(rects) - 1)   # Negative if the rects overlap
+
+    positions = [None] * len(rects)
+    edge = start
+    for i in order:
+        rect = rects[i]
+        if horizontal:
+            positions[i] = QPointF(edge, rect.top())
+            edge += rect.width() + gap
+        else:
+            positions[i] = QPointF(rect.left(), edge)
+            edge += rect.height() + gap
+    return positions
+
+def GridLayout(sizes, spacing: float = 0, columns: int = None):
+    """Place rects in a grid, in order, from left to right and top to bottom. Each column is as wide as its widest rect, and each row as tall as its tallest rect.
+
+    Args:
+        sizes (QSizeF[]): size of each rect
+        spacing (float, optional): space between rects. Defaults to 0.
+        columns (int, optional): number of columns. Defaults to a number that makes the layout roughly square.
+
+    Returns:
+        (QPointF[], QSizeF): top left position of each rect, and the size of the layout
+    """
+    if len(sizes) == 0:
+        return [], QSizeF()
+
+    if columns == None:
+        cellWidth = max(size.width() for size in sizes) + spacing
+        cellHeight = max(size.height() for size in sizes) + spacing
+        columns = round(sqrt(len(sizes) * cellHeight / cellWidth)) if cellWidth > 0 else len(sizes)
+    columns = max(1, min(columns, len(sizes)))
+
+    columnWidths = [0] * columns
+    rowHeights = [0] * ((len(sizes) + columns - 1) // columns)
+    for i, size in enumerate(sizes):
+        column, row = i % columns, i // columns
+        columnWidths[column] = max(columnWidths[column], size.width())
+        rowHeights[row] = max(rowHeights[row], size.height())
+
+    columnX = [0] * columns
+    for column in range(1, columns):
+        columnX[column] = columnX[column - 1] + columnWidths[column - 1] + spacing
+    rowY = [0] * len(rowHeights)
+    for row in range(1, len(rowHeights)):
+        rowY[row] = rowY[row - 1] + rowHeights[row - 1] + spacing
+
+    positions = [QPointF(columnX[i % columns], rowY[i // columns]) for i in range(len(sizes))]
+    return positions, QSizeF(columnX[-1] + columnWidths[-1], rowY[-1] + rowHeights[-1])
+
+def MasonryLayout(sizes, spacing: float = 0, columnWidth: float = None):
+    """Scale rects to the same width, and place each rect, in order, at the bottom of the shortest column.
+
+    Args:
+        sizes (QSizeF[]): size of each rect
+        spacing (float, optional): space between rects. Defaults to 0.
+        columnWidth (float, optional): width of the columns. Defaults to the median width of the rects.
+
+    Returns:
+        (QPointF[], float[], QSizeF): top left position of each rect, the scale applied to each rect, and the size of the layout
+    """
+    if len(sizes) == 0:
+        return [], [], QSizeF()
+
+    if columnWidth == None:
+        columnWidth = sorted(size.width() for size in sizes)[len(sizes) // 2]
+    scales = [columnWidth / size.width() if size.width() > 0 else 1 for size in sizes]
+    heights = [size.height() * scale for size, scale in zip(sizes, scales)]
+    columns = max(1, min(len(sizes), round(sqrt(sum(height + spacing for height in heights) / (columnWidth + spacing)))))   # Roughly square layout
+
+    columnHeap = [(0, column) for column in range(columns)]    # (height, column). The shortest, then leftmost, column is first
+    positions = []
+    for height in heights:
+        columnHeight, column = heapq.heappop(columnHeap)
+        positions.append(QPointF(column * (columnWidth + spacing), columnHeight))
+        heapq.heappush(columnHeap, (columnHeight + height + spacing, column))
+
+    layoutHeight = max(columnHeight for columnHeight, column in columnHeap) - spacing
+    return positions, scales, QSizeF(columns * (columnWidth + spacing) - spacing, layoutHeight)
+
+
+def PackShelves(sizes, spacing: float = 0, maxRowWidth: float = None):
+    """Pack rects into rows (shelves). Rects are placed from tallest to shortest, left to right, and a new row is started when a row is full.
+
+    Args:
+        sizes (QSizeF[]): size of each rect
+        spacing (float, optional): space between rects. Defaults to 0.
+        maxRowWidth (float, optional): max width of a row. Defaults to a width that makes the layout roughly square.
+
+    Returns:
+        (QPointF[], QSizeF): top left position of each rect (in the same order as sizes), and the size of the layout
+    """
+    if len(sizes) == 0:
+        return [], QSizeF()
+
+    if maxRowWidth == None:
+        totalArea = sum((size.width() + spacing) * (size.height() + spacing) for size in sizes)
+        maxRowWidth = max(sqrt(totalArea), max(size.width() for size in sizes))
+
+    positions = [None] * len(sizes)
+    x, y, rowHeight, layoutWidth = 0, 0, 0, 0
+    for i in sorted(range(len(sizes)), key=lambda i: sizes[i].height(), reverse=True):
+        size = sizes[i]
+        if x > 0 and x + size.width() > maxRowWidth:    # Start a new row
+            y += rowHeight + spacing
+            x, rowHeight = 0, 0
+
+        positions[i] = QPointF(x, y)
+        layoutWidth = max(layoutWidth, x + size.width())
+        rowHeight = max(rowHeight, size.height())
+        x += size.width() + spacing
+
+    return positions, QSizeF(layoutWidth, y + rowHeight)
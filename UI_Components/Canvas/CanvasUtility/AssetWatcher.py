@@ -0,0 +1,148 @@
+"""
+Description:    This python file watches the files referenced by the selected tab, and reports files that changed on disk.
+                Directories are watched instead of individual files, so thousands of files only need a few watches.
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# --Imports--
+import os
+
+#PySide
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+from PySide6.QtCore import *
+
+# Custom Imports
+from Settings.settings import *
+from Utility.BackgroundTasks import RunInBackground
+from Utility.FileMetadata import GetFileStat, StatFiles
+
+
+def GetFileVersion(fileStat):
+    """Get the values that change when a file is modified
+
+    Returns:
+        (float, int): modified time and size of the file, or None if the file does not exist
+    """
+    if fileStat == None:
+        return None
+    return (fileStat.st_mtime, fileStat.st_size)
+
+def FindChangedFiles(fileVersions):
+    """Stat files and find the files that changed. This can be run on a background thread.
+
+    Args:
+        fileVersions (dict): filePath : file version (See GetFileVersion) when the file was last checked
+
+    Returns:
+        dict: filePath : new file version, for each file that changed
+    """
+    changedFiles = {}
+    for filePath, fileStat in StatFiles(list(fileVersions.keys())).items():
+        fileVersion = GetFileVersion(fileStat)
+        if fileVersion != fileVersions[filePath]:
+            changedFiles[filePath] = fileVersion
+    return changedFiles
+
+
+class AssetWatcher(QObject):
+    FilesChanged = Signal(list)     # Emits the paths of the watched files that changed, were created, or were removed
+
+    def __init__(self, parent = None) -> None:
+        """Watches the directories of the files referenced by the selected tab.
+
+            Changes are collected for assetWatchDebounce (settings.py) ms, so saving a file, or changing many files at once, is reported once.
+            Only the files in the changed directories are checked, on a background thread.
+        """
+        super().__init__(parent)
+
+        # Properties
+        self.fileVersions = {}      # Directory : {filePath : file version}. Versions of the watched files when they were last checked
+        self.changedDirectories = set() # Directories that changed since the last check
+        self.isChecking = False
+        self.watcher = QFileSystemWatcher(self)
+        self.debounceTimer = QTimer(self)
+        self.debounceTimer.setSingleShot(True)
+        self.debounceTimer.setInterval(assetWatchDebounce)
+
+        # INIT
+        self.watcher.directoryChanged.connect(self.DirectoryChanged)
+        self.debounceTimer.timeout.connect(self.CheckChangedDirectories)
+
+    # ----- Watched Files -----
+    def WatchFiles(self, filePaths):
+        """Watch only the passed files. Called when a tab is selected.
+
+        Args:
+            filePaths (str[]): paths of the files
+        """
+        self.fileVersions = {}
+        self.changedDirectories.clear()
+        for filePath in filePaths:
+            self.AddVersion(filePath)
+
+        directories = set(self.fileVersions.keys())
+        watchedDirectories = set(self.watcher.directories())
+        if len(watchedDirectories - directories) > 0:
+            self.watcher.removePaths(list(watchedDirectories - directories))
+        if len(directories - watchedDirectories) > 0:
+            self.watcher.addPaths(list(directories - watchedDirectories))
+
+    def AddFile(self, filePath: str):
+        """Watch another file (i.e. when a CanvasItem is added to the tab)"""
+        isNewDirectory = os.path.dirname(os.path.abspath(filePath)) not in self.fileVersions
+        directory = self.AddVersion(filePath)
+        if isNewDirectory:
+            self.watcher.addPath(directory)
+
+    def AddVersion(self, filePath: str):
+        """Store the current version of the file. The version is read from the file metadata cache.
+
+        Returns:
+            str: directory of the file
+        """
+        directory = os.path.dirname(os.path.abspath(filePath))
+        self.fileVersions.setdefault(directory, {})[filePath] = GetFileVersion(GetFileStat(filePath))
+        return directory
+
+    # ----- Events -----
+    def DirectoryChanged(self, directory: str):
+        """Called by the QFileSystemWatcher. The directory is checked once no more changes happen for assetWatchDebounce ms."""
+        if directory in self.fileVersions:
+            self.changedDirectories.add(directory)
+            self.debounceTimer.start()
+
+    def CheckChangedDirectories(self):
+        """Check the watched files in the changed directories on a background thread"""
+        if self.isChecking:     # Check again after the current check finishes
+            self.debounceTimer.start()
+            return
+
+        fileVersions = {}
+        for directory in self.changedDirectories:
+            fileVersions.update(self.fileVersions.get(directory, {}))
+        self.changedDirectories.clear()
+
+        if len(fileVersions) > 0:
+            self.isChecking = True
+            RunInBackground(FindChangedFiles, fileVersions, onFinished = self.ChangedFilesFound, onFailed = self.CheckFailed)
+
+    def ChangedFilesFound(self, changedFiles):
+        """Called when FindChangedFiles finishes. Stores the new versions and emits FilesChanged."""
+        self.isChecking = False
+
+        changedPaths = []
+        for filePath, fileVersion in changedFiles.items():
+            directory = os.path.dirname(os.path.abspath(filePath))
+            if filePath in self.fileVersions.get(directory, {}):    # The file is still watched
+                self.fileVersions[directory][filePath] = fileVersion
+                changedPaths.append(filePath)
+
+        if len(changedPaths) > 0:
+            self.FilesChanged.emit(changedPaths)
+
+    def CheckFailed(self, error):
+        """Called if FindChangedFiles raises an exception. The error is logged by the background task."""
+        self.isChecking = False
@@ -0,0 +1,93 @@
+"""
+Description:    This python file provides the snapshot that is displayed over the canvas on startup.
+                The snapshot is an image of the last project's canvas, which is displayed while the project is loaded in the background.
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# --Imports--
+import os
+
+#PySide
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+from PySide6.QtCore import *
+
+# Custom Imports
+from Settings.settings import *
+from Utility import ConsoleLog
+
+snapshotLocation = "Data/lastProjectSnapshot.png"
+
+
+def SaveCanvasSnapshot(canvas):
+    """Render the visible area of the canvas and save it to snapshotLocation
+
+    Args:
+        canvas (MainCanvas): canvas that will be saved
+
+    Returns:
+        dict: snapshot data that is stored in the app state. Returns None if the snapshot could not be saved.
+    """
+    pixmap = canvas.viewport().grab()
+    if pixmap.isNull() or not pixmap.save(snapshotLocation, "PNG"):
+        ConsoleLog.error("Canvas Snapshot", "Unable to save snapshot to " + snapshotLocation)
+        return None
+
+    return {
+        "location": snapshotLocation,
+        "devicePixelRatio": pixmap.devicePixelRatio(),
+        "tabID": canvas.tabData["tabID"],
+        "viewportPos": canvas.tabData["viewportPos"],
+        "viewportZoom": canvas.tabData["viewportZoom"]
+    }
+
+
+class CanvasSnapshot(QWidget):
+    def __init__(self, parent, snapshotData) -> None:
+        """Displays a saved snapshot over the canvas. Mouse events are blocked until the snapshot is removed.
+
+        Args:
+            parent (MainCanvas): canvas that the snapshot covers
+            snapshotData (dict): snapshot data created by SaveCanvasSnapshot
+        """
+        super().__init__(parent)
+
+        # Properties
+        self.snapshotData = snapshotData
+        self.pixmap = QPixmap()
+        if os.path.exists(snapshotData["location"]):
+            self.pixmap.load(snapshotData["location"])
+            self.pixmap.setDevicePixelRatio(snapshotData.get("devicePixelRatio", 1))
+
+        # Set Attributes
+        self.setGeometry(parent.rect())
+        parent.installEventFilter(self)     # Resize with the canvas
+
+    def isValid(self):
+        """Returns if the snapshot image was loaded"""
+        return not self.pixmap.isNull()
+
+    def Remove(self):
+        """Remove the snapshot when the project has loaded"""
+        self.parent().removeEventFilter(self)
+        self.hide()
+        self.deleteLater()
+
+    # ----- Events -----
+    def eventFilter(self, watched, event) -> bool:
+        if event.type() == QEvent.Resize:
+            self.setGeometry(watched.rect())
+        return super().eventFilter(watched, event)
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        painter.drawPixmap(QPointF(0, 0), self.pixmap)
+        return super().paintEvent(event)
+
+    def mousePressEvent(self, event) -> None:
+        event.accept()  # Block interaction until the project has loaded
+
+    def wheelEvent(self, event) -> None:
+        event.accept()
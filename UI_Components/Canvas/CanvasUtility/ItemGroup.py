@@ -1,64 +1,98 @@
 """
-Description:    This python file provides an item group that will contain all selected canvasItems.
-                This (QGraphicsItemGroup) makes it easy to move and scale collections of items
+Description:    This python file provides the group of selected canvasItems.
+                Selected items stay in the scene, and the group moves and scales them together.
 
-Date Created: 10/15/22 
+Date Created: 10/15/22
 Date Updated: 10/17/22
 """
 
 # Imports
 from Settings.settings import *
 
-# https://www.walletfox.com/course/rotategroupqgraphicsitem.php
-class ItemGroup(QGraphicsItemGroup):
-    def __init__(self, mainView, parent = None) -> None:
-        """Class that groups together selected items, to move as a single selected item.
+class ItemGroup:
+    selectedZOffset = 1000000   # Added to the z-value of selected items, so they are drawn above the other CanvasItems
+
+    def __init__(self, mainView) -> None:
+        """Group of the selected CanvasItems, used to move and scale the selection as a single item.
+
+            Items are not reparented into the group (i.e. QGraphicsItemGroup), as adding and removing every item on selection is slow for large selections.
+            Instead, the position and scale of each item is stored when a drag starts, and every move or scale is applied to all items from these initial values.
+            The bounding rect of the group is cached, so the selection highlight can be updated without checking every item.
 
         Args:
             mainView (MainCanvas): MainCanvas that is the parent.
         """
-        super().__init__(parent)
-
-        # Set Attributes
-        self.setHandlesChildEvents(False)   # This allows children to accept mouse events. Necessary for Text Item 
-
         # References
         self.mainView = mainView
-        
+
         # Properties
-        self.initialPos = QPointF()
+        self.items = {}     # Selected CanvasItems, in the order they were selected. Used as an ordered set
+        self.initialItems = []  # (CanvasItem, initial pos, initial scale) of each item when the drag started
         self.initialSceneRect = QRectF()
-
-    def SetPos(self, scenePos:QPointF):
-        """Set the position of the item group (self)
-        
-        Args:
-            scenePos (QPointF) : The location where self should be set.
-        """
-        self.setPos(scenePos)
-        self.mainView.SetSelectionHighlightPos()
-
-    def SetInitialPos(self):
-        """Set the initial position of the object. This is useful for getting the delta of a dragged item. (i.e. DeltaPos = self.initialPos - event.currentPos)"""
-        self.initialPos = self.scenePos()
-
-    def SetInitialSceneBoundingRect(self):
-        """Sets the initial scene bounding rect"""
+        self.sceneRect = QRectF()
+        self.isSceneRectDirty = False
+        self.isTransformed = False  # If the items were moved or scaled since the drag started
+
+    # ----- Items -----
+    def AddItems(self, items):
+        """Add items to the group, and draw them above the other CanvasItems"""
+        for item in items:
+            self.items[item] = None
+            item.setZValue(item.zValue() + self.selectedZOffset)
+            if not self.isSceneRectDirty:
+                self.sceneRect = self.sceneRect.united(item.sceneBoundingRect())     # united() ignores null rects
+
+    def RemoveItems(self, items):
+        """Remove items from the group. The items are not moved or scaled."""
+        for item in items:
+            del self.items[item]
+            item.setZValue(item.zValue() - self.selectedZOffset)
+        self.isSceneRectDirty = len(self.items) > 0
+        if len(self.items) == 0:
+            self.sceneRect = QRectF()
+
+    def GetItems(self):
+        """Get the items in the group, in the order they were selected"""
+        return list(self.items)
+
+    def GetZOffset(self, item):
+        """Get the z-value added to item while it is in the group"""
+        return self.selectedZOffset if item in self.items else 0
+
+    # ----- Bounding Rect -----
+    def sceneBoundingRect(self):
+        """Get the bounding rect of all items in the group, in scene coordinates"""
+        if self.isSceneRectDirty:
+            self.isSceneRectDirty = False
+            self.sceneRect = QRectF()
+            for item in self.items:
+                self.sceneRect = self.sceneRect.united(item.sceneBoundingRect())
+        return self.sceneRect
+
+    def UpdateBoundingRect(self):
+        """Called when the size of an item in the group changed (i.e. text is edited). The bounding rect is calculated again when it is next used."""
+        self.isSceneRectDirty = True
+
+    # ----- Transform -----
+    def SetInitialState(self):
+        """Store the position and scale of every item, and the bounding rect of the group.
+        Moves and scales are applied from these values. (i.e. itemPos = initialPos + delta)"""
+        self.initialItems = [(item, item.pos(), item.scale()) for item in self.items]
         self.initialSceneRect = self.sceneBoundingRect()
-
-    def SetInitialSceneRectALL(self):
-        """Sets the initial scene rect for all child items."""
-        for item in self.childItems():
-            item.setInitialSceneRect()
+        self.isTransformed = False
 
     def MoveGroup(self, delta:QPointF):
-        """Move Group using self.initialPos + delta"""
-        self.SetPos(self.initialPos + delta)
+        """Move all items by delta from their initial positions"""
+        for item, initialPos, initialScale in self.initialItems:
+            item.setPos(initialPos + delta)
+            item.SetDirty()
+
+        self.sceneRect = self.initialSceneRect.translated(delta)
+        self.isTransformed = True
+        self.mainView.SetSelectionHighlightPos()
 
     def CalculateScale(self, delta :QPointF, cornerName: str = None):
         """Calculate the desired scale of the group"""
-        # canScale = True
-
         if cornerName == "topLeft" or cornerName == "bottomLeft":   # Invert if the left corner is used.
             delta = -delta
         elif cornerName == "leftCenter":
@@ -66,18 +100,19 @@ class ItemGroup(QGraphicsItemGroup):
         elif cornerName == "center":
             delta = delta * 2
 
-        desiredScale = (self.initialSceneRect.width() + delta.x()) / self.boundingRect().width()
+        if self.initialSceneRect.width() == 0:
+            return
+
+        desiredScale = (self.initialSceneRect.width() + delta.x()) / self.initialSceneRect.width()
 
         if desiredScale > 0:
             self.SetScale(desiredScale, cornerName)
 
-
-    # https://stackoverflow.com/questions/56564499/how-to-rescale-graphicitems-without-disturbing-the-shape
     def SetScale(self, scale: float, cornerName: str = None):
-        """Set the scale of the group of items. 
-        
+        """Scale all items from their initial scale. The corner opposite to the dragged corner does not move.
+
         Arg:
-            scale (float) : Desired scale
+            scale (float) : Desired scale, relative to the initial scale
             cornerName (str) : name of the corner being dragged
         """
 
@@ -85,39 +120,36 @@ class ItemGroup(QGraphicsItemGroup):
             scale = 0
 
         if cornerName == "topLeft":     # Sets the pivot point based on the corner used.
-            corner = self.boundingRect().bottomRight()
+            pivot = self.initialSceneRect.bottomRight()
 
         elif cornerName == "topRight":
-            corner = self.boundingRect().bottomLeft()
-        
+            pivot = self.initialSceneRect.bottomLeft()
+
         elif cornerName == "bottomLeft":
-            corner = self.boundingRect().topRight()
+            pivot = self.initialSceneRect.topRight()
 
         elif cornerName == "bottomRight":
-            corner = self.boundingRect().topLeft()
-        
-        elif cornerName == "center" or cornerName == "leftCenter": # If no cornerName passed, transform from center
-            corner = self.boundingRect().center()
+            pivot = self.initialSceneRect.topLeft()
 
+        else:   # "center" or "leftCenter" transform from center
+            pivot = self.initialSceneRect.center()
 
-        beforeScale = self.mapToScene(corner)
-        self.setScale(scale)
-        afterScale = self.mapToScene(corner)
-        offset = beforeScale - afterScale
-        self.moveBy(offset.x(), offset.y())
+        for item, initialPos, initialScale in self.initialItems:
+            item.setScale(initialScale * scale)
+            item.setPos(pivot + (initialPos - pivot) * scale)
+            item.SetDirty()
 
+        self.sceneRect = QRectF(pivot + (self.initialSceneRect.topLeft() - pivot) * scale, self.initialSceneRect.size() * scale)
+        self.isTransformed = True
         self.mainView.SetSelectionHighlightPos()
 
-
-    def resetTransform(self) -> None:
-        """When itemGroup is deselected, it will reset the scale, and reset the transform."""
-        self.setScale(1)
-        return super().resetTransform()
-
     def SetItemData(self):
-        """Save data for child items. Used for persistent data between tab switches"""
-        for item in self.childItems():
-            item.SetData()
-
-    def mouseDoubleClickEvent(self, event) -> None:
-        return super().mouseDoubleClickEvent(event)
\ No newline at end of file
+        """Save data for the items that were moved or scaled. Used for persistent data between tab switches.
+        Plain clicks do not move the items, so no data is written."""
+        if not self.isTransformed:
+            return
+
+        self.isTransformed = False
+        for item, initialPos, initialScale in self.initialItems:
+            if item in self.items:
+                item.SaveChanges()
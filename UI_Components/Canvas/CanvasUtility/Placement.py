@@ -0,0 +1,392 @@
+"""
+Description:    This python file provides placement of new CanvasItems, so they do not overlap the CanvasItems on the canvas.
+                Occupied rects are stored in a uniform grid, and in rows of occupied cells, which are updated as CanvasItems are added, moved, and removed.
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# --Imports--
+from bisect import bisect_left, bisect_right, insort
+from math import ceil, floor, hypot, inf
+from operator import itemgetter
+
+#PySide
+from PySide6.QtCore import *
+
+# Custom Imports
+from Settings.settings import *
+
+
+def GetMergedInterval(intervals, value: float, maxDistance: float = inf):
+    """Get the merged open intervals that contain value. Intervals that touch leave their shared end free.
+
+    Args:
+        intervals ((float, float, ...)[]): open intervals as (start, end, ...) tuples, sorted by start
+        value (float): value inside the merged intervals
+        maxDistance (float, optional): The merged intervals are only followed until they are further than maxDistance from value. Defaults to inf.
+
+    Returns:
+        (float, float): start and end of the merged intervals. (value, value) if value is not inside any interval.
+    """
+    high = value    # Move right past each interval that contains high
+    for interval in intervals:
+        if interval[0] >= high or high - value > maxDistance:   # Later intervals start after high
+            break
+        if interval[1] > high:
+            high = interval[1]
+    if high == value:
+        return value, value
+
+    low = value     # Move left past each interval that contains low. Intervals that start after low were already passed
+    for interval in reversed(intervals):
+        if interval[0] < low < interval[1]:
+            low = interval[0]
+            if value - low > maxDistance:
+                break
+    return low, high
+
+
+def AddRun(runs, first: int, end: int):
+    """Add a run of occupied cells to the merged runs of a row
+
+    Args:
+        runs ((int[], int[])): first col, and last col + 1 of each merged run, sorted
+        first (int): first col of the run
+        end (int): last col + 1 of the run
+    """
+    starts, ends = runs
+    i = bisect_left(ends, first)    # Runs that overlap or touch the run are merged with it
+    j = bisect_right(starts, end)
+    if i < j:
+        first, end = min(first, starts[i]), max(end, ends[j - 1])
+    starts[i:j] = [first]
+    ends[i:j] = [end]
+
+
+class PlacementGrid:
+    def __init__(self, cellSize: float = placementCellSize, occupancyCellSize: float = placementOccupancyCellSize) -> None:
+        """Spatial index of the rects occupied on the canvas. Rects are added, moved, and removed by key (i.e. the CanvasItem), so the index does not need to be rebuilt.
+
+            Each rect is stored in every grid cell it overlaps, so the rects near a position are found without checking every rect.
+            The occupied cells of each row of a finer occupancy grid are also stored, so rows that are full can be skipped when searching for free space far away.
+            Rects are stored as (left, top, right, bottom) tuples, as comparing tuples is faster than QRectF in python.
+
+        Args:
+            cellSize (float, optional): width and height of a grid cell in scene coordinates. Defaults to placementCellSize (settings.py).
+            occupancyCellSize (float, optional): width and height of an occupancy cell in scene coordinates. Defaults to placementOccupancyCellSize (settings.py).
+        """
+        # Properties
+        self.cellSize = cellSize
+        self.occupancyCellSize = occupancyCellSize
+        self.rects = {}     # key : (left, top, right, bottom)
+        self.cells = {}     # (col, row) : {key : (left, top, right, bottom)}
+        self.rowSpans = {}  # occupancy row : {key : (first col, last col + 1)}
+        self.rowRuns = {}   # occupancy row : merged runs, as ([first col], [last col + 1]). Updated as rects are added, and calculated when first used after a rect is removed from the row
+        self.occupiedBounds = None  # (first col, first row, last col + 1, last row + 1) of the occupancy cells occupied since the grid was empty. None if the grid is empty
+
+    def __contains__(self, key):
+        return key in self.rects
+
+    def __len__(self):
+        return len(self.rects)
+
+    # ----- Update -----
+    def GetCells(self, left: float, top: float, right: float, bottom: float):
+        """Get the grid cells that a rect overlaps"""
+        for col in range(floor(left / self.cellSize), floor(right / self.cellSize) + 1):
+            for row in range(floor(top / self.cellSize), floor(bottom / self.cellSize) + 1):
+                yield (col, row)
+
+    def GetOccupancyRange(self, start: float, end: float):
+        """Get the occupancy cells that the open interval (start, end) overlaps
+
+        Returns:
+            (int, int): first cell, and last cell + 1
+        """
+        first = floor(start / self.occupancyCellSize)
+        return first, max(ceil(end / self.occupancyCellSize), first + 1)
+
+    def Insert(self, key, rect: QRectF):
+        """Mark a rect as occupied. If key is already in the grid, its rect is moved."""
+        self.Remove(key)
+        bounds = (rect.left(), rect.top(), rect.right(), rect.bottom())
+        self.rects[key] = bounds
+        for cell in self.GetCells(*bounds):
+            self.cells.setdefault(cell, {})[key] = bounds
+
+        colSpan = self.GetOccupancyRange(bounds[0], bounds[2])
+        rowSpan = self.GetOccupancyRange(bounds[1], bounds[3])
+        if self.occupiedBounds == None:
+            self.occupiedBounds = (colSpan[0], rowSpan[0], colSpan[1], rowSpan[1])
+        else:   # The bounds are not shrunk when rects are removed, so cells outside them are always free
+            firstCol, firstRow, endCol, endRow = self.occupiedBounds
+            self.occupiedBounds = (min(firstCol, colSpan[0]), min(firstRow, rowSpan[0]), max(endCol, colSpan[1]), max(endRow, rowSpan[1]))
+        for row in range(*rowSpan):
+            rowSpans = self.rowSpans.setdefault(row, {})
+            rowSpans[key] = colSpan
+            runs = self.rowRuns.setdefault(row, ([], [])) if len(rowSpans) == 1 else self.rowRuns.get(row)
+            if runs != None:
+                AddRun(runs, *colSpan)
+
+    def Remove(self, key):
+        """Remove the rect of key, if it is in the grid"""
+        bounds = self.rects.pop(key, None)
+        if bounds == None:
+            return
+
+        for cell in self.GetCells(*bounds):
+            del self.cells[cell][key]
+            if len(self.cells[cell]) == 0:
+                del self.cells[cell]
+        for row in range(*self.GetOccupancyRange(bounds[1], bounds[3])):
+            del self.rowSpans[row][key]
+            if len(self.rowSpans[row]) == 0:
+                del self.rowSpans[row]
+            self.rowRuns.pop(row, None)
+        if len(self.rects) == 0:
+            self.occupiedBounds = None
+
+    def Clear(self):
+        self.rects.clear()
+        self.cells.clear()
+        self.rowSpans.clear()
+        self.rowRuns.clear()
+        self.occupiedBounds = None
+
+    # ----- Queries -----
+    def IsOccupied(self, left: float, top: float, right: float, bottom: float):
+        """Check if a rect overlaps an occupied rect"""
+        for cell in self.GetCells(left, top, right, bottom):
+            for otherLeft, otherTop, otherRight, otherBottom in self.cells.get(cell, {}).values():
+                if left < otherRight and otherLeft < right and top < otherBottom and otherTop < bottom:
+                    return True
+        return False
+
+    def GetRectsNear(self, left: float, top: float, right: float, bottom: float):
+        """Get the occupied rects in the grid cells that a rect overlaps
+
+        Returns:
+            (left, top, right, bottom)[]: bounds of each rect
+        """
+        rects = {}
+        for cell in self.GetCells(left, top, right, bottom):
+            rects.update(self.cells.get(cell, {}))
+        return list(rects.values())
+
+    def GetRowRuns(self, row: int):
+        """Get the merged runs of occupied cells in an occupancy row
+
+        Returns:
+            (int[], int[]): first col, and last col + 1 of each run, sorted. Both are sorted, so they can be searched with bisect.
+        """
+        runs = self.rowRuns.get(row)
+        if runs == None:
+            starts, ends = [], []
+            for first, end in sorted(self.rowSpans.get(row, {}).values()):
+                if len(ends) > 0 and first <= ends[-1]:
+                    ends[-1] = max(ends[-1], end)
+                else:
+                    starts.append(first)
+                    ends.append(end)
+            runs = self.rowRuns[row] = (starts, ends)
+        return runs
+
+    # ----- Find Free Space -----
+    def FindFreePosition(self, rect: QRectF, spacing: float = placementSpacing):
+        """Find the nearest position to rect where it does not overlap occupied rects.
+
+            The occupancy rows are searched first for a free block of cells, which is always found (See FindOpenPosition).
+            Positions nearer than that block, within about one rect size, are then searched exactly, so gaps between nearby rects are found (See FindNearbyPosition).
+
+        Args:
+            rect (QRectF): rect to place, in scene coordinates
+            spacing (float, optional): min space between rect and occupied rects. Defaults to placementSpacing (settings.py).
+
+        Returns:
+            QPointF: top left position of the free rect
+        """
+        width, height = rect.width(), rect.height()
+        left, top = rect.left(), rect.top()
+        if not self.IsOccupied(left - spacing, top - spacing, left + width + spacing, top + height + spacing):
+            return rect.topLeft()
+
+        position, distance = self.FindOpenPosition(left, top, width, height, spacing)
+        nearbyPosition = self.FindNearbyPosition(left, top, width, height, spacing, distance)
+        if nearbyPosition != None:
+            position = nearbyPosition
+        return QPointF(*position)
+
+    def FindNearbyPosition(self, left: float, top: float, width: float, height: float, spacing: float, maxDistance: float = inf):
+        """Find the nearest free position within max(width, height) + 2 * spacing, and within maxDistance, of (left, top).
+
+            Each nearby rect blocks an open range of top left positions. Below top, the nearest free position is either at y = top or at the bottom edge of a blocked range,
+            as the rows between them are blocked by at least the ranges blocking the row above. Above top, it is at the top edge of a blocked range.
+            Those rows are swept outwards from top, and the search stops once a row is further than the nearest free position found.
+            A row is only checked if a range that blocked x near left in the last checked row ends at the row. Otherwise the row is blocked at least as far from left.
+            The occupancy cells inside a free position are free, so the rows are only swept if a block of those cells is free nearby.
+
+        Returns:
+            (float, float): top left of the free position. None if there is no free position nearer than maxDistance.
+        """
+        searchDistance = min(max(width, height) + 2 * spacing, maxDistance)
+        size = self.occupancyCellSize
+        innerColCount, innerRowCount = floor((width + 2 * spacing) / size) - 1, floor((height + 2 * spacing) / size) - 1   # Occupancy cells always inside the spaced rect
+        if innerColCount > 0 and innerRowCount > 0 and not self.IsBlockFreeNear((left - spacing) / size, (top - spacing) / size, innerColCount, innerRowCount, searchDistance / size + 1):
+            return None     # Every free position contains a free block of those cells
+
+        blocked = []    # (left, right, top, bottom) of the open range of top left positions blocked by each nearby rect
+        for otherLeft, otherTop, otherRight, otherBottom in self.GetRectsNear(left - searchDistance - spacing, top - searchDistance - spacing,
+                                                                              left + width + searchDistance + spacing, top + height + searchDistance + spacing):
+            blockedRange = (otherLeft - spacing - width, otherRight + spacing, otherTop - spacing - height, otherBottom + spacing)
+            if blockedRange[0] < left + searchDistance and left - searchDistance < blockedRange[1] and blockedRange[2] < top + searchDistance and top - searchDistance < blockedRange[3]:
+                blocked.append(blockedRange)   # Rects in the same grid cells that do not block positions within searchDistance are skipped
+
+        position, positionDistance = None, searchDistance
+        for direction in (1, -1):   # Rows from top downwards, then rows above top upwards
+            leaving = {}    # y : ranges that end at row y
+            for blockedRange in blocked:
+                y = blockedRange[3] if direction == 1 else blockedRange[2]
+                if (y - top) * direction > 0:
+                    leaving.setdefault(y, []).append(blockedRange)
+            rows = sorted(leaving, reverse = direction == -1)
+            entering = sorted(blocked, key=itemgetter(2) if direction == 1 else itemgetter(3), reverse = direction == -1)  # Ranges in the order the rows enter them
+
+            active, i = [], 0
+            low, high = -inf, inf   # x range blocked near left in the last checked row
+            for y in ([top] + rows if direction == 1 else rows):
+                rowDistance = abs(y - top)
+                if rowDistance >= positionDistance:
+                    break
+                while i < len(entering) and (entering[i][2] < y if direction == 1 else entering[i][3] > y):
+                    insort(active, entering[i])     # Sorted by left
+                    i += 1
+                maxRowDistance = (positionDistance ** 2 - rowDistance ** 2) ** 0.5
+                checkLow, checkHigh = max(low, left - maxRowDistance), min(high, left + maxRowDistance)
+                if y != top and not any(blockedLeft < checkHigh and checkLow < blockedRight for blockedLeft, blockedRight, blockedTop, blockedBottom in leaving[y]):
+                    continue
+
+                active = [blockedRange for blockedRange in active if blockedRange[2] < y < blockedRange[3]]
+                low, high = GetMergedInterval(active, left, maxRowDistance)
+                x = low if left - low <= high - left else high
+                if abs(x - left) <= maxRowDistance:
+                    position, positionDistance = (x, y), hypot(x - left, rowDistance)
+        return position
+
+    def IsBlockFreeNear(self, col: float, row: float, colCount: int, rowCount: int, distance: float):
+        """Check if a block of colCount x rowCount occupancy cells is free within distance cells of (col, row)"""
+        for bandRow in range(ceil(row - distance), floor(row + distance) + 1):
+            if self.FindFreeColumn(bandRow, rowCount, colCount, col, distance) != None:
+                return True
+        return False
+
+    def FindOpenPosition(self, left: float, top: float, width: float, height: float, spacing: float):
+        """Find the nearest free block of occupancy cells, then slide it towards (left, top) until it touches an occupied rect.
+
+            Blocks just outside the occupied bounds are always free, so the nearest of those is found first. Bands of rows are then checked outwards from top,
+            up to placementSearchDistance (settings.py) away, and the search ends once a band is further than the nearest free block.
+            In each band, only columns nearer than the nearest free block are checked.
+
+        Returns:
+            ((float, float), float): top left of the free position, and its distance from (left, top)
+        """
+        size = self.occupancyCellSize
+        colCount = ceil((width + 2 * spacing) / size)
+        rowCount = ceil((height + 2 * spacing) / size)
+        idealCol, idealRow = (left - spacing) / size, (top - spacing) / size    # Block position that rect is at
+        baseCol, baseRow = round(idealCol), round(idealRow)
+
+        # Blocks outside the occupied bounds
+        firstCol, firstRow, endCol, endRow = self.occupiedBounds
+        block, blockDistance = None, inf
+        for col, row in ((min(baseCol, firstCol - colCount), baseRow), (max(baseCol, endCol), baseRow),
+                         (baseCol, min(baseRow, firstRow - rowCount)), (baseCol, max(baseRow, endRow))):
+            distance = hypot((col - idealCol) * size, (row - idealRow) * size)
+            if distance < blockDistance:
+                block, blockDistance = (col, row), distance
+
+        # Blocks inside the occupied bounds
+        for offset in range(ceil(placementSearchDistance / size) + 1):
+            if (offset - 0.5) * size > blockDistance:  # Every row in the remaining bands is further than the block found
+                break
+            for row in ((baseRow,) if offset == 0 else (baseRow - offset, baseRow + offset)):
+                rowDistance = abs(row - idealRow) * size
+                if rowDistance >= blockDistance:
+                    continue
+                col = self.FindFreeColumn(row, rowCount, colCount, idealCol, (blockDistance ** 2 - rowDistance ** 2) ** 0.5 / size)
+                if col != None:
+                    distance = hypot((col - idealCol) * size, rowDistance)
+                    if distance < blockDistance:
+                        block, blockDistance = (col, row), distance
+
+        x, y = block[0] * size + spacing, block[1] * size + spacing
+        x = self.SlideTowards(x, y, left, width, height, spacing, horizontal = True)
+        y = self.SlideTowards(y, x, top, width, height, spacing, horizontal = False)
+        return (x, y), hypot(x - left, y - top)
+
+    def FindFreeColumn(self, row: int, rowCount: int, colCount: int, idealCol: float, maxDistance: float):
+        """Find the nearest column to idealCol where a block of colCount x rowCount occupancy cells, starting at row, is free.
+        From idealCol, the block jumps past the runs it overlaps to the right and to the left, until it is free or further than maxDistance.
+
+        Returns:
+            int: first column of the block. None if there is no free block within maxDistance columns.
+        """
+        rowRuns = [self.GetRowRuns(bandRow) for bandRow in range(row, row + rowCount)]
+        baseCol = round(idealCol)
+
+        rightCol = baseCol
+        while rightCol - idealCol <= maxDistance:
+            blocked = False
+            for starts, ends in rowRuns:
+                i = bisect_left(starts, rightCol + colCount) - 1   # Last run starting before the block ends
+                if i >= 0 and ends[i] > rightCol:
+                    rightCol = ends[i]
+                    blocked = True
+            if not blocked:
+                break
+        if rightCol == baseCol and rightCol - idealCol <= maxDistance:
+            return rightCol
+        maxDistance = min(maxDistance, rightCol - idealCol)
+
+        leftCol = baseCol
+        while idealCol - leftCol < maxDistance:
+            blocked = False
+            for starts, ends in rowRuns:
+                i = bisect_right(ends, leftCol)     # First run ending after the block starts
+                if i < len(starts) and starts[i] < leftCol + colCount:
+                    leftCol = starts[i] - colCount
+                    blocked = True
+            if not blocked:
+                return leftCol
+        return rightCol if rightCol - idealCol <= maxDistance else None
+
+    def SlideTowards(self, position: float, otherPosition: float, target: float, width: float, height: float, spacing: float, horizontal: bool):
+        """Move a free position along one axis towards target, until the rect would be within spacing of an occupied rect
+
+        Args:
+            position (float): x of the free position if horizontal, otherwise y
+            otherPosition (float): y of the free position if horizontal, otherwise x
+            target (float): position to move towards
+
+        Returns:
+            float: new x if horizontal, otherwise y
+        """
+        if position == target:
+            return position
+
+        if horizontal:
+            low, high = min(position, target), max(position, target)
+            rects = [(otherLeft, otherRight) for otherLeft, otherTop, otherRight, otherBottom
+                     in self.GetRectsNear(low - spacing, otherPosition - spacing, high + width + spacing, otherPosition + height + spacing)
+                     if otherTop < otherPosition + height + spacing and otherPosition - spacing < otherBottom]
+            size = width
+        else:
+            low, high = min(position, target), max(position, target)
+            rects = [(otherTop, otherBottom) for otherLeft, otherTop, otherRight, otherBottom
+                     in self.GetRectsNear(otherPosition - spacing, low - spacing, otherPosition + width + spacing, high + height + spacing)
+                     if otherLeft < otherPosition + width + spacing and otherPosition - spacing < otherRight]
+            size = height
+
+        if position > target:   # Stop at the nearest rect before position
+            return max([target] + [otherEnd + spacing for otherStart, otherEnd in rects if otherEnd + spacing <= position])
+        return min([target] + [otherStart - spacing - size for otherStart, otherEnd in rects if otherStart - spacing - size >= position])
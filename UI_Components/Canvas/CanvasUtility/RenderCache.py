@@ -0,0 +1,150 @@
+"""
+Description:    This python file provides the render cache policy, which sets the QGraphicsItem cache mode of CanvasItems.
+                The cache mode depends on the CanvasItem type and the zoom of the canvas, and the total cache memory is limited.
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# --Imports--
+from math import ceil
+
+#PySide
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+from PySide6.QtCore import *
+
+# Custom Imports
+from Settings.settings import *
+
+# Zoom Bands
+farZoomBand = 0         # Zoomed out. Items are small, so they are cached at a fixed low resolution that does not need to be re-rendered when zooming
+normalZoomBand = 1      # Items are cached at screen resolution, so panning does not re-render them
+closeZoomBand = 2       # Zoomed in. Caching at screen resolution would create very large pixmaps, so items are not cached
+
+
+def ReservePixmapCache():
+    """Increase the QPixmapCache limit by renderCacheLimit (settings.py). Called once at startup.
+    QGraphicsItem caches are stored in the QPixmapCache, and its default limit (about 10 MB) is shared with Qt's own pixmaps, so the render cache budget would not fit."""
+    QPixmapCache.setCacheLimit(QPixmapCache.cacheLimit() + renderCacheLimit)
+
+
+class RenderCachePolicy:
+    def __init__(self, mainCanvas) -> None:
+        """Sets the cache mode for every CanvasItem on the canvas.
+
+            Text and File CanvasItems are cached, since laying out and drawing their text is slow.
+            Image CanvasItems are only cached when zoomed out, since drawing the image is already a single blit.
+
+        Args:
+            mainCanvas (MainCanvas): canvas that contains the CanvasItems
+        """
+        # References
+        self.mainCanvas = mainCanvas
+
+        # Properties
+        self.zoomBand = normalZoomBand
+        self.cacheBytes = {}    # CanvasItem : max memory (bytes) the CanvasItem's cache can use in the current zoom band
+        self.totalCacheBytes = 0
+
+    # ----- Utility -----
+    def GetZoomBand(self, zoomScale: float):
+        """Get the zoom band of the zoom scale
+
+        Args:
+            zoomScale (float): zoom of the canvas
+        """
+        if zoomScale < renderCacheZoomBands[0]:
+            return farZoomBand
+        elif zoomScale < renderCacheZoomBands[1]:
+            return normalZoomBand
+        return closeZoomBand
+
+    def GetCacheMode(self, canvasItem):
+        """Get the cache mode for the CanvasItem in the current zoom band
+
+        Returns:
+            (QGraphicsItem.CacheMode, QSize, int): Cache mode, cache size used for ItemCoordinateCache, and the max memory used by the cache in bytes, at any zoom in the zoom band.
+        """
+        if not canvasItem.canCache():
+            return QGraphicsItem.NoCache, QSize(), 0
+
+        itemSize = canvasItem.boundingRect().size() * canvasItem.scale()
+        devicePixelRatio = self.mainCanvas.devicePixelRatioF()
+
+        if self.zoomBand == farZoomBand:    # Cache at the highest resolution used in the far zoom band
+            cacheScale = renderCacheZoomBands[0] * devicePixelRatio
+            cacheSize = QSize(max(1, ceil(itemSize.width() * cacheScale)), max(1, ceil(itemSize.height() * cacheScale)))
+            return QGraphicsItem.ItemCoordinateCache, cacheSize, cacheSize.width() * cacheSize.height() * 4
+
+        elif self.zoomBand == normalZoomBand and canvasItem.nodeType != "Image_Node":
+            deviceScale = renderCacheZoomBands[1] * devicePixelRatio    # The cache is re-rendered at the current zoom, so its size is estimated at the highest zoom in the band
+            return QGraphicsItem.DeviceCoordinateCache, QSize(), ceil(itemSize.width() * deviceScale) * ceil(itemSize.height() * deviceScale) * 4
+
+        return QGraphicsItem.NoCache, QSize(), 0
+
+    # ----- Set Cache Mode -----
+    def ApplyCacheMode(self, canvasItem):
+        """Set the cache mode of the CanvasItem. If the cache memory limit would be exceeded, the CanvasItem is not cached.
+
+        Args:
+            canvasItem (CanvasItem): CanvasItem that the cache mode is set on
+        """
+        cacheMode, cacheSize, cacheBytes = self.GetCacheMode(canvasItem)
+
+        self.totalCacheBytes -= self.cacheBytes.pop(canvasItem, 0)
+        if self.totalCacheBytes + cacheBytes > min(renderCacheLimit, QPixmapCache.cacheLimit()) * 1024:   # Limit the memory used by all caches. Caches over the QPixmapCache limit would evict each other
+            cacheMode, cacheSize, cacheBytes = QGraphicsItem.NoCache, QSize(), 0
+
+        if cacheBytes > 0:
+            self.cacheBytes[canvasItem] = cacheBytes
+            self.totalCacheBytes += cacheBytes
+
+        for item in canvasItem.GetCachedItems():
+            item.setCacheMode(cacheMode, cacheSize)
+
+    def ApplyCacheModeAll(self):
+        """Set the cache mode for every CanvasItem on the canvas. Visible CanvasItems are given cache memory first."""
+        self.Clear()
+
+        visibleItems = self.mainCanvas.GetCanvasItemsFromList(self.mainCanvas.items(self.mainCanvas.viewport().rect()))
+        for item in visibleItems:
+            self.ApplyCacheMode(item)
+
+        visibleItems = set(visibleItems)
+        for item in self.mainCanvas.canvasItems:
+            if item not in visibleItems:
+                self.ApplyCacheMode(item)
+
+    def ItemChanged(self, canvasItem):
+        """Called when the CanvasItem was edited or scaled. Invalidates the cache and updates the cache mode."""
+        if canvasItem.scene() != None:
+            self.ApplyCacheMode(canvasItem)
+            canvasItem.update()
+
+    def RemoveItem(self, canvasItem):
+        """Remove the CanvasItem from the cache memory total"""
+        self.totalCacheBytes -= self.cacheBytes.pop(canvasItem, 0)
+
+    def Clear(self):
+        """Reset the cache memory total. Called when all CanvasItems are removed from the canvas."""
+        self.cacheBytes.clear()
+        self.totalCacheBytes = 0
+
+    # ----- Events -----
+    def ZoomChanged(self, zoomScale: float):
+        """Called when the zoom of the canvas changes. If the zoom band changed, update the cache mode of all CanvasItems."""
+        zoomBand = self.GetZoomBand(zoomScale)
+        if zoomBand != self.zoomBand:
+            self.zoomBand = zoomBand
+            self.ApplyCacheModeAll()
+
+        for item in self.mainCanvas.GetSelected():  # The selection border width depends on the zoom
+            item.update()
+
+    def InvalidateVisible(self):
+        """Re-render the caches of visible CanvasItems. Called after interaction ends, as caches created during interaction are low quality."""
+        for item in self.mainCanvas.GetCanvasItemsFromList(self.mainCanvas.items(self.mainCanvas.viewport().rect())):
+            if item.cacheMode() != QGraphicsItem.NoCache:
+                for cachedItem in item.GetCachedItems():
+                    cachedItem.update()
@@ -0,0 +1,39 @@
+"""
+Description:    This python file provides the render context, which stores values that are the same for every CanvasItem painted in a frame.
+                MainCanvas updates the render context once per viewport update, so CanvasItems do not recalculate these values in paint().
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# --Imports--
+#PySide
+from PySide6.QtGui import *
+from PySide6.QtCore import *
+
+
+class RenderContext:
+    def __init__(self) -> None:
+        """Values shared by every CanvasItem painted in the current frame.
+
+        Properties:
+            self.visibleSceneRect (QRectF) : Area of the scene visible in the viewport
+            self.zoomScale (float) : Zoom of the viewport (MainCanvas.GetZoomScale())
+            self.sceneToDevice (QTransform) : Transform from scene coordinates to viewport coordinates
+            self.deviceToScene (QTransform) : Transform from viewport coordinates to scene coordinates
+        """
+        self.visibleSceneRect = QRectF()
+        self.zoomScale: float = 1
+        self.sceneToDevice = QTransform()
+        self.deviceToScene = QTransform()
+
+    def Update(self, mainCanvas):
+        """Recalculate the render context from the canvas. Called once before each viewport update.
+
+        Args:
+            mainCanvas (MainCanvas): canvas being painted
+        """
+        self.sceneToDevice = mainCanvas.viewportTransform()
+        self.deviceToScene = self.sceneToDevice.inverted()[0]
+        self.visibleSceneRect = self.deviceToScene.mapRect(QRectF(mainCanvas.viewport().rect()))
+        self.zoomScale = self.sceneToDevice.m11()
@@ -16,6 +16,7 @@ from PySide6.QtCore import *
 from Utility.UtilityFunctions import *
 from Settings.settings import *
 from Utility import ConsoleLog
+from UI_Components.Canvas.CanvasUtility.ItemGroup import ItemGroup
 
 
 class SelectionHighlight(QGraphicsWidget):
@@ -37,7 +38,7 @@ class SelectionHighlight(QGraphicsWidget):
 
         # Set Attributes
         self.setAcceptHoverEvents(True)
-        self.setZValue(9999) #Always on Top
+        self.setZValue(ItemGroup.selectedZOffset * 2) #Always on Top, including selected CanvasItems
         self.hide()
 
     def SetRect(self, rect:QRectF):
@@ -86,15 +87,17 @@ class SelectionHighlight(QGraphicsWidget):
     def paint(self, painter, option, widget) -> None:
         """Used to draw border and corner resize buttons on item"""
         painter.save()
-        painter.setRenderHint(QPainter.Antialiasing)
+        self.MainCanvas.SetRenderQuality(painter)
+
+        zoomScale = self.MainCanvas.renderContext.zoomScale
 
         # Draw the border
-        borderWidth = 2/self.MainCanvas.GetZoomScale()
+        borderWidth = 2/zoomScale
         painter.setPen(QPen(QBrush(defaultAccentColor), borderWidth))
         painter.drawRect(self.itemRect)
 
         # Draw CornerResizeDots
-        tempCornerSize = cornerResizeButtonRadius / self.MainCanvas.GetZoomScale()
+        tempCornerSize = cornerResizeButtonRadius / zoomScale
         painter.setBrush(QBrush(defaultAccentColor))
         painter.drawEllipse(self.itemRect.topLeft(),      tempCornerSize, tempCornerSize)       # QPoint() adds offset for each corner
         painter.drawEllipse(self.itemRect.topRight(),     tempCornerSize, tempCornerSize)
@@ -147,6 +150,7 @@ class SelectionHighlight(QGraphicsWidget):
         newScale = newSize / self.initialSize.width()
         
         if self.currentDrag != None and self.canDrag:
+            self.MainCanvas.BeginInteraction()
             self.MainCanvas.selectedItemGroup.CalculateScale(deltaDragPos, self.currentDrag)
 
         return super().mouseMoveEvent(event)
@@ -0,0 +1,84 @@
+"""
+Description:    This python file provides snapping of dragged CanvasItems to the edges and centers of the other visible CanvasItems.
+                The edges are stored in sorted lists, so each frame of a drag only does a binary search, instead of checking every CanvasItem.
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# --Imports--
+from bisect import bisect_left
+
+#PySide
+from PySide6.QtCore import *
+
+
+class SnapIndex:
+    def __init__(self, rects) -> None:
+        """Sorted left, center, and right x values, and top, center, and bottom y values of rects. Created when a drag starts.
+
+        Args:
+            rects (QRectF[]): scene bounding rects of the CanvasItems that can be snapped to (i.e. the visible CanvasItems that are not dragged)
+        """
+        xEdges = []     # (x, rect index)
+        yEdges = []     # (y, rect index)
+        for i, rect in enumerate(rects):
+            center = rect.center()
+            xEdges.extend(((rect.left(), i), (center.x(), i), (rect.right(), i)))
+            yEdges.extend(((rect.top(), i), (center.y(), i), (rect.bottom(), i)))
+        xEdges.sort(key=lambda edge: edge[0])
+        yEdges.sort(key=lambda edge: edge[0])
+
+        # Properties
+        self.xValues = [x for x, i in xEdges]
+        self.xRects = [rects[i] for x, i in xEdges]     # Rect of each x value, used to draw the guide
+        self.yValues = [y for y, i in yEdges]
+        self.yRects = [rects[i] for y, i in yEdges]
+
+    def isEmpty(self):
+        return len(self.xValues) == 0
+
+    def SnapAxis(self, values, movingValues, threshold: float):
+        """Find the sorted value nearest to any of the moving rect's values on one axis.
+
+        Args:
+            values (float[]): sorted edge values
+            movingValues (float[]): edges and center of the moving rect
+            threshold (float): max distance to snap
+
+        Returns:
+            (float, int): offset that moves the moving rect onto the value, and the index of the value. (0, None) if no value is within threshold.
+        """
+        bestOffset, bestIndex = 0, None
+        for movingValue in movingValues:
+            i = bisect_left(values, movingValue)
+            for j in (i - 1, i):    # The nearest value is on one side of the insertion point
+                if 0 <= j < len(values):
+                    offset = values[j] - movingValue
+                    if abs(offset) <= threshold and (bestIndex == None or abs(offset) < abs(bestOffset)):
+                        bestOffset, bestIndex = offset, j
+        return bestOffset, bestIndex
+
+    def Snap(self, rect: QRectF, threshold: float):
+        """Snap a moving rect to the nearest edges or centers within threshold. Each axis is snapped separately.
+
+        Args:
+            rect (QRectF): scene bounding rect of the dragged CanvasItems
+            threshold (float): max distance to snap, in scene coordinates
+
+        Returns:
+            (QPointF, QLineF[]): offset to add to the drag, and the guide lines to draw, in scene coordinates
+        """
+        center = rect.center()
+        dx, xIndex = self.SnapAxis(self.xValues, (rect.left(), center.x(), rect.right()), threshold)
+        dy, yIndex = self.SnapAxis(self.yValues, (rect.top(), center.y(), rect.bottom()), threshold)
+
+        snappedRect = rect.translated(dx, dy)
+        guides = []
+        if xIndex != None:  # Vertical line through both rects
+            x, target = self.xValues[xIndex], self.xRects[xIndex]
+            guides.append(QLineF(x, min(snappedRect.top(), target.top()), x, max(snappedRect.bottom(), target.bottom())))
+        if yIndex != None:  # Horizontal line through both rects
+            y, target = self.yValues[yIndex], self.yRects[yIndex]
+            guides.append(QLineF(min(snappedRect.left(), target.left()), y, max(snappedRect.right(), target.right()), y))
+        return QPointF(dx, dy), guides
@@ -0,0 +1,298 @@
+"""
+Description:    This python file provides tiled rendering for very large images (i.e. scans and maps).
+                The image is decoded into fixed-size tiles at multiple levels of detail, and only the tiles that are visible are drawn.
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# --Imports--
+import hashlib
+import os
+import shutil
+from collections import OrderedDict
+from math import ceil, floor, log2
+from time import time
+
+#PySide
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+from PySide6.QtCore import *
+
+# Custom Imports
+from Settings.settings import *
+from Utility import ConsoleLog
+from Utility.BackgroundTasks import RunInBackground
+from Utility.ImageLoader import PrepareImage
+
+appStartTime = time()   # Tile cache folders used since the app started are not removed by PruneTileCache
+isTileCachePruned = False
+
+
+# ----- Tile Decoding (Run on background threads) -----
+def GetTileFileName(cacheFolder: str, level: int, col: int, row: int):
+    """Get the location of a tile in the disk tile cache"""
+    return os.path.join(cacheFolder, str(level) + "_" + str(col) + "_" + str(row) + ".png")
+
+def GetTileRect(imageSize: QSize, level: int, col: int, row: int):
+    """Get the rect of a tile, in the coordinates of the image scaled to the level
+
+    Returns:
+        QRect: rect of the tile, limited to the size of the scaled image
+    """
+    scale = 1 / 2**level
+    scaledRect = QRect(0, 0, ceil(imageSize.width() * scale), ceil(imageSize.height() * scale))
+    return QRect(col * imageTileSize, row * imageTileSize, imageTileSize, imageTileSize).intersected(scaledRect)
+
+def DecodeTile(imagePath: str, imageSize: QSize, level: int, col: int, row: int, cacheFolder: str = None, cacheOnly = False):
+    """Decode a single tile with QImageReader. If the tile is in the disk tile cache, it is read from the cache instead.
+    Formats such as JPEG can decode part of the image, so the rest of the image is not decoded.
+
+    Args:
+        cacheOnly (bool, optional): If True, the tile is only read from the disk tile cache (i.e. formats that can not decode part of the image). Defaults to False.
+
+    Returns:
+        ((int, int, int), QImage): The tile key (level, col, row) and the decoded tile. The tile is null if it could not be decoded.
+    """
+    key = (level, col, row)
+    if cacheFolder != None:     # Read tile from the disk tile cache
+        tile = PrepareImage(QImage(GetTileFileName(cacheFolder, level, col, row)))
+        if not tile.isNull() or cacheOnly:
+            return key, tile
+
+    tileRect = GetTileRect(imageSize, level, col, row)
+    reader = QImageReader(imagePath)
+    reader.setAllocationLimit(0)
+    if level == 0:
+        reader.setClipRect(tileRect)
+    else:
+        scale = 1 / 2**level
+        reader.setScaledSize(QSize(ceil(imageSize.width() * scale), ceil(imageSize.height() * scale)))
+        reader.setScaledClipRect(tileRect)
+    tile = PrepareImage(reader.read())
+
+    if cacheFolder != None and not tile.isNull():
+        os.makedirs(cacheFolder, exist_ok=True)
+        tile.save(GetTileFileName(cacheFolder, level, col, row))
+
+    return key, tile
+
+def DecodeAllTiles(imagePath: str, imageSize: QSize, maxLevel: int, cacheFolder: str = None):
+    """Decode the whole image once and split it into tiles for every level.
+    Used for image formats that can not decode part of an image (i.e. PNG), so the image is not decoded once per tile.
+
+    Returns:
+        dict: (level, col, row) : QImage, for every tile. If the disk tile cache is used, only the lowest detail tile is returned.
+    """
+    if cacheFolder != None and os.path.exists(GetTileFileName(cacheFolder, maxLevel, 0, 0)):     # Tiles were already created
+        return {(maxLevel, 0, 0): PrepareImage(QImage(GetTileFileName(cacheFolder, maxLevel, 0, 0)))}
+
+    reader = QImageReader(imagePath)
+    reader.setAllocationLimit(imageFullDecodeLimit)     # The whole image is decoded at once, so its memory is limited (See TiledImage.canDecodeAllTiles)
+    image = reader.read()
+    if image.isNull():
+        ConsoleLog.error("Tiled Image", "Unable to decode " + imagePath + ": " + reader.errorString())
+        return {}
+
+    if cacheFolder != None:
+        os.makedirs(cacheFolder, exist_ok=True)
+
+    tiles = {}
+    for level in range(maxLevel + 1):
+        if level > 0:   # Each level is half the size of the previous level
+            image = image.scaled((image.width() + 1) // 2, (image.height() + 1) // 2, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+        for row in range(ceil(image.height() / imageTileSize)):
+            for col in range(ceil(image.width() / imageTileSize)):
+                tile = image.copy(QRect(col * imageTileSize, row * imageTileSize, imageTileSize, imageTileSize).intersected(image.rect()))
+                tile = PrepareImage(tile)
+                if cacheFolder != None:
+                    tile.save(GetTileFileName(cacheFolder, level, col, row))
+                if cacheFolder == None or level == maxLevel:
+                    tiles[(level, col, row)] = tile
+
+    return tiles
+
+def PruneTileCache(cacheLocation: str = imageTileCacheLocation, sizeLimit: int = imageTileCacheLimit, maxAge: float = imageTileCacheMaxAge):
+    """Remove the tile folders of images that have not been drawn for maxAge days, then the least recently used folders until the cache fits in sizeLimit.
+    Folders of images that changed are never used again, as their key changes (See TiledImage.GetCacheFolder), so they are removed by age. Run on a background thread.
+
+    Args:
+        sizeLimit (int, optional): MB. Defaults to imageTileCacheLimit (settings.py).
+        maxAge (float, optional): days. Defaults to imageTileCacheMaxAge (settings.py).
+    """
+    if not os.path.isdir(cacheLocation):
+        return
+
+    folders = []    # (last used time, size in bytes, path)
+    for entry in os.scandir(cacheLocation):
+        if not entry.is_dir():
+            continue
+        try:
+            folderSize = sum(tileEntry.stat().st_size for tileEntry in os.scandir(entry.path) if tileEntry.is_file())
+            folders.append((entry.stat().st_mtime, folderSize, entry.path))
+        except OSError:
+            continue
+    folders.sort()
+
+    totalSize = sum(folderSize for lastUsed, folderSize, folderPath in folders)
+    for lastUsed, folderSize, folderPath in folders:
+        if lastUsed >= appStartTime:    # The folder is used by an image on the canvas
+            break
+        if totalSize <= sizeLimit * 1024 * 1024 and time() - lastUsed <= maxAge * 24 * 60 * 60:
+            break
+        shutil.rmtree(folderPath, ignore_errors=True)
+        totalSize -= folderSize
+
+
+class TiledImage(QObject):
+    TileLoaded = Signal(QRectF) # Emits the rect (image coordinates) of the loaded tile
+
+    def __init__(self, imagePath: str, imageSize: QSize) -> None:
+        """Provides tiled, level of detail rendering of a very large image.
+
+            Level 0 is the full resolution image, each following level is half the size of the previous level.
+            The highest level (self.maxLevel) fits in a single tile, and is drawn behind the other tiles while they load.
+
+        Args:
+            imagePath (str): path to the image
+            imageSize (QSize): full resolution size of the image
+        """
+        super().__init__()
+
+        # Properties
+        self.imagePath = imagePath
+        self.imageSize = imageSize
+        self.maxLevel = max(0, ceil(log2(max(imageSize.width(), imageSize.height()) / imageTileSize)))
+        self.tiles = OrderedDict()      # (level, col, row) : QImage. Least recently used tiles are removed first.
+        self.pendingTiles = set()       # Tiles that are being decoded
+        self.decodeAllTiles = not QImageReader(imagePath).supportsOption(QImageIOHandler.ClipRect)   # Formats that can not decode part of the image are decoded once, then split into tiles
+        self.tilesCreated = False       # If every tile has been created by DecodeAllTiles
+        self.isCreatingTiles = False
+        self.cacheFolder = self.GetCacheFolder() if imageTileCacheEnabled else None
+
+        # Formats that can not decode part of the image are only tiled if the whole image fits in imageFullDecodeLimit, or its tiles are already in the disk cache
+        self.canDecodeAllTiles = imageSize.width() * imageSize.height() * 4 <= imageFullDecodeLimit * 1024 * 1024 or \
+                                 (self.cacheFolder != None and os.path.exists(GetTileFileName(self.cacheFolder, self.maxLevel, 0, 0)))
+        if self.decodeAllTiles and not self.canDecodeAllTiles:
+            ConsoleLog.warning("Tiled Image", imagePath + " is too large to display. Its format can not be decoded in parts, and decoding it needs more than " + str(imageFullDecodeLimit) + " MB.")
+
+        # INIT
+        self.UseCacheFolder()
+
+    def GetCacheFolder(self):
+        """Get the disk tile cache folder of this image. The folder changes if the image file changes."""
+        try:
+            fileStat = os.stat(self.imagePath)
+            key = self.imagePath + str(fileStat.st_mtime) + str(fileStat.st_size)
+        except OSError:
+            key = self.imagePath
+        return os.path.join(imageTileCacheLocation, hashlib.md5(key.encode("utf-8")).hexdigest())
+
+    def UseCacheFolder(self):
+        """Mark the disk tile cache folder as used, so it is removed last. The tile cache is pruned when the first TiledImage is created (See PruneTileCache)."""
+        global isTileCachePruned
+        if self.cacheFolder == None:
+            return
+        if os.path.isdir(self.cacheFolder):
+            try:
+                os.utime(self.cacheFolder)
+            except OSError:
+                pass
+        if not isTileCachePruned:
+            isTileCachePruned = True
+            RunInBackground(PruneTileCache)
+
+    def GetLevel(self, deviceScale: float):
+        """Get the level of detail needed to draw the image at deviceScale (screen pixels per image pixel)"""
+        if deviceScale <= 0:
+            return self.maxLevel
+        return min(self.maxLevel, max(0, floor(log2(1 / deviceScale))))
+
+    def GetTileImageRect(self, level: int, col: int, row: int):
+        """Get the rect of a tile in full resolution image coordinates"""
+        scale = 2**level
+        tileRect = GetTileRect(self.imageSize, level, col, row)
+        return QRectF(tileRect.x() * scale, tileRect.y() * scale, tileRect.width() * scale, tileRect.height() * scale).intersected(QRectF(QPointF(0, 0), QSizeF(self.imageSize)))
+
+    def GetTile(self, level: int, col: int, row: int, canRequest = True):
+        """Get a decoded tile. If the tile is not decoded, it is decoded on a background thread, and TileLoaded is emitted when it is ready.
+
+        Args:
+            canRequest (bool, optional): If False, missing tiles are not decoded. Defaults to True.
+
+        Returns:
+            QImage: the tile, or None if the tile is not decoded yet.
+        """
+        key = (level, col, row)
+        if key in self.tiles:
+            self.tiles.move_to_end(key)
+            return self.tiles[key]
+
+        if not canRequest or key in self.pendingTiles:
+            return None
+
+        if self.decodeAllTiles and not self.tilesCreated:   # The whole image needs to be decoded to create the tile
+            if not self.isCreatingTiles and self.canDecodeAllTiles:
+                self.isCreatingTiles = True
+                RunInBackground(DecodeAllTiles, self.imagePath, self.imageSize, self.maxLevel, self.cacheFolder, onFinished = self.AllTilesDecoded)
+        elif self.decodeAllTiles and self.cacheFolder == None:  # Without a disk cache, every created tile is kept in memory (See AddTile)
+            pass
+        else:   # Decode the single tile, or read it from the disk tile cache
+            self.pendingTiles.add(key)
+            RunInBackground(DecodeTile, self.imagePath, self.imageSize, level, col, row, self.cacheFolder, self.decodeAllTiles, onFinished = self.TileDecoded)
+        return None
+
+    def AddTile(self, key, tile: QImage):
+        """Add a decoded tile to the memory cache, removing the least recently used tiles if the cache is full."""
+        self.pendingTiles.discard(key)
+        if tile.isNull():
+            return
+
+        self.tiles[key] = tile
+        while len(self.tiles) > imageTileMemoryLimit and not (self.decodeAllTiles and self.cacheFolder == None):   # Without a disk cache, recreating a tile would decode the whole image again
+            self.tiles.popitem(last=False)
+
+        self.TileLoaded.emit(self.GetTileImageRect(*key))
+
+    def TileDecoded(self, result):
+        """Called on the GUI thread when DecodeTile finishes"""
+        key, tile = result
+        if tile.isNull() and self.decodeAllTiles:   # The tile was removed from the disk cache, so the tiles are created again
+            self.tilesCreated = False
+        self.AddTile(key, tile)
+
+    def AllTilesDecoded(self, tiles):
+        """Called on the GUI thread when DecodeAllTiles finishes"""
+        self.isCreatingTiles = False
+        self.tilesCreated = len(tiles) > 0
+        for key, tile in tiles.items():
+            self.AddTile(key, tile)
+
+    def Paint(self, painter: QPainter, exposedRect: QRectF, canRequest = True):
+        """Draw the tiles that intersect exposedRect.
+
+        Args:
+            painter (QPainter): painter of the ImageCanvasItem. Item coordinates must be full resolution image coordinates.
+            exposedRect (QRectF): area of the image that is visible, in image coordinates
+            canRequest (bool, optional): If False, missing tiles are not decoded (i.e. while the canvas is being interacted with)
+        """
+        # Draw the lowest detail tile behind the other tiles, so there are no gaps while tiles load.
+        overview = self.GetTile(self.maxLevel, 0, 0)
+        if overview != None:
+            painter.drawImage(QRectF(QPointF(0, 0), QSizeF(self.imageSize)), overview)
+        else:   # Placeholder, as drawn by ImageCanvasItem until an image is decoded
+            painter.fillRect(QRectF(QPointF(0, 0), QSizeF(self.imageSize)), QColor(255, 255, 255, 25))
+
+        level = self.GetLevel(painter.worldTransform().m11())
+        if level == self.maxLevel:
+            return
+
+        scale = 2**level
+        tileExtent = imageTileSize * scale  # Size of a tile in image coordinates
+        exposedRect = exposedRect.intersected(QRectF(QPointF(0, 0), QSizeF(self.imageSize)))
+        for row in range(floor(exposedRect.top() / tileExtent), ceil(exposedRect.bottom() / tileExtent)):
+            for col in range(floor(exposedRect.left() / tileExtent), ceil(exposedRect.right() / tileExtent)):
+                tile = self.GetTile(level, col, row, canRequest)
+                if tile != None:
+                    painter.drawImage(self.GetTileImageRect(level, col, row), tile)
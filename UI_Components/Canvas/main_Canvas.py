@@ -6,6 +6,7 @@ Date Updated: 10/15/22
 """
 
 # --Imports--
+import os
 import traceback
 
 from Settings.settings import *
@@ -17,11 +18,22 @@ from UI_Components.Canvas.CanvasItem.text_CanvasItem import TextCanvasItem
 from UI_Components.Canvas.CanvasItem.file_CanvasItem import FileCanvasItem
 from UI_Components.Canvas.CanvasUtility.SelectionHighlight import *
 from UI_Components.Canvas.CanvasUtility.ItemGroup import *
-from UI_Components.ContextMenu.contextMenu import *
+from UI_Components.Canvas.CanvasUtility.RenderContext import RenderContext
+from UI_Components.Canvas.CanvasUtility.RenderCache import RenderCachePolicy
+from UI_Components.Canvas.CanvasUtility.AnimationManager import AnimationManager
+from UI_Components.Canvas.CanvasUtility.AssetWatcher import AssetWatcher
+from UI_Components.Canvas.CanvasUtility.Arrange import PackShelves, AlignRects, DistributeRects, GridLayout, MasonryLayout, GetBounds, alignments, distributions
+from UI_Components.Canvas.CanvasUtility.Placement import PlacementGrid
+from UI_Components.Canvas.CanvasUtility.SnapGuides import SnapIndex
+from Utility.BulkImport import BulkImportTask
+from Utility.FileMetadata import FileExists, GetUncachedFiles, StatFilesRequest
+from Utility.BackgroundTasks import RunInBackground
+from Utility.MetadataIndex import MetadataFilter, GetNodeTags, SetNodeTags
 
 
 class MainCanvas(QGraphicsView):
     IsCanvasEmpty = Signal(bool)
+    TabLoaded = Signal()    # Emitted when the CanvasItems of the selected tab have been created
     def __init__(self, parent) -> None:
         """This class provides the (QGraphicsView) canvas where all CanvasItems will be placed.
 
@@ -41,7 +53,7 @@ class MainCanvas(QGraphicsView):
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
 
-        # self.setCacheMode(QGraphicsView.CacheBackground)                    # Used to improve performance
+        # CacheBackground is not used, since the background is transparent. CanvasItems are cached by self.renderCachePolicy instead
         self.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
         self.setRenderHint(QPainter.Antialiasing, True)
         self.setFrameStyle(0)
@@ -55,10 +67,32 @@ class MainCanvas(QGraphicsView):
         self.canvasSize = None
         self.canvasItems = []
         self.canvasItemData = [] #Copy of canvas item data. Used for persistent data
+        self.isLoadingTab = False   # True while the files of the selected tab are checked, before its CanvasItems are created
+        self.tabLoadRequestID = 0   # Incremented each time a tab is selected, results for previously selected tabs are ignored
+        self.missingFiles = set()   # Files referenced by the selected tab that do not exist
+        self.pendingFocusItem = None    # CanvasItem data to show once the selected tab is loaded (See FocusCanvasItem)
+        self.canvasFilter = None        # MetadataFilter applied to the CanvasItems of the selected tab
+        self.hideFiltered = False       # If CanvasItems that do not match the filter are hidden, instead of dimmed
+        self.filteredItems = set()      # CanvasItems that do not match the filter
+        self.snapGuides = []            # QLineF guides drawn while dragged CanvasItems are snapped (See CanvasUtility/SnapGuides.py)
+        self.placementGrid = PlacementGrid()    # Space occupied by the CanvasItems of the selected tab. Updated as CanvasItems change, instead of rebuilt for each placement
+        self.placementChangedItems = set()      # CanvasItems whose rect in self.placementGrid is out of date (See GetPlacementGrid)
 
         # Temporary Copy variable. When CanvasItems are copied, they are set here. 
         self.copyCanvasItemData = None
 
+        # _____ Interactive Rendering _____
+        self.isInteracting = False  # True while the canvas is panned/zoomed or items are dragged. CanvasItems are painted in low quality while True
+        self.interactionTimer = QTimer(self)    # Restores full quality rendering once the user stops interacting
+        self.interactionTimer.setSingleShot(True)
+        self.interactionTimer.setInterval(interactionIdleTime)
+        self.interactionTimer.timeout.connect(self.EndInteraction)
+        self.renderContext = RenderContext()    # Values shared by all CanvasItems painted in a frame. Updated in self.paintEvent
+        self.renderCachePolicy = RenderCachePolicy(self)    # Sets the cache mode of CanvasItems
+        self.animationManager = AnimationManager(self)      # Plays animated ImageCanvasItems on a single timer
+        self.assetWatcher = AssetWatcher(self)      # Reloads CanvasItems when their files change on disk
+        self.assetWatcher.FilesChanged.connect(self.AssetsChanged)
+
         # _____ Rubber Band Selection _____
         self.rubberBand = QRubberBand(QRubberBand.Rectangle, self)
 
@@ -70,8 +104,8 @@ class MainCanvas(QGraphicsView):
         self.selectionHighlight = SelectionHighlight(self)
 
         # _____ Item Group For Selection _____
-        self.selectedItemGroup = ItemGroup(mainView=self)
-        self.selectedItemGroup.setZValue(9998)
+        self.selectedItemGroup = ItemGroup(mainView=self)   # Selected items stay in the scene. The group only moves and scales them
+        self.selectedItems = self.selectedItemGroup.items   # Selected CanvasItems, in the order they were selected. Used as an ordered set
 
         # _____ Signals _____
         self.IsCanvasEmpty.connect(self.MainContent.setCanvasEmpty)
@@ -82,7 +116,6 @@ class MainCanvas(QGraphicsView):
         self.mainScene = MainScene(0,0, canvasSize[0], canvasSize[1], self)   # Set main Scene
         self.setScene(self.mainScene)
         self.mainScene.addItem(self.selectionHighlight)
-        self.mainScene.addItem(self.selectedItemGroup)
 
 
     def TabSelected(self, tabData):
@@ -101,6 +134,7 @@ class MainCanvas(QGraphicsView):
         self.verticalScrollBar().setValue(tabData["viewportPos"][1])
 
         self.canvasItemData = tabData["canvasItems"]
+        self.pendingFocusItem = None
 
         self.RemoveAllSelected()
 
@@ -109,12 +143,72 @@ class MainCanvas(QGraphicsView):
                 self.mainScene.removeItem(item)
 
         self.canvasItems.clear()    # Remove all items on canvas
+        self.filteredItems.clear()
+        self.placementGrid.Clear()
+        self.placementChangedItems.clear()
+        self.renderCachePolicy.Clear()
+        self.animationManager.Clear()   # Animations of the previous tab stop playing
+        self.StoreZoomAmt()
+
+        # Check the tab's files in parallel on a background thread, then create the CanvasItems. Files checked recently are cached.
+        self.tabLoadRequestID += 1
+        filePaths = self.GetFilePaths(self.canvasItemData)
+        if len(GetUncachedFiles(filePaths)) == 0:
+            self.missingFiles = set(filePath for filePath in filePaths if not FileExists(filePath))
+            self.LoadTabItems()
+        else:
+            self.isLoadingTab = True
+            RunInBackground(StatFilesRequest, self.tabLoadRequestID, filePaths, onFinished = self.TabFilesChecked)
+
+    def GetFilePaths(self, canvasItemData):
+        """Get the paths of the files referenced by the canvas items' nodes
 
+        Args:
+            canvasItemData (dict[]): CanvasItem data
+
+        Returns:
+            str[]: imagePath and filePath of the nodes
+        """
+        filePaths = []
+        for itemData in canvasItemData:
+            nodeData = self.nodeHashTable.get(itemData["nodeID"])
+            if nodeData == None:
+                continue
+            if "imagePath" in nodeData:
+                filePaths.append(nodeData["imagePath"])
+            elif "filePath" in nodeData:
+                filePaths.append(nodeData["filePath"])
+        return filePaths
+
+    def TabFilesChecked(self, result):
+        """Called when the files of the selected tab have been checked. Records missing files, and creates the tab's CanvasItems"""
+        requestID, fileStats = result
+        if requestID != self.tabLoadRequestID:  # Another tab was selected
+            return
+        self.missingFiles = set(filePath for filePath, fileStat in fileStats.items() if fileStat == None)
+        self.LoadTabItems()
+
+    def LoadTabItems(self):
+        """Create the CanvasItems of the selected tab. Items whose file is missing are not created, but their data is kept.
+        Items added while the tab's files were checked (i.e. dropped or pasted) already exist, so they are not created again."""
+        self.isLoadingTab = False
+        self.assetWatcher.WatchFiles(self.GetFilePaths(self.canvasItemData))
+        createdItemIDs = set(canvasItem.canvasItemData["canvasItemID"] for canvasItem in self.canvasItems)
         for canvasItemData in self.canvasItemData:          # Add all canvas items from canvasItems to the canvas. 
+            if canvasItemData["canvasItemID"] in createdItemIDs:
+                continue
+            nodeData = self.nodeHashTable.get(canvasItemData["nodeID"], {})
+            filePath = nodeData.get("imagePath", nodeData.get("filePath"))
+            if filePath in self.missingFiles:
+                ConsoleLog.warning("Missing File", "CanvasItem [" + str(canvasItemData["canvasItemID"]) + "] was not added, [" + str(filePath) + "] does not exist.")
+                continue
             self.InsertCanvasItem(canvasItemData)
 
         self.SetCanvasItemCount()   # This is needed if no CanvasItems are present, otherwise it will not show the message
-        self.StoreZoomAmt()
+        if self.pendingFocusItem != None:
+            self.FocusCanvasItem(self.pendingFocusItem)
+            self.pendingFocusItem = None
+        self.TabLoaded.emit()
 
         
     # ----- ADD, REMOVE, and Copy CanvasItems -----
@@ -145,6 +239,10 @@ class MainCanvas(QGraphicsView):
             ConsoleLog.error("Invalid Item Type", "[" + str(nodeData["nodeType"]) + "] is not a valid node type.")
             return None
 
+        if not newCanvasItem.isValid:   # The item's file could not be loaded. It was never added to the scene, so it is only deleted
+            newCanvasItem.deleteLater()
+            return None
+
         self.SetReference(canvasItemData["nodeID"], canvasItemData["canvasItemID"])  # Update Reference
 
         return self.AddCanvasItemToScene(newCanvasItem)
@@ -161,6 +259,12 @@ class MainCanvas(QGraphicsView):
 
         self.mainScene.addItem(canvasItem)
         self.canvasItems.append(canvasItem)
+        self.placementChangedItems.add(canvasItem)  # Added to the placement grid when it is next used, as loading may still change its rect
+        self.renderCachePolicy.ApplyCacheMode(canvasItem)
+        for filePath in self.GetFilePaths([canvasItem.canvasItemData]):
+            self.assetWatcher.AddFile(filePath)
+        if self.canvasFilter != None and self.MainContent.metadataIndex != None and not self.MainContent.metadataIndex.Matches(self.canvasFilter, canvasItem.nodeID):
+            self.SetItemFiltered(canvasItem, True)
 
         self.SetCanvasItemCount()
         self.SetZValues()
@@ -175,7 +279,12 @@ class MainCanvas(QGraphicsView):
         """
 
         self.canvasItems.remove(canvasItem)
+        self.filteredItems.discard(canvasItem)
+        self.placementGrid.Remove(canvasItem)
+        self.placementChangedItems.discard(canvasItem)
         self.RemoveSelected(canvasItem)
+        self.renderCachePolicy.RemoveItem(canvasItem)
+        self.animationManager.RemoveItem(canvasItem)
 
         self.tabData["canvasItems"].pop(self.tabData["canvasItems"].index(canvasItem.canvasItemData))   # Remove data from canvasItem Database
 
@@ -186,6 +295,7 @@ class MainCanvas(QGraphicsView):
 
         canvasItem.deleteLater()
         self.SetCanvasItemCount()
+        self.SetModified()
 
     def DuplicateCanvasItem(self, nodeID:int, newPos:QPointF = None, scale:int = 1):
         """This function will duplicate a given CanvasItem data at the desired location. 
@@ -200,6 +310,7 @@ class MainCanvas(QGraphicsView):
         """
         newData = CreateCIData(nodeID, newPos, scale)
         self.canvasItemData.append(newData)
+        self.SetModified()
         canvasItem = self.InsertCanvasItem(newData)
         
         return canvasItem
@@ -222,7 +333,7 @@ class MainCanvas(QGraphicsView):
         self.SetAllData(canvasItemData, imageNodeData)   # Set data to databases
         canvasItem = self.InsertCanvasItem(canvasItemData)   # Insert text node
 
-        if centerOnPos:
+        if centerOnPos and canvasItem != None:
             widthDiv2 = canvasItem.sceneBoundingRect().width()/2
             heightDiv2 = canvasItem.sceneBoundingRect().height()/2
             newLocation = QPointF(position.x() - widthDiv2, position.y() - heightDiv2)
@@ -230,6 +341,58 @@ class MainCanvas(QGraphicsView):
 
         return canvasItem
 
+    def ImportImages(self, filePaths, position: QPointF):
+        """Import images and folders of images on a background thread. The images are packed into rows centered on position once they are read.
+
+        Args:
+            filePaths (str[]): paths to images and folders
+            position (QPointF): center of the imported images
+        """
+        importTask = BulkImportTask(filePaths, self)
+        importTask.Imported.connect(lambda imported: self.PlaceImportedImages(imported, position))
+        importTask.Start()
+
+    def PlaceImportedImages(self, imported, position: QPointF):
+        """Create ImageCanvasItems for imported images. Images are scaled to fit defaultImageSize (settings.py), and packed into rows.
+
+        Args:
+            imported (list): (imagePath, metadata, thumbnail) for each image (See Utility/BulkImport.py)
+            position (QPointF): center of the imported images
+        """
+        if self.tabData == None or len(imported) == 0:
+            return
+
+        scales = []
+        sizes = []
+        for imagePath, metadata, thumbnail in imported:
+            imageSize = QSizeF(metadata["imageWidth"], metadata["imageHeight"])
+            scale = min(1, defaultImageSize.width() / imageSize.width(), defaultImageSize.height() / imageSize.height())
+            scales.append(scale)
+            sizes.append(imageSize * scale)
+
+        positions, layoutSize = PackShelves(sizes, bulkImportSpacing)
+        layoutRect = QRectF(position - QPointF(layoutSize.width() / 2, layoutSize.height() / 2), layoutSize)
+        topLeft = self.GetPlacementGrid().FindFreePosition(layoutRect)   # Place the images where they do not overlap other CanvasItems
+
+        importedCount = 0
+        for (imagePath, metadata, thumbnail), scale, itemPos in zip(imported, scales, positions):
+            try:    # The file may have been moved or deleted since it was read. The rest of the images are still imported
+                imageNodeData = CreateImageData(imagePath, metadata = metadata)
+            except Exception as error:
+                ConsoleLog.error("Unable to import image", str(imagePath) + ": " + str(error))
+                continue
+
+            if thumbnail != None:   # The thumbnail is drawn until the image is decoded
+                AddThumbnail(imagePath, metadata["fileModified"], thumbnail)
+            canvasItemData = CreateCIData(imageNodeData["nodeID"], topLeft + itemPos, scale)
+            imageNodeData["canvasItemReferences"].append(canvasItemData["canvasItemID"])
+
+            self.SetAllData(canvasItemData, imageNodeData)
+            if self.InsertCanvasItem(canvasItemData) != None:
+                importedCount += 1
+
+        ConsoleLog.log("Imported Images", str(importedCount) + " of " + str(len(imported)) + " images were imported.")
+
     #   New Text CanvasItem
     def NewTextCanvasItem(self, text: str, position: QPointF, scale = 1, nodeName = "Text_Node", centerOnPos = False):
         """ Create a new Text Canvas Item
@@ -274,7 +437,7 @@ class MainCanvas(QGraphicsView):
         self.SetAllData(canvasItemData, fileNodeData)   # Set data to databases
         canvasItem = self.InsertCanvasItem(canvasItemData)   # Insert text node
 
-        if centerOnPos:
+        if centerOnPos and canvasItem != None:
             widthDiv2 = canvasItem.sceneBoundingRect().width()/2
             heightDiv2 = canvasItem.sceneBoundingRect().height()/2
             newLocation = QPointF(position.x() - widthDiv2, position.y() - heightDiv2)
@@ -287,18 +450,20 @@ class MainCanvas(QGraphicsView):
     # ----- Copy and Paste -----
     def CopySelection(self):
         self.copyCanvasItemData = []
-        for item in self.selectedItemGroup.childItems(): 
-            offsetPos = item.scenePos() - self.selectedItemGroup.sceneBoundingRect().topLeft()
+        containerSceneRect = self.selectedItemGroup.sceneBoundingRect()
+        for item in self.GetSelected(): 
+            offsetPos = item.scenePos() - containerSceneRect.topLeft()
 
             nodeID = item.nodeID
             scale = item.GetScale()
             self.copyCanvasItemData.append({"offsetPos":offsetPos,
-                                            "containerSceneRect": self.selectedItemGroup.sceneBoundingRect(),
+                                            "containerSceneRect": containerSceneRect,
                                             "nodeID": nodeID,
                                             "scale": scale})
 
     def PasteSelection(self, clickPos:QPointF):
         self.RemoveAllSelected()
+        newNodes = []
         for item in self.copyCanvasItemData:
             # Center the paste location.
             widthDiv2 = item["containerSceneRect"].width()/2
@@ -309,12 +474,131 @@ class MainCanvas(QGraphicsView):
             # If not text node, duplicate node, else create new node of type text. This needs to be done so editing text does not overwrite previous text.
             if self.nodeHashTable[item["nodeID"]]["nodeType"] != "Text_Node":   
                 newNode =  self.DuplicateCanvasItem(item["nodeID"], newLocation, item["scale"])
-                self.AddSelected(newNode)
             else:
                 nodeName = self.nodeHashTable[item["nodeID"]]["nodeName"]
                 nodeText = self.nodeHashTable[item["nodeID"]]["nodeText"]
                 newNode = self.NewTextCanvasItem(nodeText, newLocation, item["scale"], nodeName = nodeName)   
-                self.AddSelected(newNode)
+            if newNode != None:
+                newNodes.append(newNode)
+
+        self.PlaceCanvasItems(newNodes, asGroup = True)    # Move the pasted items, keeping their layout, so they do not overlap other items
+        for newNode in newNodes:
+            self.AddSelected(newNode)
+
+    # ----- Placement -----
+    def GetPlacementGrid(self, excludeItems = ()):
+        """Get the PlacementGrid of the space occupied by the CanvasItems on the canvas. Only the CanvasItems that changed since it was last used are updated.
+
+        Args:
+            excludeItems (CanvasItem[], optional): CanvasItems that are removed from the grid (i.e. the items being placed). They are added again when the grid is next used.
+
+        Returns:
+            PlacementGrid: grid containing the scene bounding rect of every CanvasItem
+        """
+        for canvasItem in self.placementChangedItems:
+            self.placementGrid.Insert(canvasItem, canvasItem.sceneBoundingRect())
+        self.placementChangedItems.clear()
+
+        for canvasItem in excludeItems:
+            self.placementGrid.Remove(canvasItem)
+            self.placementChangedItems.add(canvasItem)
+        return self.placementGrid
+
+    def PlacementItemChanged(self, canvasItem):
+        """Called when a CanvasItem is moved, scaled or resized. Its rect in the placement grid is updated when the grid is next used."""
+        if canvasItem in self.placementGrid:
+            self.placementChangedItems.add(canvasItem)
+
+    def PlaceCanvasItems(self, canvasItems, asGroup = False):
+        """Move CanvasItems to the nearest space where they do not overlap other CanvasItems. Used when CanvasItems are added.
+
+        Args:
+            canvasItems (CanvasItem[]): CanvasItems to move. None is ignored (i.e. a CanvasItem that could not be created)
+            asGroup (bool, optional): If True, the CanvasItems are moved together, keeping their layout. Otherwise each CanvasItem is placed separately. Defaults to False.
+        """
+        canvasItems = [canvasItem for canvasItem in canvasItems if canvasItem != None]
+        if len(canvasItems) == 0:
+            return
+        grid = self.GetPlacementGrid(canvasItems)
+
+        if asGroup:
+            groupRect = QRectF()
+            for canvasItem in canvasItems:
+                groupRect = groupRect.united(canvasItem.sceneBoundingRect())
+            offset = grid.FindFreePosition(groupRect) - groupRect.topLeft()
+            for canvasItem in canvasItems:
+                self.MoveCanvasItem(canvasItem, offset)
+        else:
+            for canvasItem in canvasItems:
+                itemRect = canvasItem.sceneBoundingRect()
+                offset = grid.FindFreePosition(itemRect) - itemRect.topLeft()
+                self.MoveCanvasItem(canvasItem, offset)
+                grid.Insert(canvasItem, itemRect.translated(offset))    # Following items are not placed over this item
+
+    def MoveCanvasItem(self, canvasItem, offset: QPointF):
+        """Move a CanvasItem by offset, and store its new position"""
+        canvasItem.setPos(canvasItem.pos() + offset)
+        canvasItem.SetDirty()
+        canvasItem.SaveChanges()
+
+    # ----- Arrange -----
+    def ArrangeSelection(self, arrangement: str):
+        """Align, distribute, or arrange the selected CanvasItems. The new rects of all items are calculated first, then applied in a single pass.
+
+        Args:
+            arrangement (str): an alignment (See Arrange.alignments), "horizontal" or "vertical" to distribute, or "grid", "masonry", or "pack" to arrange.
+                               Arranged items are placed in reading order, starting at the top left of the selection.
+        """
+        canvasItems = self.GetSelected()
+        if len(canvasItems) < 2:
+            return
+        rects = [canvasItem.sceneBoundingRect() for canvasItem in canvasItems]
+        scales = None
+
+        if arrangement in alignments:
+            positions = AlignRects(rects, arrangement)
+        elif arrangement in distributions:
+            positions = DistributeRects(rects, arrangement)
+        else:
+            topLeft = GetBounds(rects).topLeft()
+            order = sorted(range(len(rects)), key=lambda i: (rects[i].top(), rects[i].left()))
+            canvasItems = [canvasItems[i] for i in order]
+            rects = [rects[i] for i in order]
+            sizes = [rect.size() for rect in rects]
+
+            if arrangement == "grid":
+                positions, layoutSize = GridLayout(sizes, arrangeSpacing)
+            elif arrangement == "masonry":
+                positions, scales, layoutSize = MasonryLayout(sizes, arrangeSpacing)
+            elif arrangement == "pack":
+                positions, layoutSize = PackShelves(sizes, arrangeSpacing)
+            else:
+                ConsoleLog.error("Arrange", "Unknown arrangement: " + str(arrangement))
+                return
+            positions = [topLeft + position for position in positions]
+
+        self.SetCanvasItemRects(canvasItems, rects, positions, scales)
+
+    def SetCanvasItemRects(self, canvasItems, rects, positions, scales = None):
+        """Move and scale many CanvasItems, and store their new positions and scales.
+
+        Args:
+            canvasItems (CanvasItem[]): CanvasItems to move
+            rects (QRectF[]): current scene bounding rect of each CanvasItem
+            positions (QPointF[]): new top left of each CanvasItem's scene bounding rect
+            scales (float[], optional): scale to multiply each CanvasItem's scale by. Defaults to not scaling.
+        """
+        for i, canvasItem in enumerate(canvasItems):
+            originOffset = rects[i].topLeft() - canvasItem.pos()    # The item's origin is not always the top left of its bounding rect
+            if scales != None and scales[i] != 1:
+                canvasItem.setScale(canvasItem.scale() * scales[i])
+                originOffset = originOffset * scales[i]
+            canvasItem.setPos(positions[i] - originOffset)
+            canvasItem.SetDirty()
+            canvasItem.SaveChanges()
+
+        self.selectedItemGroup.UpdateBoundingRect()
+        self.SetSelectionHighlightPos()
 
 
     # ________________________________________
@@ -339,6 +623,7 @@ class MainCanvas(QGraphicsView):
             nodeData (dict): data that will be added to database
         """
         self.canvasItemData.append(canvasItemData)
+        self.SetModified()
 
     def SetNodeDatabase(self, nodeData):
         """ Add Node Data to database
@@ -348,12 +633,51 @@ class MainCanvas(QGraphicsView):
             nodeData (dict): data that will be added to database
         """
         self.nodeHashTable[nodeData["nodeID"]] = nodeData
+        self.NodeChanged(nodeData["nodeID"])
+
+    def ImageNodesChanged(self, nodeIDs):
+        """Reload the ImageCanvasItems of image nodes whose file changed
+
+        Args:
+            nodeIDs (str[]): IDs of the changed image nodes
+        """
+        nodeIDs = set(nodeIDs)
+        for nodeID in nodeIDs:  # Animated images are decoded again
+            self.animationManager.ReleaseNode(nodeID)
+        for canvasItem in self.canvasItems:
+            if canvasItem.nodeType == "Image_Node" and canvasItem.nodeID in nodeIDs:
+                if not canvasItem.LoadImage():
+                    ConsoleLog.warning("Unable to reload image", "imagePath: " + str(canvasItem.imagePath))
+                self.renderCachePolicy.ItemChanged(canvasItem)
+                if canvasItem.GetIsSelected():  # The image size may have changed
+                    self.selectedItemGroup.UpdateBoundingRect()
+                    self.SetSelectionHighlightPos()
+
+    def AssetsChanged(self, filePaths):
+        """Called by the AssetWatcher when files used by the selected tab change on disk. Only the CanvasItems of the changed files are reloaded.
+
+        Args:
+            filePaths (str[]): paths of the changed files
+        """
+        filePaths = set(filePaths)
+        changedImageNodes = []
+        for canvasItem in self.canvasItems:
+            if canvasItem.nodeType == "Image_Node" and canvasItem.imagePath in filePaths:
+                if canvasItem.nodeID not in changedImageNodes:
+                    canvasItem.nodeData.update(GetImageMetadata(canvasItem.imagePath))
+                    changedImageNodes.append(canvasItem.nodeID)
+            elif canvasItem.nodeType == "File_Node" and canvasItem.filePath in filePaths:
+                canvasItem.update()
+
+        ConsoleLog.log("Files Changed", str(list(filePaths)))
+        if len(changedImageNodes) > 0:
+            self.ImageNodesChanged(changedImageNodes)
 
     def SetZValues(self):
         """Sets the z-index for every CanvasItem in the self.canvasItems list
         """
-        for node in self.canvasItems:
-            node.setZValue(self.canvasItems.index(node))
+        for index, node in enumerate(self.canvasItems):
+            node.setZValue(index + self.selectedItemGroup.GetZOffset(node))     # Selected items stay above the other items
     
     # Manage Node References
     def SetReference(self, nodeID, canvasItemID):
@@ -368,6 +692,19 @@ class MainCanvas(QGraphicsView):
 
         return len(self.nodeHashTable[nodeID]["canvasItemReferences"])
 
+    def SetModified(self):
+        """Mark the project as modified, so it is saved by the next save or autosave"""
+        self.MainContent.SetModified(True)
+
+    def NodeChanged(self, nodeID: str):
+        """Called when a node is added, or its text or tags changed. Updates the search and metadata indexes."""
+        self.MainContent.NodeChanged(nodeID)
+
+    def SaveChanges(self):
+        """Write the data of changed CanvasItems that have not been written yet (i.e. text that is being edited). Called before the project is saved."""
+        for canvasItem in self.canvasItems:
+            canvasItem.SaveChanges()
+
     def SaveJSON(self, saveLocation = None):
         self.MainContent.UpdateJSONData()
         SaveJSON(self.MainContent.JSONData, saveLocation) 
@@ -406,10 +743,14 @@ class MainCanvas(QGraphicsView):
         Args:
             canvasItem (CanvasItem): The CanvasItem that will be moved to the front.
         """
+        if self.canvasItems[-1] == canvasItem:  # Already in front
+            return
+
         self.canvasItems.append(self.canvasItems.pop(self.canvasItems.index(canvasItem)))
         self.canvasItemData.append(self.canvasItemData.pop(self.canvasItemData.index(canvasItem.canvasItemData)))
 
         self.SetZValues()
+        self.SetModified()  # The order of the CanvasItems is saved
 
     def isItemAtPos(self, pos:QPoint, checkSelectionHighlight = False):
         """Check if an item is under the mouse on the canvas.
@@ -426,8 +767,119 @@ class MainCanvas(QGraphicsView):
                 itemAtPos = True
         return itemAtPos
 
+    # ----- Filter -----
+    def SetFilter(self, query: str, hideFiltered: bool = None):
+        """Dim or hide the CanvasItems that do not match a filter query (See Utility/MetadataIndex.py). The filter stays applied when another tab is selected.
+
+        Args:
+            query (str): filter query. An empty query removes the filter.
+            hideFiltered (bool, optional): If the CanvasItems are hidden, instead of dimmed. Defaults to the current setting.
+        """
+        if hideFiltered != None and hideFiltered != self.hideFiltered:   # Show the filtered items, so they are dimmed or hidden again
+            for canvasItem in list(self.filteredItems):
+                self.SetItemFiltered(canvasItem, False)
+            self.hideFiltered = hideFiltered
+
+        canvasFilter = MetadataFilter(query)
+        self.canvasFilter = canvasFilter if not canvasFilter.isEmpty() else None
+        self.ApplyFilter()
+
+    def GetFilterQuery(self):
+        return self.canvasFilter.query if self.canvasFilter != None else ""
+
+    def ApplyFilter(self):
+        """Apply the filter to the CanvasItems of the selected tab. Only the CanvasItems whose filtered state changed are updated."""
+        filteredItems = set()
+        if self.canvasFilter != None:
+            metadataIndex = self.MainContent.metadataIndex
+            if metadataIndex == None:   # The index is being built. The filter is applied once it finishes
+                return
+            matches = metadataIndex.Filter(self.canvasFilter, {canvasItem.nodeID for canvasItem in self.canvasItems})
+            filteredItems = {canvasItem for canvasItem in self.canvasItems if canvasItem.nodeID not in matches}
+
+        for canvasItem in self.filteredItems - filteredItems:
+            self.SetItemFiltered(canvasItem, False)
+        for canvasItem in filteredItems - self.filteredItems:
+            self.SetItemFiltered(canvasItem, True)
+
+        if self.hideFiltered:   # Hidden items can not stay selected
+            self.UpdateSelection(removed = [canvasItem for canvasItem in self.selectedItems if canvasItem in filteredItems])
+
+    def SetItemFiltered(self, canvasItem, isFiltered: bool):
+        """Dim or hide a CanvasItem that does not match the filter"""
+        if isFiltered:
+            self.filteredItems.add(canvasItem)
+        else:
+            self.filteredItems.discard(canvasItem)
+        if self.hideFiltered:
+            canvasItem.setVisible(not isFiltered)
+        else:
+            canvasItem.setOpacity(filterDimOpacity if isFiltered else 1)
+
+    # ----- Tags -----
+    def GetSharedTags(self, canvasItems):
+        """Get the tags that every CanvasItem's node has, in the order of the first CanvasItem's tags"""
+        if len(canvasItems) == 0:
+            return []
+        sharedTags = set.intersection(*(set(GetNodeTags(canvasItem.nodeData)) for canvasItem in canvasItems))
+        return [tag for tag in GetNodeTags(canvasItems[0].nodeData) if tag in sharedTags]
+
+    def SetSharedTags(self, canvasItems, tags):
+        """Edit the tags shared by the CanvasItems' nodes (See GetSharedTags). Tags that only some of the nodes have are kept.
+
+        Args:
+            canvasItems (CanvasItem[]): CanvasItems whose nodes are edited
+            tags (str[]): new shared tags
+        """
+        oldTags = set(self.GetSharedTags(canvasItems))
+        newTags = list(dict.fromkeys(tag.strip().lower() for tag in tags if tag.strip() != ""))
+        removedTags = oldTags - set(newTags)
+
+        nodes = {canvasItem.nodeID: canvasItem.nodeData for canvasItem in canvasItems}
+        for nodeID, nodeData in nodes.items():
+            nodeTags = [tag for tag in GetNodeTags(nodeData) if tag not in removedTags]
+            SetNodeTags(nodeData, nodeTags + [tag for tag in newTags if tag not in nodeTags])
+            self.NodeChanged(nodeID)
+
+        self.SetModified()
+        self.ApplyFilter()  # The tags may change which CanvasItems match the filter
+
+    def FocusCanvasItem(self, canvasItemData):
+        """Center the view on a CanvasItem of the selected tab, and select it. If the tab is still loading, the CanvasItem is shown once it is loaded.
+
+        Args:
+            canvasItemData (dict): data of the CanvasItem
+        """
+        if self.isLoadingTab:
+            self.pendingFocusItem = canvasItemData
+            return
+
+        for canvasItem in self.canvasItems:
+            if canvasItem.canvasItemData["canvasItemID"] == canvasItemData["canvasItemID"]:
+                self.centerOn(canvasItem)
+                self.SetSelected(canvasItem)
+                return
+
+        self.centerOn(QPointF(canvasItemData["itemPos"][0], canvasItemData["itemPos"][1]))  # The CanvasItem was not created (i.e. its file is missing)
+
     def SetSelectionHighlightPos(self):
-        self.selectionHighlight.SelectionChanged(self.selectedItemGroup.childItems())
+        self.selectionHighlight.SelectionChanged(self.GetSelected())
+
+    # ----- Snapping -----
+    def CreateSnapIndex(self):
+        """Create the SnapIndex of the visible CanvasItems that are not selected. Called once when a drag starts, so each frame of the drag only searches the index."""
+        rects = []
+        for item in self.mainScene.items(self.GetVisibleScreenRect()):
+            if issubclass(type(item), CanvasItem) and item.isVisible() and item not in self.selectedItems:
+                rects.append(item.sceneBoundingRect())
+        return SnapIndex(rects)
+
+    def SetSnapGuides(self, guides):
+        """Set the guide lines drawn in the foreground. An empty list removes the guides."""
+        if len(guides) == 0 and len(self.snapGuides) == 0:
+            return
+        self.snapGuides = guides
+        self.viewport().update()    # The guides can be outside the regions of the moved items
     
     def GetVisibleScreenRect(self):
         """ Returns a QRectF of the visible area in the scene
@@ -439,11 +891,43 @@ class MainCanvas(QGraphicsView):
         return visible_scene_rect
     # ---------------
 
+    # ----- Render Quality -----
+    def BeginInteraction(self):
+        """Switch to fast, low quality rendering while the canvas is panned, zoomed, or items are dragged.
+        Full quality rendering is restored after interactionIdleTime (settings.py) without interaction.
+        """
+        if not self.isInteracting:
+            self.isInteracting = True
+            self.setRenderHint(QPainter.Antialiasing, False)
+        self.interactionTimer.start()
+
+    def EndInteraction(self):
+        """Restore full quality rendering, and repaint the canvas"""
+        self.isInteracting = False
+        self.setRenderHint(QPainter.Antialiasing, True)
+        self.renderCachePolicy.InvalidateVisible()
+        self.viewport().update()
+
+    def SetRenderQuality(self, painter: QPainter, smoothImages = False):
+        """Set the render hints of the painter. If the canvas is being interacted with, fast rendering is used.
+
+        Args:
+            painter (QPainter): painter that the render hints will be set on
+            smoothImages (bool, optional): Set SmoothPixmapTransform and LosslessImageRendering. Defaults to False.
+        """
+        highQuality = not self.isInteracting
+        painter.setRenderHint(QPainter.Antialiasing, highQuality)
+        if smoothImages:
+            painter.setRenderHint(QPainter.SmoothPixmapTransform, highQuality)
+            painter.setRenderHint(QPainter.LosslessImageRendering, highQuality)
+    # ---------------
+
     # ----- Zoom -----
     def StoreZoomAmt(self):
         zoomAmt = self.GetZoomScale()
         self.tabData["viewportZoom"] = zoomAmt
         self.MainContent.zoomChanged(zoomAmt)
+        self.renderCachePolicy.ZoomChanged(zoomAmt)
 
     def SetZoomScale(self, m11ZoomScale):
         if m11ZoomScale > minMaxZoom[1]:    # Limit zoom scaling to minMaxZoom
@@ -459,6 +943,7 @@ class MainCanvas(QGraphicsView):
 
     def AddSubtractZoom(self, zoom: float):
         """Add/Subtract from zoom in scene."""
+        self.BeginInteraction()
         
         anchor = self.transformationAnchor()    # anchor allows for zoom in on mouse scene position
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
@@ -496,29 +981,48 @@ class MainCanvas(QGraphicsView):
         self.AddSelected(canvasItem)
 
     def SetSelectedItems(self, canvasItems):
-        """Set multiple canvasItems passed as selected. Removes previous selection
+        """Set multiple canvasItems passed as selected. Removes previous selection.
+        Only the difference to the current selection is applied.
         
         Arg:
             canvasItems: Items to be set as selected
         """
-        self.RemoveAllSelected()
-        for item in canvasItems:
-            self.AddSelected(item)
+        canvasItems = dict.fromkeys(canvasItems)
+        self.UpdateSelection(added = [item for item in canvasItems if item not in self.selectedItems],
+                             removed = [item for item in self.selectedItems if item not in canvasItems])
+
+    def UpdateSelection(self, added = (), removed = ()):
+        """Apply a change to the selection in one pass. The selection highlight is updated once, instead of once per item.
+
+        Args:
+            added (CanvasItem[], optional): Items to add to the selection. Items that are already selected are ignored.
+            removed (CanvasItem[], optional): Items to remove from the selection. Items that are not selected are ignored.
+        """
+        removed = [item for item in removed if item in self.selectedItems]
+        added = [item for item in dict.fromkeys(added) if item not in self.selectedItems]
+        if len(removed) == 0 and len(added) == 0:
+            return
+
+        self.selectedItemGroup.RemoveItems(removed)
+        for canvasItem in removed:
+            canvasItem.SetSelected(False)
+
+        if len(self.selectedItems) == 0 and len(added) == 1:    # If it is the only selected item, bring to front.
+            self.CanvasItemToFront(added[0])
+
+        self.selectedItemGroup.AddItems(added)
+        for canvasItem in added:
+            canvasItem.SetSelected(True)
+
+        self.SetSelectionHighlightPos()
 
     def AddSelected(self, canvasItem):
         """Add node to selection. Does not remove previous selection
         
         Arg:
-            canvasItem: Item to be removed from the selection item group
+            canvasItem: Item to be added to the selection item group
         """
-        if self.selectedItemGroup.childItems() == []:  # If it is the only selected item, bring to front.
-            self.CanvasItemToFront(canvasItem)
-
-        if canvasItem not in self.selectedItemGroup.childItems():  # Make sure item not already selected
-            self.selectedItemGroup.addToGroup(canvasItem)
-
-        canvasItem.SetSelected(True)
-        self.SetSelectionHighlightPos()
+        self.UpdateSelection(added = [canvasItem])
 
     def RemoveSelected(self, canvasItem):
         """Removes the selected canvasItem passed
@@ -526,38 +1030,47 @@ class MainCanvas(QGraphicsView):
         Arg:
             canvasItem: Item to be removed from the selection item group
         """
-        if canvasItem in self.selectedItemGroup.childItems():  
-            self.selectedItemGroup.removeFromGroup(canvasItem)      
-
-        canvasItem.SetSelected(False)
-        self.SetSelectionHighlightPos()
+        self.UpdateSelection(removed = [canvasItem])
         
     def RemoveAllSelected(self):
         """Removes all selected canvasItems from selectedItemGroup"""
-        for item in self.selectedItemGroup.childItems():
-            self.RemoveSelected(item)
-            # item.SetSelected(False)
-
-        self.selectedItemGroup.resetTransform()
+        self.UpdateSelection(removed = list(self.selectedItems))
 
     def GetSelected(self):
         """Get all selected nodes"""
-        return self.selectedItemGroup.childItems()
+        return list(self.selectedItems)
 
 
     #_________ Events _________
+    def paintEvent(self, event) -> None:
+        self.renderContext.Update(self)     # Calculate the visible rect and zoom once per frame, instead of once per CanvasItem
+        return super().paintEvent(event)
+
+    def drawForeground(self, painter, rect) -> None:
+        """Draw the snap guides above the CanvasItems"""
+        if len(self.snapGuides) > 0:
+            painter.save()
+            painter.setPen(QPen(QColor(defaultAccentColor), 0))     # A width of 0 is always 1 pixel wide, at any zoom
+            painter.drawLines(self.snapGuides)
+            painter.restore()
+        return super().drawForeground(painter, rect)
+
     def mousePressEvent(self, event):   
+        if self.mainScene == None:  # Project has not been loaded yet
+            return
+
         if event.button() == Qt.MouseButton.MiddleButton:
             self.prevMousePos = event.pos()
             self.setCursor(Qt.CursorShape.ClosedHandCursor)
             return
         elif event.button() == Qt.MouseButton.RightButton:
+            from UI_Components.ContextMenu.contextMenu import CanvasItemContextMenu    # Imported on first use, to reduce startup time
             CanvasItemContextMenu(self, event)
             return
 
         elif event.button() == Qt.MouseButton.LeftButton:
             self.prevMousePos = event.pos()
-            self.prevSelectedItems = []
+            self.prevSelectedItems = set()
             if not self.isItemAtPos(event.pos(), True):   # If item is at position, show rubber band
                 self.rubberBand.setGeometry(QRect(event.pos(), QSize()))
                 self.rubberBand.show()
@@ -571,10 +1084,9 @@ class MainCanvas(QGraphicsView):
                 if self.rubberBand.isVisible(): # Rubber Band Selector: If no item was clicked and rubber band is visible.
                     rubberBandRect = QRect(self.prevMousePos, event.pos()).normalized()
                     self.rubberBand.setGeometry(rubberBandRect)
-                    selectedItems = self.items(rubberBandRect)
-                    selectedItems = self.GetCanvasItemsFromList(selectedItems)
+                    selectedItems = set(self.GetCanvasItemsFromList(self.items(rubberBandRect)))
 
-                    if self.prevSelectedItems != selectedItems:
+                    if self.prevSelectedItems != selectedItems:     # Only the items that entered or left the rubber band are changed
                         self.prevSelectedItems = selectedItems
                         self.SetSelectedItems(selectedItems)
                     # pass
@@ -582,6 +1094,7 @@ class MainCanvas(QGraphicsView):
                 else:
                     return super().mouseMoveEvent(event)
             elif event.buttons() == Qt.MiddleButton:
+                self.BeginInteraction()
                 offset = self.prevMousePos - event.pos()
                 self.prevMousePos = event.pos()
 
@@ -593,6 +1106,9 @@ class MainCanvas(QGraphicsView):
                 return super().mouseMoveEvent(event)
 
     def mouseReleaseEvent(self, event) -> None:
+        if self.tabData == None:    # Project has not been loaded yet
+            return super().mouseReleaseEvent(event)
+
         self.tabData["viewportPos"] = [self.horizontalScrollBar().value(), self.verticalScrollBar().value()]
         self.rubberBand.hide()
 
@@ -654,6 +1170,7 @@ class MainScene (QGraphicsScene):
         # Properties
         self.mainView:QGraphicsView = parent
         self.draggingItem = False
+        self.snapIndex = None   # Edges of the visible CanvasItems, created when a drag starts
         
 
     # ------ Utility ------  
@@ -663,9 +1180,9 @@ class MainScene (QGraphicsScene):
         Returns:
             Returns the only selected TextCanvasItem
         """
-        topWidget = self.mainView.selectedItemGroup.childItems()[0]
-        if len(self.mainView.selectedItemGroup.childItems()) == 1:
-            return topWidget
+        selected = self.mainView.GetSelected()
+        if len(selected) == 1:
+            return selected[0]
         return None
 
     def GetTopWidgetAtPos(self, scenePos:QPointF):
@@ -694,9 +1211,8 @@ class MainScene (QGraphicsScene):
         self.topWidgetUnderMouse = self.GetTopWidgetAtPos(event.scenePos()) 
 
         # Set initial data for checking delta changes
-        self.mainView.selectedItemGroup.SetInitialPos()
-        self.mainView.selectedItemGroup.SetInitialSceneBoundingRect()
-        self.mainView.selectedItemGroup.SetInitialSceneRectALL()
+        self.mainView.selectedItemGroup.SetInitialState()
+        self.snapIndex = None
 
         #* No Item under mouse, but SelectionHighlight corner IS under mouse
         if self.mainView.selectionHighlight.isHandleUnderMouse(event.scenePos()):
@@ -719,7 +1235,7 @@ class MainScene (QGraphicsScene):
                 self.mainView.SetSelected(self.topWidgetUnderMouse)
 
         # If any items are not set to canDrag, don't allow the user to drag the items
-        for item in self.mainView.selectedItemGroup.childItems():
+        for item in self.mainView.GetSelected():
             if not item.canDrag:
                 self.canDrag = False
 
@@ -729,14 +1245,40 @@ class MainScene (QGraphicsScene):
 
     def mouseMoveEvent(self, event) -> None:
         """When the mouse moves, if item under mouse and is selected, drag item"""
-        if event.buttons() == Qt.MouseButton.LeftButton and len(self.mainView.selectedItemGroup.childItems()) > 0 and self.topWidgetUnderMouse != None and self.canDrag:
+        if event.buttons() == Qt.MouseButton.LeftButton and len(self.mainView.selectedItems) > 0 and self.topWidgetUnderMouse != None and self.canDrag:
             if type(self.prevTextItem) != TextCanvasItem or type(self.prevTextItem) == TextCanvasItem and not self.prevTextItem.isEditable():
                 delta = event.scenePos() - self.prevPos
-                self.mainView.selectedItemGroup.MoveGroup(delta)
+                self.mainView.BeginInteraction()
+                self.mainView.selectedItemGroup.MoveGroup(self.SnapDelta(delta, event.modifiers()))
         return super().mouseMoveEvent(event)
 
+    def SnapDelta(self, delta: QPointF, modifiers):
+        """Snap the dragged selection to the edges and centers of the visible CanvasItems. Holding Alt disables snapping.
+
+        Args:
+            delta (QPointF): distance the mouse moved since the drag started
+            modifiers (Qt.KeyboardModifiers): keys held during the drag
+
+        Returns:
+            QPointF: delta, with the offset that snaps the selection added
+        """
+        if snapDistance <= 0 or modifiers & Qt.KeyboardModifier.AltModifier:
+            self.mainView.SetSnapGuides([])
+            return delta
+
+        if self.snapIndex == None:
+            self.snapIndex = self.mainView.CreateSnapIndex()
+        if self.snapIndex.isEmpty():
+            return delta
+
+        groupRect = self.mainView.selectedItemGroup.initialSceneRect.translated(delta)
+        offset, guides = self.snapIndex.Snap(groupRect, snapDistance / self.mainView.GetZoomScale())
+        self.mainView.SetSnapGuides(guides)
+        return delta + offset
+
     def mouseReleaseEvent(self, event) -> None:
         self.mainView.selectedItemGroup.SetItemData()
+        self.mainView.SetSnapGuides([])
         self.mainView.selectionHighlight.SetCanDrag(False)
         return super().mouseReleaseEvent(event)
 
@@ -771,7 +1313,7 @@ class MainScene (QGraphicsScene):
 
         if event.key() == Qt.Key.Key_Delete:                    # If Delete key is pressed, delete selected items
             if type(textItem) != TextCanvasItem or type(textItem) == TextCanvasItem and not textItem.isEditable():# If there is no text item or the text item is not editable, delete. 
-                for item in self.mainView.selectedItemGroup.childItems():
+                for item in self.mainView.GetSelected():
                     self.mainView.RemoveCanvasItem(item)
         return super().keyPressEvent(event)
 
@@ -795,20 +1337,25 @@ class MainScene (QGraphicsScene):
                 urls = event.mimeData().urls()
 
                 initPosition = event.scenePos()
+                importPaths = []    # Images and folders are imported together, and packed into rows
+                fileItems = []
                 for url in urls:
                     # Get File extension to know which type of file was dropped.
                     urlType = GetFileType(url.fileName()).lower()   
                     urlTemp = url.toLocalFile()
                     
-                    if urlType in imageFileTypes: # Is URL an image file type.
-                        self.mainView.NewImageCanvasItem(url.toLocalFile(), initPosition, centerOnPos = True)
-                        initPosition += QPointF(10,10) # This offsets the dropped images by 10px x and y for each image dropped
+                    if urlType in imageFileTypes or os.path.isdir(urlTemp): # Is URL an image file type, or a folder of images.
+                        importPaths.append(urlTemp)
 
                     else: # Is URL a file type
-                        self.mainView.NewFileCanvasItem(url.toLocalFile(), initPosition, centerOnPos = True)
-                        initPosition += QPointF(10,10) # This offsets the dropped images by 10px x and y for each image dropped
+                        fileItems.append(self.mainView.NewFileCanvasItem(url.toLocalFile(), initPosition, centerOnPos = True))
                         print("Dropped File")
 
+                self.mainView.PlaceCanvasItems(fileItems)   # Each file is moved to the nearest free space
+
+                if len(importPaths) > 0:
+                    self.mainView.ImportImages(importPaths, initPosition)
+
             elif event.mimeData().hasImage():
                 print("HAS IMAGE")
                 pass
@@ -20,7 +20,7 @@ def CanvasItemContextMenu(self, event):
     """
 
     # Properties
-    selected = self.selectedItemGroup
+    selected = self.GetSelected()
     clickPos = self.mapToScene(event.pos())
 
     # Menu
@@ -32,18 +32,48 @@ def CanvasItemContextMenu(self, event):
     pasteItem = contextMenu.addAction("Paste")          # Paste
     deleteItem = contextMenu.addAction("Delete")        # Delete
 
-    if len(selected.childItems()) == 0:
+    if len(selected) == 0:
         copyItem.setDisabled(True)
         deleteItem.setDisabled(True)
     if self.copyCanvasItemData == None:
         pasteItem.setDisabled(True)
 
+    arrangeMenu = contextMenu.addMenu("Arrange")        # Align, distribute, and arrange the selected CanvasItems
+    arrangeActions = {}     # Action : arrangement (See MainCanvas.ArrangeSelection)
+    for actionName, arrangement in [("Align Left", "left"), ("Align Center", "hCenter"), ("Align Right", "right"), 
+                                    ("Align Top", "top"), ("Align Middle", "vCenter"), ("Align Bottom", "bottom"), 
+                                    (None, None), ("Distribute Horizontally", "horizontal"), ("Distribute Vertically", "vertical"), 
+                                    (None, None), ("Grid", "grid"), ("Masonry", "masonry"), ("Pack by Size", "pack")]:
+        if actionName == None:
+            arrangeMenu.addSeparator()
+        else:
+            arrangeActions[arrangeMenu.addAction(actionName)] = arrangement
+
+    if len(selected) < 2:
+        arrangeMenu.setDisabled(True)
+
+    contextMenu.addSeparator()                          # Tags and Filter
+    editTags = contextMenu.addAction("Edit Tags")           # Edit the tags of the selected CanvasItems
+    filterMenu = contextMenu.addMenu("Filter")              # Filter Menu
+    setFilter = filterMenu.addAction("Filter Items")        # Dim or hide CanvasItems that do not match a filter
+    hideFiltered = filterMenu.addAction("Hide Filtered Items")  # Hide CanvasItems instead of dimming them
+    clearFilter = filterMenu.addAction("Clear Filter")      # Remove the filter
+
+    hideFiltered.setCheckable(True)
+    hideFiltered.setChecked(self.hideFiltered)
+    if len(selected) == 0:
+        editTags.setDisabled(True)
+    if self.canvasFilter == None:
+        clearFilter.setDisabled(True)
+
     contextMenu.addSeparator()                          # Insert Canvas Items
     insertMenu = contextMenu.addMenu("Insert")              # Insert Menu
     insertImage = insertMenu.addAction("Insert Image")      # Insert Image CanvasItem
+    importFolder = insertMenu.addAction("Import Folder")    # Insert an Image CanvasItem for every image in a folder
     insertText = insertMenu.addAction("Insert Text")        # Insert Text CanvasItem
     insertFile = insertMenu.addAction("Insert File")        # Insert File CanvasItem
     contextMenu.addSeparator()                          # Project Management
+    findDuplicates = contextMenu.addAction("Find Duplicate Images")   # Find and merge images that are in the project more than once
     saveProject = contextMenu.addAction("Save Project As")     # Save Project
     loadProject = contextMenu.addAction("Load Project")     # Load Project
     newProject = contextMenu.addAction("New Project")       # New Project
@@ -57,32 +87,57 @@ def CanvasItemContextMenu(self, event):
         self.PasteSelection(clickPos)   # Paste Item
 
     elif action == deleteItem:          # Delete Item
-        for item in selected.childItems():
+        for item in selected:
             self.RemoveCanvasItem(item)
 
+    elif action in arrangeActions:      # Align, distribute, or arrange the selection
+        self.ArrangeSelection(arrangeActions[action])
+
+    # ----- Tags and Filter -----
+    elif action == editTags:            # Edit the tags shared by the selected CanvasItems
+        tags, accepted = QInputDialog.getText(self, "Edit Tags", "Tags (separated by commas):", QLineEdit.Normal, ", ".join(self.GetSharedTags(selected)))
+        if accepted:
+            self.SetSharedTags(selected, tags.split(","))
+
+    elif action == setFilter:           # Filter the CanvasItems of the selected tab
+        projectTags = self.MainContent.metadataIndex.GetTags() if self.MainContent.metadataIndex != None else []
+        query, accepted = QInputDialog.getText(self, "Filter Items", 
+                                               "Filter (i.e. #tag type:image ext:png width>1000 created>2024-01-31):\nTags: " + (", ".join(projectTags) if len(projectTags) > 0 else "None"), 
+                                               QLineEdit.Normal, self.GetFilterQuery())
+        if accepted:
+            self.SetFilter(query)
+
+    elif action == hideFiltered:        # Hide or dim CanvasItems that do not match the filter
+        self.SetFilter(self.GetFilterQuery(), hideFiltered.isChecked())
+
+    elif action == clearFilter:         # Remove the filter
+        self.SetFilter("")
+
     # ----- Insert Canvas Items -----
     elif action == insertImage:         # Insert Image CanvasItem
-        imageFiles = QFileDialog.getOpenFileNames(self,"Select Images",".","Images (*.jpg *.png *.gif)")
+        imageFiles = QFileDialog.getOpenFileNames(self,"Select Images",".","Images (" + " ".join("*" + fileType for fileType in imageFileTypes) + ")")
 
-        if imageFiles[0] != "":
-            i = 0
-            for filePath in imageFiles[0]:
-                position = clickPos + QPointF(10*i, 10*i)
-                self.NewImageCanvasItem(filePath, position, centerOnPos = True)
-                i += 1
+        if len(imageFiles[0]) > 0:
+            self.ImportImages(imageFiles[0], clickPos)
+
+    elif action == importFolder:        # Import every image in a folder
+        folder = QFileDialog.getExistingDirectory(self, "Select Folder", ".")
+
+        if folder != "":
+            self.ImportImages([folder], clickPos)
 
     elif action == insertText:          # Insert Text CanvasItem
-        self.NewTextCanvasItem("Text", clickPos, 1, centerOnPos = True)
+        self.PlaceCanvasItems([self.NewTextCanvasItem("Text", clickPos, 1, centerOnPos = True)])
 
     elif action == insertFile:          # Insert File CanvasItem
         files = QFileDialog.getOpenFileNames(self,"Select Files",".")
 
-        if files[0] != "":
-            i = 0
-            for filePath in files[0]:
-                position = clickPos + QPointF(10*i, 10*i)
-                self.NewFileCanvasItem(filePath, position, centerOnPos = True)
-                i += 1
+        if len(files[0]) > 0:
+            fileItems = [self.NewFileCanvasItem(filePath, clickPos, centerOnPos = True) for filePath in files[0]]
+            self.PlaceCanvasItems(fileItems)    # Each file is moved to the nearest free space
+
+    elif action == findDuplicates:      # Find Duplicate Images
+        self.MainContent.FindDuplicateImages()
 
     elif action == saveProject:         # Save Project
         saveLocation = QFileDialog.getSaveFileName(self, "Save Location", ".", "JSON (*.json)")
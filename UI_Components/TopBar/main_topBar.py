@@ -8,6 +8,7 @@ Date Updated: 9/28/22
 
 # --Imports--
 import copy
+from collections import OrderedDict
 
 #PySide
 from PySide6.QtGui import *
@@ -18,7 +19,6 @@ from Utility.ManageJSON import CreateTabData
 # Custom Imports
 from Utility.UtilityFunctions import *
 from Settings.settings import *
-from UI_Components.ContextMenu.contextMenu import *
 
 class MainTopBar(QWidget):
     def __init__(self, parent, projectName = "Project") -> None:
@@ -87,6 +87,7 @@ class MainTopBar(QWidget):
     # ------ Events ------
     def mousePressEvent(self, event) -> None:
         if event.button() == Qt.MouseButton.RightButton:
+            from UI_Components.ContextMenu.contextMenu import TabBarContextMenu    # Imported on first use, to reduce startup time
             TabBarContextMenu(self, event)
             return
         elif event.button() == Qt.MouseButton.LeftButton:
@@ -243,6 +244,7 @@ class TabContainer(QWidget):
         
         tabData = CreateTabData(tabName="Tab", tabID = newID, canvasItems=[]) 
         self.mainTopBar.tabHashTable[newID] = tabData
+        self.MainContent.SetModified(True)
         newTab = self.AddTab(newID, tabData["tabName"], setSelected = False)
 
         if index != None:
@@ -265,6 +267,7 @@ class TabContainer(QWidget):
 
         tabData = CreateTabData(tabName=tabName, tabColor=tabColor, tabID = newID, canvasItems=canvasItems, viewportPos= viewportPos, viewportZoom=viewportZoom) 
         self.mainTopBar.tabHashTable[newID] = tabData
+        self.MainContent.SetModified(True)
         newTab = self.AddTab(newID, tabName, setSelected = False)
 
         if index != None:
@@ -308,6 +311,7 @@ class TabContainer(QWidget):
             # Delete widget
             del self.mainTopBar.tabHashTable[tabWidget.tabID]
             tabWidget.deleteLater()
+            self.MainContent.SetModified(True)
 
             if index < self.GetNumberOfTabs() - 1: # If tab is not last in tab container
                 nextTab = self.GetTab(self.hBoxLayout.itemAt(index + 1).widget().tabID)
@@ -406,6 +410,8 @@ class TabContainer(QWidget):
             widget = self.hBoxLayout.itemAt(index).widget()
             new_dict[widget.tabID] = self.mainTopBar.tabHashTable[widget.tabID]
 
+        if list(new_dict) != list(self.mainTopBar.tabHashTable):  # Called on every tab click, so only a changed order is a modification
+            self.mainTopBar.MainContent.SetModified(True)
         self.mainTopBar.tabHashTable = new_dict
         self.mainTopBar.MainContent.tabHashTable = new_dict
 
@@ -527,6 +533,7 @@ class Tab(QWidget):
     def mousePressEvent(self, event):
         
         if event.button() == Qt.MouseButton.RightButton:
+            from UI_Components.ContextMenu.contextMenu import TabBarContextMenu    # Imported on first use, to reduce startup time
             TabBarContextMenu(self, event)
             return True
         elif event.button() == Qt.MouseButton.LeftButton:
@@ -574,6 +581,8 @@ class Tab(QWidget):
         return super().paintEvent(event)
 
     def SaveTabText(self, text):
+        if text != self.name:
+            self.tabContainer.mainTopBar.MainContent.SetModified(True)
         self.tabContainer.mainTopBar.tabHashTable[self.tabID]["tabName"] = text
         self.name = text
 
@@ -6,6 +6,7 @@ Date Updated: 11/22/22
 """
 
 # --Imports--
+import os
 from json import *
 
 #PySide
@@ -16,11 +17,16 @@ from PySide6.QtCore import *
 # Custom Imports
 from Utility.UtilityFunctions import *
 from Utility.ManageJSON import *
+from Utility import StartupProfiler
+from Utility.BackgroundTasks import RunInBackground
+from Utility.SearchIndex import SearchIndex, BuildSearchIndexRequest
+from Utility.MetadataIndex import MetadataIndex, BuildMetadataIndexRequest, GetNodeTags, SetNodeTags
+from Utility.ImageHash import ImageHashTask, FindDuplicateClusters, IsImageHashStale
 
 #Components Used:
 from UI_Components.TopBar.main_topBar import *
 from UI_Components.Canvas.main_Canvas import *
-from UI_Components.ContextMenu.contextMenu import * # Needed for initialization
+from UI_Components.Canvas.CanvasUtility.CanvasSnapshot import CanvasSnapshot, SaveCanvasSnapshot
 
 class MainContent(QWidget):
     FinishedInitializing = Signal() # When software finishes initialization, emit this signal
@@ -41,11 +47,22 @@ class MainContent(QWidget):
         self.selectedTab = None
         self.canvasSize = None
         self.saveLocation = u""     # Currently loaded project JSON location
+        self.snapshot = None        # Snapshot of the last project, displayed while the last project is loading on startup
+        self.isModified = False     # If the project has changes that have not been saved
+        self.hasAutosaveChanges = False # If the project changed since it was last autosaved
+        self.autosaveTimer = QTimer(self)
+        self.autosaveTimer.setInterval(autosaveInterval)
+        self.searchIndex = SearchIndex()    # Search index of the project's nodes. None while it is built
+        self.searchIndexRequestID = 0       # Incremented each time a project is loaded, indexes of previous projects are ignored
+        self.pendingSearchNodes = set()     # Nodes changed while the search index was built
+        self.metadataIndex = MetadataIndex()    # Tag and metadata index of the project's nodes, used by filters. None while it is built
+        self.pendingMetadataNodes = set()   # Nodes changed while the metadata index was built
 
         # Elements
         self.topBar = MainTopBar(self, projectName = self.projectName)  # Top Bar 
         self.canvas = MainCanvas(self)  # Main Canvas
         self.zoomButtons = ZoomButtons(self)
+        self.searchBar = SearchBar(self)
 
         # Layouts
         vLayout = QVBoxLayout(self)
@@ -53,24 +70,151 @@ class MainContent(QWidget):
         vLayout.addWidget(self.canvas)  # Add Canvas 
         LayoutRemoveSpacing(vLayout)
 
-        # INIT
+        # Signals
+        self.canvas.TabLoaded.connect(self.RemoveSnapshot)
+        self.autosaveTimer.timeout.connect(self.Autosave)
+        self.findShortcut = QShortcut(QKeySequence.Find, self, self.searchBar.Open)
+        self.FinishedInitializing.emit()    # Emit signal when main content has finished initialization
+
+    def InitializeProject(self):
+        """Load the starting project. This is called after the window is shown, so loading the project does not delay the first frame.
+
+        If a project was opened last session, a snapshot of its canvas is displayed while the project is loaded in the background.
+        """
+        appState = LoadAppState()
+        lastProject = appState.get("lastProject")
+
+        if lastProject != None and os.path.exists(lastProject):
+            self.ShowSnapshot(lastProject, appState.get("snapshot"))
+            self.saveLocation = lastProject
+            self.SetControlsEnabled(False)  # The controls need the project's data, which does not exist until it is loaded
+            RunInBackground(LoadJSON, lastProject, False, onFinished = self.LastProjectLoaded, onFailed = self.LastProjectLoaded)
+        else:
+            self.LoadDefaultProject()
+            self.FinishedStartup()
+
+    def LoadDefaultProject(self):
+        """Load a new, empty project"""
         tabID = GenerateID()
         self.LoadProject(JSONData = NewProjectData("Project", tabID, [100000,100000], [CreateTabData("Tab", tabID, [])], [])["Project"])
 
-        # Signals
-        self.FinishedInitializing.emit()    # Emit signal when main content has finished initialization
+    def LastProjectLoaded(self, JSONData):
+        """Called when the last project has finished loading in the background. Replaces the snapshot with the project.
+
+        Args:
+            JSONData (dict): Loaded project data. If the project failed to load, this is None or the error traceback.
+        """
+        if type(JSONData) == dict:
+            self.ApplySnapshotViewport(JSONData)
+            self.LoadProject(self.saveLocation, JSONData = JSONData)
+        else:
+            ConsoleLog.error("Load Last Project", "Unable to load the last project at [" + str(self.saveLocation) + "]")
+            self.LoadDefaultProject()
+        self.SetControlsEnabled(True)
+
+        if not self.canvas.isLoadingTab:    # Otherwise the snapshot is removed when the tab's CanvasItems are created
+            self.RemoveSnapshot()
+
+        self.FinishedStartup()
+
+    def SetControlsEnabled(self, isEnabled: bool):
+        """Enable or disable input to the canvas, zoom buttons, top bar, and search. Disabled while the last project is loaded in the background on startup."""
+        self.canvas.setEnabled(isEnabled)
+        self.zoomButtons.setEnabled(isEnabled)
+        self.topBar.setEnabled(isEnabled)
+        self.findShortcut.setEnabled(isEnabled)
+
+    def RemoveSnapshot(self):
+        """Remove the snapshot of the last project, if it is displayed"""
+        if self.snapshot != None:
+            self.snapshot.Remove()
+            self.snapshot = None
+
+    def FinishedStartup(self):
+        """Record that startup has finished, and write the startup report"""
+        StartupProfiler.MarkPhase("Project loaded")
+        StartupProfiler.WriteReport()
+
+    def ShowSnapshot(self, projectLocation: str, snapshotData):
+        """Display the snapshot of the last project over the canvas, if it is still valid
+
+        Args:
+            projectLocation (str): location of the project the snapshot was taken of
+            snapshotData (dict): snapshot data from the app state
+        """
+        if snapshotData == None:
+            return
+        if snapshotData.get("projectLocation") != projectLocation:  # The snapshot was taken of a different project
+            return
+        if snapshotData.get("projectModified") != os.path.getmtime(projectLocation):  # Project was changed after the snapshot was taken
+            return
+
+        snapshot = CanvasSnapshot(self.canvas, snapshotData)
+        if snapshot.isValid():
+            self.snapshot = snapshot
+            self.snapshot.show()
+            self.setCanvasEmpty(False)
+            self.zoomChanged(snapshotData["viewportZoom"])
+        else:
+            snapshot.deleteLater()
+
+    def ApplySnapshotViewport(self, JSONData):
+        """Called when the last project has loaded, before its tab is selected. If the displayed snapshot is of the tab that opens, the tab opens at the viewport of the snapshot.
+        Otherwise the snapshot is removed, as it shows a different tab.
+
+        Args:
+            JSONData (dict): Loaded project data
+        """
+        if self.snapshot == None:
+            return
+
+        snapshotData = self.snapshot.snapshotData
+        for tabData in JSONData.get("tabs", []):
+            if tabData["tabID"] == snapshotData.get("tabID") == JSONData.get("selectedTab"):
+                tabData["viewportPos"] = snapshotData["viewportPos"]    # The viewport is not saved when the app is closed, so the snapshot has the latest viewport
+                tabData["viewportZoom"] = snapshotData["viewportZoom"]
+                return
+        self.RemoveSnapshot()
+
+    def SaveSnapshot(self):
+        """Save a snapshot of the canvas to the app state, which is displayed on the next startup while this project loads. Called when the project is saved, and when the app is closed.
+        Only saved if the canvas shows the saved project file, otherwise the snapshot of the last save is kept."""
+        if self.canvas.tabData == None or self.canvas.isLoadingTab or self.snapshot != None:   # The project has not loaded yet
+            return
+        if self.saveLocation == "" or self.isModified or not os.path.exists(self.saveLocation):
+            return
+
+        appState = LoadAppState()
+        appState["lastProject"] = self.saveLocation
+        appState.pop("snapshot", None)
+
+        snapshotData = SaveCanvasSnapshot(self.canvas)
+        if snapshotData != None:
+            snapshotData["projectLocation"] = self.saveLocation
+            snapshotData["projectModified"] = os.path.getmtime(self.saveLocation)
+            appState["snapshot"] = snapshotData
+        SaveAppState(appState)
 
     def LoadProject(self, fileLocation: str = "", JSONData = None):
         """This function is what initializes all of the data within the project and calls the functions to set the data for the canvas and Tabs
 
         Args:
             fileLocation (str): Where the JSON project data is stored.
+            JSONData (dict, optional): Already loaded project data. If this is passed, fileLocation is not read.
         """
         # Get Data from JSON File
         if JSONData == None:
             self.JSONData = LoadJSON(fileLocation)
         else:
             self.JSONData = JSONData
+
+        self.saveLocation = fileLocation
+        self.SetModified(False)
+        if fileLocation != "":  # Remember the project, so it is opened on the next startup
+            self.SetLastProject(fileLocation)
+            autosaveLocation = GetAutosaveLocation(fileLocation)
+            if os.path.exists(autosaveLocation) and os.path.exists(fileLocation) and os.path.getmtime(autosaveLocation) > os.path.getmtime(fileLocation):
+                ConsoleLog.warning("Autosave", "Unsaved changes to this project were autosaved to " + autosaveLocation + ". Open it to recover them.")
         self.tabHashTable = LoadTabs(self.JSONData)
         self.nodeHashTable = LoadNodes(self.JSONData)
         self.projectName = self.JSONData["projectName"]
@@ -78,6 +222,7 @@ class MainContent(QWidget):
         self.canvasSize = self.JSONData["canvasSize"]
 
         # Initialize Data on Tabs and Canvas
+        self.canvas.SetFilter("")   # Filters of the previous project are removed
         self.topBar.SetTabs(self.tabHashTable, self.selectedTab)
         self.canvas.SetCanvasData(self.nodeHashTable, canvasSize = self.JSONData["canvasSize"])
 
@@ -90,6 +235,219 @@ class MainContent(QWidget):
         else:
             ConsoleLog.error("Tab Missing", "Tab [" + str(self.selectedTab) + "] not found in 'tabs'.")
 
+        # Backfill missing image metadata and detect changed images, without blocking the UI
+        imageNodes = [(nodeID, dict(nodeData)) for nodeID, nodeData in self.nodeHashTable.items() if nodeData["nodeType"] == "Image_Node"]
+        if len(imageNodes) > 0:
+            RunInBackground(CollectImageMetadata, imageNodes, onFinished = self.ImageMetadataCollected)
+
+        # Build the search index in the background. Nodes changed meanwhile are indexed once it finishes.
+        self.searchIndex = None
+        self.searchIndexRequestID += 1
+        self.pendingSearchNodes.clear()
+        self.searchBar.Close()
+        RunInBackground(BuildSearchIndexRequest, self.searchIndexRequestID, dict(self.nodeHashTable), onFinished = self.SearchIndexBuilt)
+
+        self.metadataIndex = None
+        self.pendingMetadataNodes.clear()
+        RunInBackground(BuildMetadataIndexRequest, self.searchIndexRequestID, dict(self.nodeHashTable), onFinished = self.MetadataIndexBuilt)
+
+    def ImageMetadataCollected(self, updates):
+        """Called when CollectImageMetadata finishes. Stores the new image metadata, and reloads images whose size changed.
+
+        Args:
+            updates (dict): nodeID : image metadata, for each node that was missing metadata or has changed
+        """
+        changedNodes = []
+        for nodeID, metadata in updates.items():
+            if nodeID not in self.nodeHashTable:    # Another project was loaded
+                continue
+            nodeData = self.nodeHashTable[nodeID]
+            if nodeData.get("imageWidth") != metadata["imageWidth"] or nodeData.get("imageHeight") != metadata["imageHeight"] or nodeData.get("fileModified") != metadata["fileModified"]:
+                changedNodes.append(nodeID)
+            nodeData.update(metadata)   # The project is not marked modified, so opening a project does not change it. The metadata is written when the user next saves.
+            self.NodeChanged(nodeID)    # The image size is used by filters
+
+        if len(changedNodes) > 0:
+            self.canvas.ImageNodesChanged(changedNodes)
+
+    # ----- Search -----
+    def SearchIndexBuilt(self, result):
+        """Called when BuildSearchIndexRequest finishes. Indexes the nodes that changed while the index was built."""
+        requestID, searchIndex = result
+        if requestID != self.searchIndexRequestID:  # Another project was loaded
+            return
+
+        self.searchIndex = searchIndex
+        for nodeID in self.pendingSearchNodes:
+            self.UpdateSearchIndex(nodeID)
+        self.pendingSearchNodes.clear()
+        self.searchBar.Search()     # Show results for text typed while the index was built
+
+    def NodeChanged(self, nodeID: str):
+        """Called when a node is added, or its text, tags, or metadata changed"""
+        self.UpdateSearchIndex(nodeID)
+        self.UpdateMetadataIndex(nodeID)
+
+    def UpdateSearchIndex(self, nodeID: str):
+        """Index a node that was added or whose searchable text changed"""
+        if self.searchIndex == None:
+            self.pendingSearchNodes.add(nodeID)
+        elif nodeID in self.nodeHashTable:
+            self.searchIndex.UpdateNode(nodeID, self.nodeHashTable[nodeID])
+        else:
+            self.searchIndex.RemoveNode(nodeID)
+
+    def MetadataIndexBuilt(self, result):
+        """Called when BuildMetadataIndexRequest finishes. Indexes the nodes that changed while the index was built, and applies the canvas filter."""
+        requestID, metadataIndex = result
+        if requestID != self.searchIndexRequestID:  # Another project was loaded
+            return
+
+        self.metadataIndex = metadataIndex
+        for nodeID in self.pendingMetadataNodes:
+            self.UpdateMetadataIndex(nodeID)
+        self.pendingMetadataNodes.clear()
+        self.canvas.ApplyFilter()
+
+    def UpdateMetadataIndex(self, nodeID: str):
+        """Index a node that was added or whose tags or metadata changed"""
+        if self.metadataIndex == None:
+            self.pendingMetadataNodes.add(nodeID)
+        elif nodeID in self.nodeHashTable:
+            self.metadataIndex.UpdateNode(nodeID, self.nodeHashTable[nodeID])
+        else:
+            self.metadataIndex.RemoveNode(nodeID)
+
+    def Search(self, query: str):
+        """Find the CanvasItems whose node contains query, in every tab
+
+        Returns:
+            (str, dict)[]: tabID and CanvasItem data of each result. Results in the selected tab are first. None if the search index is being built.
+        """
+        if self.searchIndex == None:
+            return None
+
+        nodeIDs = set(self.searchIndex.Search(query, searchResultLimit))
+        if len(nodeIDs) == 0:
+            return []
+
+        tabIDs = sorted(self.tabHashTable, key=lambda tabID: tabID != self.selectedTab)   # Stable sort, so the other tabs keep their order
+        results = []
+        for tabID in tabIDs:
+            for canvasItemData in self.tabHashTable[tabID]["canvasItems"]:
+                if canvasItemData["nodeID"] in nodeIDs:
+                    results.append((tabID, canvasItemData))
+        return results
+
+    def ShowSearchResult(self, tabID: str, canvasItemData):
+        """Select the result's tab, and center the view on its CanvasItem"""
+        if tabID not in self.tabHashTable:  # The tab was deleted
+            return
+        if tabID != self.selectedTab:
+            self.topBar.SetSelectedTab(tabID)
+        self.canvas.FocusCanvasItem(canvasItemData)
+
+    # ----- Duplicate Images -----
+    def FindDuplicateImages(self):
+        """Hash the project's images on a background thread, then display the clusters of near-duplicate images.
+        Images that were hashed before, and have not changed, are not hashed again."""
+        staleNodes = []
+        for nodeID, nodeData in self.nodeHashTable.items():
+            if nodeData["nodeType"] == "Image_Node" and IsImageHashStale(nodeData):
+                imageSize = (nodeData["imageWidth"], nodeData["imageHeight"]) if nodeData.get("imageWidth", -1) > 0 and nodeData.get("imageHeight", -1) > 0 else None
+                staleNodes.append((nodeID, nodeData["imagePath"], imageSize))
+
+        if len(staleNodes) == 0:
+            self.ImagesHashed({})
+            return
+
+        hashTask = ImageHashTask(staleNodes, self)
+        hashTask.Hashed.connect(self.ImagesHashed)
+        hashTask.Start()
+
+    def ImagesHashed(self, hashes):
+        """Called when ImageHashTask finishes. Stores the hashes in the nodes, then finds the clusters of near-duplicate images on a background thread.
+
+        Args:
+            hashes (dict): nodeID : hash hex string, for each image that was hashed
+        """
+        for nodeID, imageHash in hashes.items():
+            if nodeID not in self.nodeHashTable:    # The node was removed, or another project was loaded
+                continue
+            nodeData = self.nodeHashTable[nodeID]
+            nodeData["imageHash"] = imageHash
+            nodeData["imageHashModified"] = nodeData.get("fileModified")
+            self.SetModified(True)  # The hashes are saved, so the images do not need to be hashed again
+
+        nodeHashes = {nodeID: nodeData["imageHash"] for nodeID, nodeData in self.nodeHashTable.items() if nodeData["nodeType"] == "Image_Node" and nodeData.get("imageHash") != None}
+        RunInBackground(FindDuplicateClusters, nodeHashes, onFinished = self.DuplicateImagesFound)
+
+    def DuplicateImagesFound(self, clusters):
+        """Called when FindDuplicateClusters finishes. Displays the clusters of near-duplicate images, and asks to merge them."""
+        clusters = [[nodeID for nodeID in cluster if nodeID in self.nodeHashTable] for cluster in clusters]   # Nodes may have been removed meanwhile
+        clusters = [cluster for cluster in clusters if len(cluster) > 1]
+        if len(clusters) == 0:
+            QMessageBox.information(self, "Duplicate Images", "No duplicate images found.")
+            return
+
+        duplicateCount = sum(len(cluster) - 1 for cluster in clusters)
+        messageBox = QMessageBox(QMessageBox.Question, "Duplicate Images", 
+                                 "Found " + str(len(clusters)) + " groups of duplicate images.\n\n" 
+                                 "Merge each group into its highest resolution image? " + str(duplicateCount) + " images will be replaced.", 
+                                 QMessageBox.NoButton, self)
+        messageBox.setDetailedText("\n\n".join("\n".join(self.nodeHashTable[nodeID]["imagePath"] for nodeID in cluster) for cluster in clusters))
+        mergeButton = messageBox.addButton("Merge", QMessageBox.AcceptRole)
+        messageBox.addButton(QMessageBox.Cancel)
+        messageBox.exec()
+
+        if messageBox.clickedButton() == mergeButton:
+            self.MergeImageNodes(clusters)
+
+    def MergeImageNodes(self, clusters):
+        """Replace duplicate image nodes with the highest resolution image of their cluster, in every tab.
+        CanvasItems keep their displayed size, and the tags of the duplicates are added to the kept node.
+
+        Args:
+            clusters (list): clusters of image nodeIDs (See Utility/ImageHash.FindDuplicateClusters)
+        """
+        self.canvas.SaveChanges()   # Moved CanvasItems are written to the tab data before it is changed
+
+        mergedNodes = {}    # Removed nodeID : kept nodeID
+        for cluster in clusters:
+            keptID = max(cluster, key=lambda nodeID: (self.nodeHashTable[nodeID].get("imageWidth", -1) * self.nodeHashTable[nodeID].get("imageHeight", -1), 
+                                                       len(self.nodeHashTable[nodeID]["canvasItemReferences"])))
+            keptNode = self.nodeHashTable[keptID]
+            for nodeID in cluster:
+                if nodeID != keptID:
+                    mergedNodes[nodeID] = keptID
+                    SetNodeTags(keptNode, GetNodeTags(keptNode) + GetNodeTags(self.nodeHashTable[nodeID]))
+
+        for tabData in self.tabHashTable.values():
+            for canvasItemData in tabData["canvasItems"]:
+                keptID = mergedNodes.get(canvasItemData["nodeID"])
+                if keptID == None:
+                    continue
+                removedWidth = self.nodeHashTable[canvasItemData["nodeID"]].get("imageWidth", -1)
+                keptWidth = self.nodeHashTable[keptID].get("imageWidth", -1)
+                if removedWidth > 0 and keptWidth > 0:  # Item coordinates are image pixels, so the scale is changed to keep the displayed size
+                    canvasItemData["itemScale"] = canvasItemData["itemScale"] * removedWidth / keptWidth
+                canvasItemData["nodeID"] = keptID
+                self.nodeHashTable[keptID]["canvasItemReferences"].append(canvasItemData["canvasItemID"])
+
+        if self.canvas.copyCanvasItemData != None:  # Copied CanvasItems of removed nodes paste the kept node
+            for copyData in self.canvas.copyCanvasItemData:
+                copyData["nodeID"] = mergedNodes.get(copyData["nodeID"], copyData["nodeID"])
+
+        for nodeID, keptID in mergedNodes.items():
+            del self.nodeHashTable[nodeID]
+            self.NodeChanged(nodeID)
+            self.NodeChanged(keptID)
+
+        self.SetModified(True)
+        if self.selectedTab in self.tabHashTable:   # Reload the CanvasItems of the selected tab
+            self.canvas.TabSelected(self.tabHashTable[self.selectedTab])
+        ConsoleLog.log("Duplicate Images", "Merged " + str(len(mergedNodes)) + " duplicate images.")
+
     def SaveProject(self, saveLocation: str = None):
         """Save the project to a JSON file.
 
@@ -99,12 +457,68 @@ class MainContent(QWidget):
         if saveLocation == None:    # If no save location is passed, the currently loaded JSON project will be overwritten 
             saveLocation = self.saveLocation
 
+        self.canvas.SaveChanges()
         self.UpdateJSONData()
         try:    # If unable to save the json file, continue
-            SaveJSON(self.JSONData, saveLocation)
+            if not SaveJSON(self.JSONData, saveLocation):
+                return
             self.saveLocation = saveLocation
         except: 
-            pass
+            return
+        self.SetModified(False)
+
+        autosaveLocation = GetAutosaveLocation(saveLocation)
+        if os.path.exists(autosaveLocation):    # The autosaved changes are in the saved project
+            try:
+                os.remove(autosaveLocation)
+            except OSError:
+                ConsoleLog.warning("Autosave", "Unable to remove the autosave at " + autosaveLocation)
+
+        self.SetLastProject(saveLocation)
+        self.SaveSnapshot()
+
+    def SetModified(self, isModified: bool):
+        """Set if the project has unsaved changes. Modified projects are autosaved to their autosave file every autosaveInterval (settings.py) ms.
+
+        Args:
+            isModified (bool): If the project has unsaved changes
+        """
+        self.hasAutosaveChanges = isModified
+        if isModified == self.isModified:
+            return
+
+        self.isModified = isModified
+        self.window().setWindowModified(isModified)
+
+        if isModified and autosaveInterval > 0:
+            self.autosaveTimer.start()
+        else:
+            self.autosaveTimer.stop()
+
+    def Autosave(self):
+        """Called by the autosave timer. Writes the project to its autosave file (See ManageJSON.GetAutosaveLocation) if it changed since the last autosave, and was saved or opened from a file.
+        The project file itself is only written when the user saves."""
+        if not self.hasAutosaveChanges or self.saveLocation == "":
+            return
+
+        autosaveLocation = GetAutosaveLocation(self.saveLocation)
+        ConsoleLog.log("Autosave", "Saving modified project to " + autosaveLocation)
+        self.canvas.SaveChanges()
+        self.UpdateJSONData()
+        if SaveJSON(self.JSONData, autosaveLocation):
+            self.hasAutosaveChanges = False
+
+    def SetLastProject(self, fileLocation: str):
+        """Store the project location in the app state, so it is opened on the next startup
+
+        Args:
+            fileLocation (str): location of the project JSON file.
+        """
+        appState = LoadAppState()
+        if appState.get("lastProject") != fileLocation:
+            appState["lastProject"] = fileLocation
+            appState.pop("snapshot", None)  # The snapshot was taken of a different project
+            SaveAppState(appState)
 
     def TabSelected(self, tabID : str):
         """When a tab is selected in 'self.topBar', a signal will be emitted, calling this function.
@@ -162,6 +576,8 @@ class MainContent(QWidget):
     def resizeEvent(self, event) -> None:        
         if event.oldSize().height() != self.size().height():    # If Height changed
             self.zoomButtons.setPos(event.size().height())
+        if event.oldSize().width() != self.size().width():      # If Width changed
+            self.searchBar.setPos(event.size().width())
 
         return super().resizeEvent(event)
 
@@ -266,6 +682,130 @@ class ZoomButtons(QWidget):
         self.setGeometry(QRect(QPoint(self.pos().x(), yPos - self.height()), self.size()))
 
 
+class SearchBar(QWidget):
+    def __init__(self, parent) -> None:
+        """ Search bar that displays in the top right corner of the canvas when Ctrl+F is pressed.
+            Searches the text of text nodes, node names, and file names in every tab. Enter shows the next result, Shift+Enter shows the previous result, and Escape closes the search bar.
+            While typing, only the number of results is updated, as showing a result may select another tab.
+        """
+        super().__init__(parent)
+
+        # References
+        self.mainContent = parent
+
+        # Set Attributes
+        self.setAttribute(Qt.WA_StyledBackground, False)
+        self.setFixedHeight(35)
+        self.setFixedWidth(300)
+
+        font = QFont()
+        font.setPointSize(10)
+
+        # Properties
+        self.results = []       # (tabID, CanvasItem data) of each result
+        self.resultIndex = -1   # Index of the displayed result. -1 if no result is displayed
+        self.searchTimer = QTimer(self)     # Searches once typing pauses, instead of on every key press
+        self.searchTimer.setSingleShot(True)
+        self.searchTimer.setInterval(searchDelay)
+
+        # Text
+        self.searchText = QLineEdit(self)
+        self.searchText.setFixedHeight(26)
+        self.searchText.setStyleSheet("background-color: #363636; border-radius: 5px; color: white; padding-left: 5px; padding-bottom: 2px")
+        self.searchText.setFont(font)
+        self.searchText.setPlaceholderText("Search")
+        self.searchText.installEventFilter(self)
+
+        self.resultCount = QLabel(self)
+        self.resultCount.setFixedSize(60, 26)
+        self.resultCount.setStyleSheet("color: white")
+        self.resultCount.setFont(font)
+        self.resultCount.setAlignment(Qt.AlignCenter)
+
+        # Layout
+        self.hLayout = QHBoxLayout(self)
+        self.hLayout.setSpacing(4)
+        self.hLayout.setContentsMargins(0,7,7,0)
+        self.hLayout.addWidget(self.searchText)
+        self.hLayout.addWidget(self.resultCount)
+
+        # Init
+        self.searchText.textChanged.connect(self.SearchTextChanged)
+        self.searchTimer.timeout.connect(self.Search)
+        self.hide()
+
+    def Open(self):
+        """Show the search bar, and select its text"""
+        self.show()
+        self.raise_()
+        self.searchText.setFocus()
+        self.searchText.selectAll()
+
+    def Close(self):
+        """Hide the search bar"""
+        self.hide()
+        self.mainContent.canvas.setFocus()
+
+    def Search(self):
+        """Search for the text in the search bar, and display the number of results. The results are shown with ShowResult."""
+        self.searchTimer.stop()
+        if not self.isVisible():
+            return
+
+        results = self.mainContent.Search(self.searchText.text())
+        if results == None:     # Search index is being built
+            self.results = []
+            self.resultCount.setText("...")
+            return
+
+        self.results = results
+        self.resultIndex = -1
+        self.SetResultCount()
+
+    def ShowResult(self, step: int):
+        """Show the next (step = 1) or previous (step = -1) result"""
+        if self.searchTimer.isActive():     # Search the text typed since the last search first
+            self.Search()
+        if len(self.results) == 0:
+            return
+
+        if self.resultIndex == -1:
+            self.resultIndex = 0 if step > 0 else len(self.results) - 1
+        else:
+            self.resultIndex = (self.resultIndex + step) % len(self.results)
+        self.SetResultCount()
+        self.mainContent.ShowSearchResult(*self.results[self.resultIndex])
+
+    def SetResultCount(self):
+        """Display the index of the displayed result, and the number of results"""
+        if len(self.results) == 0 and self.searchText.text().strip() == "":
+            self.resultCount.setText("")
+        else:
+            self.resultCount.setText(str(self.resultIndex + 1) + "/" + str(len(self.results)))
+
+    def setPos(self, xPos: int):
+        """Sets the horizontal position of the search bar
+
+        Args:
+            xPos (int) : width of the window that will set the position of the search bar
+        """
+        self.setGeometry(QRect(QPoint(xPos - self.width(), topBarHeight), self.size()))
+
+    # ----- Events -----
+    def SearchTextChanged(self, text: str):
+        self.searchTimer.start()
+
+    def eventFilter(self, watched, event) -> bool:
+        if watched == self.searchText and event.type() == QEvent.KeyPress:
+            if event.key() == Qt.Key_Return or event.key() == Qt.Key_Enter:
+                self.ShowResult(-1 if event.modifiers() & Qt.ShiftModifier else 1)
+                return True
+            elif event.key() == Qt.Key_Escape:
+                self.Close()
+                return True
+        return super().eventFilter(watched, event)
+
+
 class ClickableLineEdit(QLineEdit):
     clicked = Signal()
     def mousePressEvent(self, event):
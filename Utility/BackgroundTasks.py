@@ -0,0 +1,87 @@
+"""
+Description: This python file provides functionality for running slow functions (i.e. reading files) on a background thread.
+             Results are returned to the GUI thread through Qt signals.
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# Imports
+import traceback
+
+#PySide
+from PySide6.QtCore import *
+
+from Utility import ConsoleLog
+
+runningTasks = set()    # Reference to running tasks, so they are not garbage collected before they finish
+
+
+class TaskSignals(QObject):
+    Finished = Signal(object)   # Emits the return value of the function
+    Failed = Signal(str)        # Emits the traceback of the exception raised by the function
+
+    def __init__(self, task) -> None:
+        super().__init__()
+
+        # References
+        self.task = task
+
+    def Release(self):
+        """Remove the reference to the task. Connected after the task's callbacks, so it is called on the GUI thread once they finish.
+        If the reference was removed on the background thread, the task and its signals could be deleted while queued signals are still waiting for the GUI thread."""
+        runningTasks.discard(self.task)
+        self.task = None
+
+
+class BackgroundTask(QRunnable):
+    def __init__(self, function, *args, **kwargs) -> None:
+        """Runs a function on the global QThreadPool.
+
+        Args:
+            function (callable): function that will be run on the background thread. This function must not create or modify QWidgets, QGraphicsItems or QPixmaps.
+            *args, **kwargs: arguments passed to the function.
+        """
+        super().__init__()
+
+        # Properties
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals(self)    # Created on the GUI thread, so connected slots are called on the GUI thread
+
+    def run(self):
+        try:
+            result = self.function(*self.args, **self.kwargs)
+        except Exception:
+            error = traceback.format_exc()
+            ConsoleLog.error("Background Task Failed", getattr(self.function, "__name__", str(self.function)) + ": " + error)
+            self.signals.Failed.emit(error)
+        else:
+            self.signals.Finished.emit(result)
+
+
+def RunInBackground(function, *args, onFinished = None, onFailed = None, **kwargs):
+    """Run a function on a background thread.
+
+    Args:
+        function (callable): function to run on the background thread.
+        onFinished (callable, optional): called on the GUI thread with the function's return value.
+        onFailed (callable, optional): called on the GUI thread with the traceback if the function raises an exception.
+
+    Returns:
+        BackgroundTask: the started task
+    """
+    task = BackgroundTask(function, *args, **kwargs)
+    task.setAutoDelete(False)
+
+    if onFinished != None:
+        task.signals.Finished.connect(onFinished)
+    if onFailed != None:
+        task.signals.Failed.connect(onFailed)
+    task.signals.Finished.connect(task.signals.Release)     # Queued slots are called in the order they were connected
+    task.signals.Failed.connect(task.signals.Release)
+
+    runningTasks.add(task)
+    QThreadPool.globalInstance().start(task)
+    return task
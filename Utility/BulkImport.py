@@ -0,0 +1,194 @@
+"""
+Description:    This python file provides bulk importing of images and folders of images.
+                Folders are searched and images are probed (size and thumbnail) in a process pool, while a progress dialog is displayed.
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# --Imports--
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from threading import Event
+
+#PySide
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+from PySide6.QtCore import *
+
+# Custom Imports
+from Settings.settings import *
+from Utility import ConsoleLog
+from Utility.BackgroundTasks import RunInBackground
+from Utility.ImageLoader import DecodeThumbnail, ImageFromBytes, ImageToBytes
+from Utility.ManageJSON import GetImageMetadata
+
+
+# ----- Import Functions (Run on background threads and processes) -----
+def CollectImageFiles(filePaths):
+    """Get the images in filePaths. Folders are searched for images, including subfolders.
+
+    Args:
+        filePaths (str[]): paths to images and folders
+
+    Returns:
+        str[]: paths to the images, with images in the same folder sorted by name
+    """
+    imagePaths = []
+    for filePath in filePaths:
+        if os.path.isdir(filePath):
+            for root, folders, files in os.walk(filePath):
+                folders.sort()
+                imagePaths += [os.path.join(root, fileName) for fileName in sorted(files) if os.path.splitext(fileName)[1].lower() in imageFileTypes]
+        elif os.path.splitext(filePath)[1].lower() in imageFileTypes:
+            imagePaths.append(filePath)
+    return imagePaths
+
+def ProbeImage(imagePath: str):
+    """Read the metadata of an image, and create its thumbnail. Run in a worker process, so only picklable values are returned.
+
+    Returns:
+        (str, dict, tuple): imagePath, image metadata (See ManageJSON.GetImageMetadata), and the thumbnail (See ImageLoader.ImageToBytes). The metadata and thumbnail are None if the image can not be read.
+    """
+    metadata = GetImageMetadata(imagePath)
+    if metadata["imageWidth"] <= 0 or metadata["imageHeight"] <= 0:
+        return imagePath, None, None
+
+    thumbnail = DecodeThumbnail(imagePath, QSize(metadata["imageWidth"], metadata["imageHeight"]))
+    return imagePath, metadata, ImageToBytes(thumbnail) if not thumbnail.isNull() else None
+
+
+def CreateWorkerPool(executorType):
+    """Create the pool used to read images in parallel. Also used by Utility/ImageHash.py.
+    Processes are started with the spawn method on every platform, the method used by the packaged Windows app. Worker processes of the packaged app
+    run the app's entry point, so inspireCanvasMain.py calls multiprocessing.freeze_support() before anything else.
+
+    Args:
+        executorType (type): ProcessPoolExecutor or ThreadPoolExecutor
+
+    Returns:
+        Executor: pool with bulkImportWorkers (settings.py) workers
+    """
+    if executorType == ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=bulkImportWorkers, mp_context=multiprocessing.get_context("spawn"))
+    return ThreadPoolExecutor(max_workers=bulkImportWorkers)
+
+
+class BulkImportTask(QObject):
+    Progress = Signal(int, int)     # Emits the number of probed images, and the total number of images
+    Imported = Signal(list)         # Emits (imagePath, metadata, thumbnail QImage or None) for each image that was probed. Not emitted if the import is cancelled.
+
+    def __init__(self, filePaths, parent = None) -> None:
+        """Imports images and folders of images on a background thread, and displays the progress.
+
+            Images are probed in a process pool, so decoding thumbnails is not limited by the GIL.
+            Imports with fewer than bulkImportProcessThreshold (settings.py) images use a thread pool instead, as starting processes is slow.
+
+        Args:
+            filePaths (str[]): paths to images and folders
+            parent (QWidget, optional): parent of the progress dialog
+        """
+        super().__init__(parent)
+
+        # Properties
+        self.filePaths = list(filePaths)
+        self.cancelled = Event()    # Set from the GUI thread, read by the import thread
+
+        # Progress Dialog
+        self.progressDialog = QProgressDialog("Importing images...", "Cancel", 0, 0, parent)
+        self.progressDialog.setWindowModality(Qt.WindowModal)
+        self.progressDialog.setMinimumDuration(bulkImportDialogDelay)  # Small imports finish before the dialog is displayed
+        self.progressDialog.canceled.connect(self.Cancel)
+
+        # Signals
+        self.Progress.connect(self.ProgressChanged)
+
+    def Start(self):
+        """Start the import on a background thread"""
+        RunInBackground(self.Run, onFinished = self.Finished, onFailed = self.Failed)
+
+    def Cancel(self):
+        """Cancel the import. Images that are being probed are finished, but no CanvasItems are created."""
+        self.cancelled.set()
+
+    def Run(self):
+        """Find and probe the images. Run on a background thread.
+
+        Returns:
+            list: (imagePath, metadata, thumbnail QImage or None) for each image that could be read, in the order the images were found. None if the import was cancelled.
+        """
+        imagePaths = CollectImageFiles(self.filePaths)
+        self.Progress.emit(0, len(imagePaths))
+
+        try:
+            results = self.ProbeImages(imagePaths, ProcessPoolExecutor if len(imagePaths) >= bulkImportProcessThreshold else ThreadPoolExecutor)
+        except BrokenProcessPool:   # i.e. worker processes can not be started
+            ConsoleLog.warning("Bulk Import", "Unable to use worker processes, probing images on threads instead.")
+            results = self.ProbeImages(imagePaths, ThreadPoolExecutor)
+
+        if results == None:
+            return None
+
+        imported = []
+        for imagePath in imagePaths:    # Results arrive in the order they finished
+            if imagePath in results and results[imagePath][0] != None:
+                metadata, thumbnailData = results[imagePath]
+                imported.append((imagePath, metadata, ImageFromBytes(thumbnailData) if thumbnailData != None else None))
+            else:
+                ConsoleLog.error("Bulk Import", "Unable to read image: " + imagePath)
+        return imported
+
+    def ProbeImages(self, imagePaths, executorType):
+        """Probe the images in parallel
+
+        Args:
+            imagePaths (str[]): paths to the images
+            executorType (type): ProcessPoolExecutor or ThreadPoolExecutor
+
+        Returns:
+            dict: imagePath : (metadata, thumbnail bytes). None if the import was cancelled.
+        """
+        results = {}
+        if len(imagePaths) == 0:
+            return results
+
+        executor = CreateWorkerPool(executorType)
+        try:
+            futures = [executor.submit(ProbeImage, imagePath) for imagePath in imagePaths]
+            for completed, future in enumerate(as_completed(futures), 1):
+                if self.cancelled.is_set():
+                    return None
+                try:
+                    imagePath, metadata, thumbnailData = future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as error:
+                    ConsoleLog.error("Bulk Import", "Unable to probe image: " + str(error))
+                else:
+                    results[imagePath] = (metadata, thumbnailData)
+                self.Progress.emit(completed, len(imagePaths))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
+
+    # ----- Events (Called on the GUI thread) -----
+    def ProgressChanged(self, completed: int, total: int):
+        """Update the progress dialog"""
+        self.progressDialog.setMaximum(total)
+        self.progressDialog.setValue(completed)
+
+    def Finished(self, imported):
+        """Called when Run finishes. Emits Imported, unless the import was cancelled."""
+        self.progressDialog.reset()
+        self.progressDialog.deleteLater()
+        if imported != None and not self.cancelled.is_set():
+            self.Imported.emit(imported)
+        self.deleteLater()
+
+    def Failed(self, error):
+        """Called if Run raises an exception. The error is logged by the background task."""
+        self.progressDialog.reset()
+        self.progressDialog.deleteLater()
+        self.deleteLater()
@@ -0,0 +1,125 @@
+"""
+Description:    This python file provides the file icons drawn by FileCanvasItems.
+                Icons are cached by file extension, and are resolved a few at a time so loading many FileCanvasItems does not block the GUI.
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# --Imports--
+import os
+import weakref
+from collections import OrderedDict
+
+#PySide
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+from PySide6.QtCore import *
+
+# Custom Imports
+from Settings.settings import *
+from Utility import ConsoleLog
+
+iconSize = QSize(50, 50)    # Size of the icons drawn by FileCanvasItems
+uniqueIconFileTypes = [".exe", ".lnk", ".ico", ".url"]  # File types where each file can have a different icon. These are cached by path instead of extension
+
+fileIconService = None      # Shared FileIconService. This is created on first use (See GetFileIconService)
+
+
+def GetFileIconService():
+    """Returns the shared FileIconService"""
+    global fileIconService
+    if fileIconService == None:
+        fileIconService = FileIconService()
+    return fileIconService
+
+def GetIconKey(filePath: str):
+    """Get the key an icon is cached by. Files with the same extension share an icon, except for uniqueIconFileTypes, folders, and files without an extension."""
+    extension = os.path.splitext(filePath)[1].lower()
+    if extension == "" or extension in uniqueIconFileTypes:
+        return filePath
+    return extension
+
+
+class FileIconService(QObject):
+    def __init__(self) -> None:
+        """Provides cached, scaled file icons.
+
+            An icon that is not cached is returned as a generic file icon, and the real icon is resolved later.
+            When it is resolved, the callback passed to GetIcon is called with the icon.
+            QFileIconProvider creates QPixmaps, which can only be created on the GUI thread, so icons are resolved on the GUI thread in time limited batches.
+        """
+        super().__init__()
+
+        # Properties
+        self.iconProvider = QFileIconProvider()
+        self.icons = {}             # Icon key : QPixmap
+        self.pendingIcons = OrderedDict()  # Icon key : (filePath, callback weakrefs[]). Icons waiting to be resolved
+        self.genericIcon = None     # Icon returned while the real icon is resolved
+        self.resolveTimer = QTimer(self)
+        self.resolveTimer.setInterval(0)    # Resolve icons whenever the event loop is idle
+
+        # INIT
+        self.resolveTimer.timeout.connect(self.ResolvePendingIcons)
+
+    def GetIcon(self, filePath: str, callback = None):
+        """Get the icon of a file.
+
+        Args:
+            filePath (str): path to the file
+            callback (callable, optional): If the icon is not cached, this is called with the icon (QPixmap) once it is resolved. Only a weak reference is kept, so it should be a bound method.
+
+        Returns:
+            QPixmap: the cached icon, or a generic file icon if the icon is not resolved yet
+        """
+        key = GetIconKey(filePath)
+        if key in self.icons:
+            return self.icons[key]
+
+        if key not in self.pendingIcons:
+            self.pendingIcons[key] = (filePath, [])
+        if callback != None:
+            self.pendingIcons[key][1].append(weakref.WeakMethod(callback) if hasattr(callback, "__self__") else weakref.ref(callback))
+        self.resolveTimer.start()
+
+        return self.GetGenericIcon()
+
+    def GetGenericIcon(self):
+        """Returns the icon drawn until the real icon is resolved"""
+        if self.genericIcon == None:
+            self.genericIcon = self.ScaleIcon(self.iconProvider.icon(QAbstractFileIconProvider.File))
+        return self.genericIcon
+
+    def ScaleIcon(self, icon: QIcon):
+        """Get the pixmap of the icon at iconSize"""
+        pixmap = icon.pixmap(iconSize, QIcon.Normal, QIcon.On)
+        if not pixmap.isNull() and pixmap.size() != iconSize:     # Some icons do not have a pixmap at iconSize
+            pixmap = pixmap.scaled(iconSize, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        return pixmap
+
+    def ResolvePendingIcons(self):
+        """Resolve pending icons until fileIconResolveTime (settings.py) has passed, then continue on the next event loop"""
+        timer = QElapsedTimer()
+        timer.start()
+        while len(self.pendingIcons) > 0 and timer.elapsed() < fileIconResolveTime:
+            key, (filePath, callbacks) = self.pendingIcons.popitem(last=False)
+            try:
+                pixmap = self.ScaleIcon(self.iconProvider.icon(QFileInfo(filePath)))
+            except Exception:
+                ConsoleLog.error("Unable to access File Icon", str(filePath) + " - This path does not have a valid icon.")
+                pixmap = QPixmap()
+            if pixmap.isNull():
+                pixmap = self.GetGenericIcon()
+            self.icons[key] = pixmap
+
+            for callbackRef in callbacks:
+                callback = callbackRef()
+                if callback == None:    # The FileCanvasItem was deleted
+                    continue
+                try:
+                    callback(pixmap)
+                except RuntimeError:    # The FileCanvasItem's C++ object was deleted
+                    pass
+
+        if len(self.pendingIcons) == 0:
+            self.resolveTimer.stop()
@@ -0,0 +1,85 @@
+"""
+Description:    This python file provides cached file metadata (os.stat) for the files referenced by a project.
+                The files of a tab are stat'd in parallel before its CanvasItems are created, so slow drives (i.e. network shares) do not block the GUI.
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# Imports
+import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import monotonic
+
+from Settings.settings import *
+
+statCache = {}      # filePath : (time the file was stat'd, os.stat_result or None if the file does not exist)
+statCacheLock = Lock()  # The cache is written by background threads
+
+
+def StatFile(filePath: str):
+    """Stat a file and store the result in the cache
+
+    Returns:
+        os.stat_result: the result, or None if the file does not exist
+    """
+    try:
+        fileStat = os.stat(filePath)
+    except (OSError, ValueError):
+        fileStat = None
+
+    with statCacheLock:
+        statCache[filePath] = (monotonic(), fileStat)
+    return fileStat
+
+def StatFiles(filePaths):
+    """Stat files in parallel and store the results in the cache. This can be run on a background thread.
+
+    Args:
+        filePaths (str[]): paths of the files
+
+    Returns:
+        dict: filePath : os.stat_result, or None if the file does not exist
+    """
+    filePaths = list(set(filePaths))
+    if len(filePaths) == 0:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(fileStatWorkers, len(filePaths))) as executor:
+        return dict(zip(filePaths, executor.map(StatFile, filePaths)))
+
+def GetUncachedFiles(filePaths):
+    """Returns the paths that are not in the cache, or whose cached result is older than fileStatTTL (settings.py)"""
+    now = monotonic()
+    with statCacheLock:
+        return [filePath for filePath in filePaths if filePath not in statCache or now - statCache[filePath][0] > fileStatTTL]
+
+def GetFileStat(filePath: str):
+    """Get the stat of a file. The cached result is used if it is newer than fileStatTTL (settings.py)
+
+    Returns:
+        os.stat_result: the result, or None if the file does not exist
+    """
+    with statCacheLock:
+        cached = statCache.get(filePath)
+    if cached != None and monotonic() - cached[0] <= fileStatTTL:
+        return cached[1]
+    return StatFile(filePath)
+
+def FileExists(filePath: str):
+    """Check if a file exists, using the cached result if it is newer than fileStatTTL (settings.py)"""
+    return GetFileStat(filePath) != None
+
+def InvalidateFile(filePath: str):
+    """Remove a file from the cache, so it is stat'd again on next use (i.e. when the file changed)"""
+    with statCacheLock:
+        statCache.pop(filePath, None)
+
+def StatFilesRequest(requestID: int, filePaths):
+    """StatFiles, returning requestID with the result. Used to ignore results of requests that were replaced by a newer request.
+
+    Returns:
+        (int, dict): requestID, and filePath : os.stat_result or None
+    """
+    return requestID, StatFiles(filePaths)
@@ -0,0 +1,249 @@
+"""
+Description:    This python file provides perceptual hashes of images, used to find duplicate images in a project.
+                Images are hashed from their thumbnails in a process pool, and near-duplicate hashes are found with a multi-index hash, so every pair of images does not need to be compared.
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# --Imports--
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from itertools import combinations
+from threading import Event
+
+#PySide
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+from PySide6.QtCore import *
+
+# Custom Imports
+from Settings.settings import *
+from Utility import ConsoleLog
+from Utility.BackgroundTasks import RunInBackground
+from Utility.BulkImport import CreateWorkerPool
+from Utility.ImageLoader import DecodeThumbnail
+
+
+# ----- Hash Functions (Run on background threads and processes) -----
+def DifferenceHash(image: QImage):
+    """Get the difference hash (dHash) of an image. The image is scaled to 9x8 grayscale pixels, and each bit is set if a pixel is darker than the pixel to its right.
+    Resized, re-encoded, and slightly edited copies of an image have hashes that differ by only a few bits.
+
+    Returns:
+        int: 64 bit hash
+    """
+    small = image.scaled(9, 8, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation).convertToFormat(QImage.Format_Grayscale8)
+    pixels = bytes(small.constBits())
+    bytesPerLine = small.bytesPerLine()
+
+    imageHash = 0
+    for y in range(8):
+        row = pixels[y * bytesPerLine : y * bytesPerLine + 9]
+        for x in range(8):
+            imageHash = (imageHash << 1) | (row[x] < row[x + 1])
+    return imageHash
+
+def HashImage(imagePath: str, imageSize = None):
+    """Hash an image from its thumbnail (See ImageLoader.DecodeThumbnail). Run in a worker process, so only picklable values are passed and returned.
+
+    Args:
+        imagePath (str): path to the image
+        imageSize ((int, int), optional): width and height of the image, if it is known
+
+    Returns:
+        (str, str): imagePath, and the hash as a hex string (See FormatHash). The hash is None if the image can not be read.
+    """
+    thumbnail = DecodeThumbnail(imagePath, QSize(*imageSize) if imageSize != None else None)
+    if thumbnail.isNull():
+        return imagePath, None
+    return imagePath, FormatHash(DifferenceHash(thumbnail))
+
+def FormatHash(imageHash: int):
+    """Format a hash as a hex string. Hashes are stored as strings in the project, as JSON readers may not support 64 bit integers."""
+    return "%016x" % imageHash
+
+def HammingDistance(hashA: int, hashB: int):
+    """Get the number of bits that are different in two hashes"""
+    return bin(hashA ^ hashB).count("1")
+
+def IsImageHashStale(nodeData):
+    """Check if the image node is missing its hash, or the image changed since it was hashed"""
+    return nodeData.get("imageHash") == None or nodeData.get("imageHashModified") != nodeData.get("fileModified")
+
+
+# ----- Duplicate Clusters -----
+class MultiIndexHash:
+    chunkCount = 4  # Hashes are split into 4 chunks of 16 bits
+
+    def __init__(self, maxDistance: int) -> None:
+        """Index of 64 bit hashes, used to find the hashes within maxDistance bits of a hash.
+
+            Hashes are split into chunks, and each chunk is indexed by its value. If two hashes differ by at most maxDistance bits,
+            at least one of their chunks differs by at most maxDistance // chunkCount bits. A search looks up each chunk of the search hash with up to that many bits flipped,
+            so it only checks the hashes that have a nearly equal chunk, instead of every hash.
+            (A BK-tree visits most of its nodes for the distances used to find near-duplicate images, as random hashes differ by about 32 bits)
+
+        Args:
+            maxDistance (int): max number of bits that differ between the hashes found by Search
+        """
+        # Properties
+        self.maxDistance = maxDistance
+        self.chunkMask = (1 << (64 // self.chunkCount)) - 1
+        self.tables = [{} for i in range(self.chunkCount)]  # Chunk value : hashes, for each chunk
+        self.flipMasks = [0]    # Each combination of up to maxDistance // chunkCount bits in a chunk
+        for flipCount in range(1, min(maxDistance // self.chunkCount, 64 // self.chunkCount) + 1):
+            for bits in combinations(range(64 // self.chunkCount), flipCount):
+                self.flipMasks.append(sum(1 << bit for bit in bits))
+
+    def Add(self, imageHash: int):
+        for i, table in enumerate(self.tables):
+            table.setdefault((imageHash >> (i * 64 // self.chunkCount)) & self.chunkMask, []).append(imageHash)
+
+    def Search(self, imageHash: int):
+        """Get the hashes within maxDistance of imageHash, including imageHash if it was added"""
+        candidates = set()
+        for i, table in enumerate(self.tables):
+            chunk = (imageHash >> (i * 64 // self.chunkCount)) & self.chunkMask
+            for flipMask in self.flipMasks:
+                hashes = table.get(chunk ^ flipMask)
+                if hashes != None:
+                    candidates.update(hashes)
+        return [candidate for candidate in candidates if HammingDistance(imageHash, candidate) <= self.maxDistance]
+
+def FindDuplicateClusters(nodeHashes, maxDistance: int = duplicateImageDistance):
+    """Group images whose hashes differ by at most maxDistance bits. Images are grouped transitively (i.e. if A is near B, and B is near C, they are one cluster).
+
+    Args:
+        nodeHashes (dict): nodeID : hash hex string
+        maxDistance (int, optional): max number of different bits. Defaults to duplicateImageDistance (settings.py).
+
+    Returns:
+        list: clusters of nodeIDs. Only clusters with more than one node are returned.
+    """
+    hashNodes = {}  # hash : nodeIDs. Exact duplicates share a hash, so they are only added to the index once
+    for nodeID, hashText in nodeHashes.items():
+        hashNodes.setdefault(int(hashText, 16), []).append(nodeID)
+
+    index = MultiIndexHash(maxDistance)
+    for imageHash in hashNodes:
+        index.Add(imageHash)
+
+    # Union-find of hashes that are near each other
+    parents = {imageHash: imageHash for imageHash in hashNodes}
+    def FindRoot(imageHash):
+        while parents[imageHash] != imageHash:
+            parents[imageHash] = parents[parents[imageHash]]
+            imageHash = parents[imageHash]
+        return imageHash
+
+    for imageHash in hashNodes:
+        for nearHash in index.Search(imageHash):
+            rootA, rootB = FindRoot(imageHash), FindRoot(nearHash)
+            if rootA != rootB:
+                parents[rootB] = rootA
+
+    clusters = {}
+    for imageHash, nodeIDs in hashNodes.items():
+        clusters.setdefault(FindRoot(imageHash), []).extend(nodeIDs)
+    return [nodeIDs for nodeIDs in clusters.values() if len(nodeIDs) > 1]
+
+
+class ImageHashTask(QObject):
+    Progress = Signal(int, int)     # Emits the number of hashed images, and the total number of images
+    Hashed = Signal(dict)           # Emits nodeID : hash for each image that was hashed. Not emitted if the task is cancelled.
+
+    def __init__(self, imageNodes, parent = None) -> None:
+        """Hashes images on a background thread, and displays the progress. Uses the same worker pools as Utility/BulkImport.py.
+
+        Args:
+            imageNodes ((str, str, (int, int))[]): nodeID, imagePath, and image size of each image to hash
+            parent (QWidget, optional): parent of the progress dialog
+        """
+        super().__init__(parent)
+
+        # Properties
+        self.imageNodes = list(imageNodes)
+        self.cancelled = Event()    # Set from the GUI thread, read by the hash thread
+
+        # Progress Dialog
+        self.progressDialog = QProgressDialog("Finding duplicate images...", "Cancel", 0, 0, parent)
+        self.progressDialog.setWindowModality(Qt.WindowModal)
+        self.progressDialog.setMinimumDuration(bulkImportDialogDelay)
+        self.progressDialog.canceled.connect(self.Cancel)
+
+        # Signals
+        self.Progress.connect(self.ProgressChanged)
+
+    def Start(self):
+        """Start hashing on a background thread"""
+        RunInBackground(self.Run, onFinished = self.Finished, onFailed = self.Failed)
+
+    def Cancel(self):
+        self.cancelled.set()
+
+    def Run(self):
+        """Hash the images. Run on a background thread.
+
+        Returns:
+            dict: nodeID : hash hex string, for each image that could be read. None if the task was cancelled.
+        """
+        try:
+            pathHashes = self.HashImages(ProcessPoolExecutor if len(self.imageNodes) >= bulkImportProcessThreshold else ThreadPoolExecutor)
+        except BrokenProcessPool:   # i.e. worker processes can not be started
+            ConsoleLog.warning("Image Hash", "Unable to use worker processes, hashing images on threads instead.")
+            pathHashes = self.HashImages(ThreadPoolExecutor)
+
+        if pathHashes == None:
+            return None
+        return {nodeID: pathHashes[imagePath] for nodeID, imagePath, imageSize in self.imageNodes if pathHashes.get(imagePath) != None}
+
+    def HashImages(self, executorType):
+        """Hash the images in parallel. Nodes with the same image path are only hashed once.
+
+        Returns:
+            dict: imagePath : hash hex string or None. None if the task was cancelled.
+        """
+        imageSizes = {imagePath: imageSize for nodeID, imagePath, imageSize in self.imageNodes}
+        pathHashes = {}
+        self.Progress.emit(0, len(imageSizes))
+        if len(imageSizes) == 0:
+            return pathHashes
+
+        executor = CreateWorkerPool(executorType)
+        try:
+            futures = [executor.submit(HashImage, imagePath, imageSize) for imagePath, imageSize in imageSizes.items()]
+            for completed, future in enumerate(as_completed(futures), 1):
+                if self.cancelled.is_set():
+                    return None
+                try:
+                    imagePath, imageHash = future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as error:
+                    ConsoleLog.error("Image Hash", "Unable to hash image: " + str(error))
+                else:
+                    pathHashes[imagePath] = imageHash
+                self.Progress.emit(completed, len(imageSizes))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return pathHashes
+
+    # ----- Events (Called on the GUI thread) -----
+    def ProgressChanged(self, completed: int, total: int):
+        self.progressDialog.setMaximum(total)
+        self.progressDialog.setValue(completed)
+
+    def Finished(self, hashes):
+        """Called when Run finishes. Emits Hashed, unless the task was cancelled."""
+        self.progressDialog.reset()
+        self.progressDialog.deleteLater()
+        if hashes != None and not self.cancelled.is_set():
+            self.Hashed.emit(hashes)
+        self.deleteLater()
+
+    def Failed(self, error):
+        """Called if Run raises an exception. The error is logged by the background task."""
+        self.progressDialog.reset()
+        self.progressDialog.deleteLater()
+        self.deleteLater()
@@ -0,0 +1,191 @@
+"""
+Description: This python file provides image decoding for ImageCanvasItems.
+             Images are decoded directly to the resolution they are displayed at, using QImageReader's scaled decoding (i.e. JPEG DCT scaling).
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# Imports
+import os
+from collections import OrderedDict
+from math import ceil
+
+from PySide6.QtGui import *
+from PySide6.QtCore import *
+
+decodeScales = [1, 1/2, 1/4, 1/8]    # Scales images are decoded at. JPEG images can be decoded at these scales without decoding the full image
+displayFormats = [QImage.Format_ARGB32_Premultiplied, QImage.Format_RGB32]  # Formats the raster paint engine draws without converting
+animatedFileTypes = [".gif", ".webp"]   # Image types that can contain multiple frames
+thumbnailSize = 256     # pixels. Max width and height of thumbnails
+thumbnailLimit = 2048   # Max number of thumbnails kept in memory
+
+thumbnails = OrderedDict()  # (imagePath, fileModified) : QImage. Thumbnails are drawn until the image is decoded. Least recently used thumbnails are removed first.
+
+
+def ReadImageSize(imagePath: str):
+    """Read the full resolution size of an image, without decoding the image
+
+    Returns:
+        QSize: size of the image. If the image can not be read, the size is invalid.
+    """
+    return QImageReader(imagePath).size()
+
+def GetDecodeScale(requiredScale: float):
+    """Get the smallest decode scale that has at least the required resolution
+
+    Args:
+        requiredScale (float): screen pixels per image pixel that the image is displayed at
+
+    Returns:
+        float: scale from decodeScales
+    """
+    for scale in reversed(decodeScales):
+        if scale >= requiredScale:
+            return scale
+    return decodeScales[0]
+
+def GetScaledSize(imageSize: QSize, scale: float):
+    """Get the size of the image decoded at scale"""
+    return QSize(max(1, ceil(imageSize.width() * scale)), max(1, ceil(imageSize.height() * scale)))
+
+def PrepareImage(image: QImage):
+    """Convert an image to a format that can be drawn without converting it on every paint (i.e. indexed PNGs and 24-bit RGB images).
+    Opaque images are converted to RGB32, other images to ARGB32_Premultiplied. This can be run on a background thread.
+
+    Returns:
+        QImage: the converted image
+    """
+    if image.isNull() or image.format() in displayFormats:
+        return image
+    if image.hasAlphaChannel():
+        return image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+    return image.convertToFormat(QImage.Format_RGB32)
+
+def DecodeImage(imagePath: str, imageSize: QSize = None, scale: float = 1):
+    """Decode an image. This can be run on a background thread.
+    Very large images are decoded in tiles instead (See UI_Components/Canvas/CanvasUtility/TiledImage.py).
+
+    Args:
+        imagePath (str): path to the image
+        imageSize (QSize, optional): full resolution size of the image. Read from the file if not passed.
+        scale (float, optional): scale to decode the image at. Defaults to 1 (full resolution).
+
+    Returns:
+        (QImage, float): the decoded image converted with PrepareImage, and the scale it was decoded at. The image is null if it could not be decoded.
+    """
+    reader = QImageReader(imagePath)
+    if imageSize == None:
+        imageSize = reader.size()
+
+    if scale < 1 and imageSize.isValid():   # Decode straight to the scaled size, instead of decoding the full image and scaling it
+        reader.setScaledSize(GetScaledSize(imageSize, scale))
+    else:
+        scale = 1
+
+    return PrepareImage(reader.read()), scale
+
+def IsAnimated(imagePath: str):
+    """Check if an image has multiple frames, without decoding the image"""
+    if os.path.splitext(imagePath)[1].lower() not in animatedFileTypes:
+        return False
+    reader = QImageReader(imagePath)
+    return reader.supportsAnimation() and reader.imageCount() != 1
+
+def DecodeAnimation(imagePath: str, imageSize: QSize = None, scale: float = 1, frameLimit: int = 512):
+    """Decode every frame of an animated image. This can be run on a background thread.
+
+    Args:
+        imagePath (str): path to the image
+        imageSize (QSize, optional): full resolution size of the image. Read from the file if not passed.
+        scale (float, optional): scale to decode the frames at. Defaults to 1 (full resolution).
+        frameLimit (int, optional): max number of frames to decode. Defaults to 512.
+
+    Returns:
+        (QImage, int)[]: each frame converted with PrepareImage, and the time in ms it is displayed for
+    """
+    reader = QImageReader(imagePath)
+    if imageSize == None:
+        imageSize = reader.size()
+    if scale < 1 and imageSize.isValid():
+        reader.setScaledSize(GetScaledSize(imageSize, scale))
+
+    frames = []
+    while reader.canRead() and len(frames) < frameLimit:
+        frame = reader.read()
+        if frame.isNull():
+            break
+        delay = reader.nextImageDelay()
+        frames.append((PrepareImage(frame), delay if delay > 10 else 100))  # Very short delays are displayed at 100ms, as in web browsers
+    return frames
+
+def DecodeThumbnail(imagePath: str, imageSize: QSize = None):
+    """Decode an image scaled to fit within thumbnailSize. This can be run on a background thread or process.
+
+    Returns:
+        QImage: the thumbnail converted with PrepareImage. The image is null if it could not be decoded.
+    """
+    reader = QImageReader(imagePath)
+    if imageSize == None:
+        imageSize = reader.size()
+    if imageSize.width() > thumbnailSize or imageSize.height() > thumbnailSize:
+        reader.setScaledSize(imageSize.scaled(thumbnailSize, thumbnailSize, Qt.AspectRatioMode.KeepAspectRatio))
+    return PrepareImage(reader.read())
+
+def ImageToBytes(image: QImage):
+    """Convert an image to a tuple that can be sent between processes. See ImageFromBytes.
+
+    Returns:
+        (int, int, int, bool, bytes): width, height, bytes per line, if the image has an alpha channel, and the pixel data
+    """
+    image = PrepareImage(image)
+    return (image.width(), image.height(), image.bytesPerLine(), image.hasAlphaChannel(), bytes(image.constBits()))
+
+def ImageFromBytes(imageData):
+    """Create an image from the tuple returned by ImageToBytes"""
+    width, height, bytesPerLine, hasAlpha, data = imageData
+    imageFormat = QImage.Format_ARGB32_Premultiplied if hasAlpha else QImage.Format_RGB32
+    return QImage(data, width, height, bytesPerLine, imageFormat).copy()    # Copy, so the image does not reference data
+
+def AddThumbnail(imagePath: str, fileModified: float, thumbnail: QImage):
+    """Store the thumbnail of an image. fileModified is the image's modified time, so thumbnails of changed images are not used."""
+    if thumbnail.isNull():
+        return
+    thumbnails[(imagePath, fileModified)] = thumbnail
+    while len(thumbnails) > thumbnailLimit:
+        thumbnails.popitem(last=False)
+
+def GetThumbnail(imagePath: str, fileModified: float):
+    """Get the stored thumbnail of an image
+
+    Returns:
+        QImage: the thumbnail, or None if the image does not have a thumbnail
+    """
+    key = (imagePath, fileModified)
+    if key not in thumbnails:
+        return None
+    thumbnails.move_to_end(key)
+    return thumbnails[key]
+
+def CreatePreviewImage(image: QImage, previewSize: int):
+    """Get a low resolution copy of an image, which fits within previewSize. This can be run on a background thread.
+
+    Returns:
+        QImage: the scaled copy, or image if it already fits
+    """
+    if image.width() > previewSize or image.height() > previewSize:
+        return image.scaled(previewSize, previewSize, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    return image
+
+def DecodeImageRequest(requestID: int, imagePath: str, imageSize: QSize = None, scale: float = 1, previewSize: int = None):
+    """DecodeImage, returning requestID with the result. Used to ignore results of decodes that were replaced by a newer request.
+
+    Args:
+        previewSize (int, optional): If passed, a preview of the image is also created (See CreatePreviewImage), so it is not scaled on the GUI thread.
+
+    Returns:
+        (int, QImage, float, QImage): requestID, the decoded image, the scale it was decoded at, and the preview image (None if previewSize was not passed).
+    """
+    image, scale = DecodeImage(imagePath, imageSize, scale)
+    previewImage = CreatePreviewImage(image, previewSize) if previewSize != None and not image.isNull() else None
+    return requestID, image, scale, previewImage
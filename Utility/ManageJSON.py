@@ -8,8 +8,7 @@ Date Updated: 10/17/22
 
 # Imports
 import json
-from jsonschema import validate, exceptions
-from os import path
+from os import path, stat
 from time import time
 from collections import OrderedDict
 
@@ -30,6 +29,8 @@ def LoadJSON(fileLocation, createNewProjectOnFail = True):
     Return:
         Returns the data as a Python Object. 
     """
+    from jsonschema import exceptions   # jsonschema is imported on first use, to reduce startup time
+
     try:
         with open(fileLocation) as f:
             JSON_Data = json.load(f)
@@ -131,18 +132,19 @@ def CreateTabData(tabName: str, tabID:str, canvasItems, viewportPos = [2500,2500
     return tab
 
 
-def CreateImageData(imagePath, nodeName = "Image_Node"):
+def CreateImageData(imagePath, nodeName = "Image_Node", metadata = None):
     """Create data for a new image
 
     Args:
         imagePath (_type_): path to the image
         nodeName (str, optional): name of the node. Defaults to "Image_Node".
+        metadata (dict, optional): image metadata, if it was already read (See GetImageMetadata). Defaults to None.
 
     Raises:
         Exception: If the path does not exist, it will not create the data.
 
     Returns:
-        dict: returns a dictionary of nodeType, nodeName, nodeID,  creationTime, and imagePath
+        dict: returns a dictionary of nodeType, nodeName, nodeID,  creationTime, imagePath, and the image metadata (See GetImageMetadata)
     """
     if path.exists(imagePath):
         node = {
@@ -153,12 +155,82 @@ def CreateImageData(imagePath, nodeName = "Image_Node"):
             "canvasItemReferences": [],
             "imagePath": imagePath
         }
+        node.update(metadata if metadata != None else GetImageMetadata(imagePath))
         return node
 
     else:
         ConsoleLog.error("CreateFileNode: Invalid Path", str(imagePath) + " does not exist.")
         raise Exception("CreateImageNode: Invalid Path")
 
+def GetImageMetadata(imagePath):
+    """Get the metadata stored in image nodes. The image is not decoded, only its header is read.
+
+    Args:
+        imagePath (str): path to the image
+
+    Returns:
+        dict: returns a dictionary of imageWidth, imageHeight, fileSize, and fileModified. If the image can not be read, the width and height are -1.
+    """
+    from Utility.ImageLoader import ReadImageSize   # ImageLoader is imported on first use, to reduce startup time
+    imageSize = ReadImageSize(imagePath)
+    try:
+        fileStat = stat(imagePath)
+        fileSize, fileModified = fileStat.st_size, fileStat.st_mtime
+    except OSError:
+        fileSize, fileModified = -1, -1
+
+    return {
+        "imageWidth": imageSize.width(),
+        "imageHeight": imageSize.height(),
+        "fileSize": fileSize,
+        "fileModified": fileModified
+    }
+
+def GetImageNodeSize(nodeData):
+    """Get the full resolution size of the image from the image node. Nodes from older projects are backfilled with the image metadata.
+
+    Args:
+        nodeData (dict): image node
+
+    Returns:
+        QSize: size of the image
+    """
+    if "imageWidth" not in nodeData or "imageHeight" not in nodeData:
+        nodeData.update(GetImageMetadata(nodeData["imagePath"]))
+    return QSize(nodeData["imageWidth"], nodeData["imageHeight"])
+
+def IsImageMetadataStale(nodeData):
+    """Check if the image file changed since the image metadata was stored, by comparing the file size and modified time.
+
+    Args:
+        nodeData (dict): image node
+
+    Returns:
+        bool: True if the metadata is missing or the file has changed
+    """
+    if "fileSize" not in nodeData or "fileModified" not in nodeData or "imageWidth" not in nodeData:
+        return True
+    try:
+        fileStat = stat(nodeData["imagePath"])
+    except OSError:
+        return nodeData["fileSize"] != -1
+    return fileStat.st_size != nodeData["fileSize"] or fileStat.st_mtime != nodeData["fileModified"]
+
+def CollectImageMetadata(imageNodes):
+    """Get the metadata of image nodes that are missing metadata or have changed. This can be run on a background thread.
+
+    Args:
+        imageNodes (list): list of (nodeID, nodeData copy) for each image node
+
+    Returns:
+        dict: nodeID : new metadata, for each node that needs to be updated
+    """
+    updates = {}
+    for nodeID, nodeData in imageNodes:
+        if IsImageMetadataStale(nodeData):
+            updates[nodeID] = GetImageMetadata(nodeData["imagePath"])
+    return updates
+
 def CreateTextData(text, nodeName = "Text_Node"):
     """Create data for a new Text Item
 
@@ -222,6 +294,11 @@ def NewProjectData(projectName, selectedTab, canvasSize, tabs, nodes):
 
 # ----- Save JSON -----
 def SaveJSON(JSON_DATA, saveLocation = None):
+    """Save the project data to a JSON file
+
+    Returns:
+        bool: If the project was saved
+    """
     newJSON = {
         "Project": JSON_DATA
     }
@@ -230,12 +307,52 @@ def SaveJSON(JSON_DATA, saveLocation = None):
         f = open(saveLocation, "w+")
         f.write(json.dumps(newJSON, indent=4))
         f.close()
+        return True
     except:
         ConsoleLog.error("Error Reading JSON", "Unable to read JSON file at " + saveLocation + ".")
+        return False
+
+def GetAutosaveLocation(saveLocation):
+    """Get the location of a project's autosave file. Autosaves are written next to the project, so the project file is only written when the user saves it."""
+    root, extension = path.splitext(saveLocation)
+    return root + ".autosave" + (extension if extension != "" else ".json")
+
+
+# ----- Application State -----
+appStateLocation = "Data/appState.json"    # Stores data that persists between sessions (i.e. the last opened project)
+
+def LoadAppState():
+    """Load the application state. 
+
+    Returns:
+        dict: the application state. If the file does not exist or is invalid, an empty dictionary is returned.
+    """
+    try:
+        with open(appStateLocation) as f:
+            appState = json.load(f)
+            if type(appState) == dict:
+                return appState
+    except (IOError, ValueError):
+        pass
+    return {}
+
+def SaveAppState(appState):
+    """Save the application state
+
+    Args:
+        appState (dict): data that will be saved
+    """
+    try:
+        with open(appStateLocation, "w+") as f:
+            f.write(json.dumps(appState, indent=4))
+    except:
+        ConsoleLog.error("Error Saving App State", "Unable to write app state to " + appStateLocation + ".")
 
 
 # ----- Validate JSON -----
 def ValidateJSON(JSON_DATA):
+    from jsonschema import validate     # jsonschema is imported on first use, to reduce startup time
+
     schema = {
         "type":"object",
         "properties":{           
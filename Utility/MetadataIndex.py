@@ -0,0 +1,211 @@
+"""
+Description:    This python file provides the tag and metadata index of a project's nodes, and the filters used to dim or hide CanvasItems.
+                Tags, node types, and file extensions map to the nodes that have them, so a filter only checks the nodes in the smallest matching set.
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# --Imports--
+import os
+import re
+from datetime import datetime
+from math import inf
+
+# Custom Imports
+from Utility import ConsoleLog
+
+
+nodeTypeNames = {"Image_Node": "image", "Text_Node": "text", "File_Node": "file"}   # Names of the node types used in filters (i.e. type:image)
+rangeFields = {"width": "imageWidth", "height": "imageHeight", "created": "creationTime"}  # Fields that can be compared in filters (i.e. width>1000)
+rangeTermPattern = re.compile(r"^(\w+)([<>])(.+)$")
+
+
+def GetNodeTags(nodeData):
+    """Get the tags of a node. Tags are stored in lowercase."""
+    return nodeData.get("nodeTags", [])
+
+def SetNodeTags(nodeData, tags):
+    """Set the tags of a node. Tags are stripped, stored in lowercase, and duplicates are removed.
+
+    Args:
+        nodeData (dict): data of the node
+        tags (str[]): new tags. If empty, the tags are removed from the node data.
+    """
+    tags = list(dict.fromkeys(tag.strip().lower() for tag in tags if tag.strip() != ""))
+    if len(tags) > 0:
+        nodeData["nodeTags"] = tags
+    else:
+        nodeData.pop("nodeTags", None)
+
+def GetNodeMetadata(nodeData):
+    """Get the values of a node used by filters
+
+    Returns:
+        dict: type, extension, tags, and the values of rangeFields (None if the node does not have them)
+    """
+    filePath = nodeData.get("imagePath", nodeData.get("filePath", ""))
+    metadata = {
+        "type": nodeTypeNames.get(nodeData["nodeType"], nodeData["nodeType"].lower()),
+        "extension": os.path.splitext(filePath)[1].lower(),
+        "tags": set(GetNodeTags(nodeData))
+    }
+    for name, field in rangeFields.items():
+        value = nodeData.get(field)
+        metadata[name] = value if value != None and value >= 0 else None    # Unreadable images have a size of -1
+    return metadata
+
+
+class MetadataFilter:
+    def __init__(self, query: str) -> None:
+        """Filter parsed from a query. Every term of the query must match.
+
+            Terms:
+                tag:name, #name, or name     node has the tag
+                type:image, type:text, type:file
+                ext:png                      file or image has the extension
+                width>1000, height<500       image size in pixels
+                created>2024-01-31           node was created after (or before) the date
+
+        Args:
+            query (str): filter query. Terms are separated by spaces.
+        """
+        # Properties
+        self.query = query.strip()
+        self.setTerms = []      # (index name, value). Matching nodes are looked up in the index
+        self.rangeTerms = []    # (metadata name, comparison, value). Checked for each node
+
+        for term in self.query.lower().split():
+            self.ParseTerm(term)
+
+    def isEmpty(self):
+        return len(self.setTerms) == 0 and len(self.rangeTerms) == 0
+
+    def ParseTerm(self, term: str):
+        """Add a query term to the filter. Invalid terms are ignored."""
+        rangeTerm = rangeTermPattern.match(term)
+        if rangeTerm != None and rangeTerm.group(1) in rangeFields:
+            name, comparison, value = rangeTerm.groups()
+            try:
+                value = datetime.fromisoformat(value).timestamp() if name == "created" else float(value)
+            except ValueError:
+                ConsoleLog.warning("Invalid Filter", "[" + term + "] does not have a valid value.")
+                return
+            self.rangeTerms.append((name, comparison, value))
+
+        elif term.startswith("type:"):
+            self.setTerms.append(("types", term[5:]))
+        elif term.startswith("ext:"):
+            self.setTerms.append(("extensions", "." + term[4:].lstrip(".")))
+        elif term.startswith("tag:"):
+            self.setTerms.append(("tags", term[4:]))
+        else:
+            self.setTerms.append(("tags", term.lstrip("#")))
+
+    def MatchesRange(self, metadata):
+        """Check the range terms against the metadata of a node (See GetNodeMetadata)"""
+        for name, comparison, value in self.rangeTerms:
+            nodeValue = metadata[name]
+            if nodeValue == None or (nodeValue <= value if comparison == ">" else nodeValue >= value):
+                return False
+        return True
+
+
+class MetadataIndex:
+    def __init__(self) -> None:
+        """Index from tags, node types, and file extensions to the nodes that have them"""
+        # Properties
+        self.nodeMetadata = {}  # nodeID : metadata (See GetNodeMetadata)
+        self.tags = {}          # tag : set of nodeIDs
+        self.types = {}         # type : set of nodeIDs
+        self.extensions = {}    # extension : set of nodeIDs
+        self.rangeValues = {name: {} for name in rangeFields}   # name : {nodeID : value}, for the nodes that have the value
+
+    # ----- Update -----
+    def AddNodes(self, nodeHashTable):
+        """Index every node in nodeHashTable"""
+        for nodeID, nodeData in nodeHashTable.items():
+            self.UpdateNode(nodeID, nodeData)
+
+    def UpdateNode(self, nodeID: str, nodeData):
+        """Index a new or changed node"""
+        self.RemoveNode(nodeID)
+        metadata = GetNodeMetadata(nodeData)
+        self.nodeMetadata[nodeID] = metadata
+        self.types.setdefault(metadata["type"], set()).add(nodeID)
+        self.extensions.setdefault(metadata["extension"], set()).add(nodeID)
+        for tag in metadata["tags"]:
+            self.tags.setdefault(tag, set()).add(nodeID)
+        for name in rangeFields:
+            if metadata[name] != None:
+                self.rangeValues[name][nodeID] = metadata[name]
+
+    def RemoveNode(self, nodeID: str):
+        """Remove a node from the index"""
+        metadata = self.nodeMetadata.pop(nodeID, None)
+        if metadata == None:
+            return
+
+        self.types[metadata["type"]].discard(nodeID)
+        self.extensions[metadata["extension"]].discard(nodeID)
+        for values in self.rangeValues.values():
+            values.pop(nodeID, None)
+        for tag in metadata["tags"]:
+            self.tags[tag].discard(nodeID)
+            if len(self.tags[tag]) == 0:
+                del self.tags[tag]
+
+    def GetTags(self):
+        """Get every tag used in the project, sorted by name"""
+        return sorted(self.tags)
+
+    # ----- Filter -----
+    def Filter(self, metadataFilter: MetadataFilter, nodeIDs):
+        """Get the nodes that match the filter
+
+        Args:
+            metadataFilter (MetadataFilter): filter to apply
+            nodeIDs (iterable): nodes to check (i.e. the nodes of the selected tab)
+
+        Returns:
+            set: nodeIDs of the matching nodes
+        """
+        nodeSets = [getattr(self, indexName).get(value, set()) for indexName, value in metadataFilter.setTerms]
+        matches = set(nodeIDs)
+        for nodeSet in sorted(nodeSets, key=len):   # Intersecting the smallest sets first keeps the intermediate sets small
+            matches = matches & nodeSet     # Iterates the smaller of the two sets
+            if len(matches) == 0:
+                return matches
+
+        for name, comparison, value in metadataFilter.rangeTerms:   # Each comparison is checked in its own pass, instead of calling MatchesRange for each node
+            values = self.rangeValues[name]
+            if comparison == ">":
+                matches = {nodeID for nodeID in matches if values.get(nodeID, -inf) > value}  # Nodes without the value do not match
+            else:
+                matches = {nodeID for nodeID in matches if values.get(nodeID, inf) < value}
+        return matches
+
+    def Matches(self, metadataFilter: MetadataFilter, nodeID: str):
+        """Check if a single node matches the filter (i.e. a CanvasItem added while the filter is applied)"""
+        metadata = self.nodeMetadata.get(nodeID)
+        if metadata == None:
+            return False
+        for indexName, value in metadataFilter.setTerms:
+            if nodeID not in getattr(self, indexName).get(value, ()):
+                return False
+        return metadataFilter.MatchesRange(metadata)
+
+
+def BuildMetadataIndexRequest(requestID: int, nodeHashTable):
+    """Create the metadata index of a project's nodes on a background thread, and return the requestID, so indexes of previously loaded projects can be ignored.
+
+    Args:
+        requestID (int): ID of the request
+        nodeHashTable (dict): nodeID : node data. A copy should be passed, as the project can be edited while the index is built.
+
+    Returns:
+        (int, MetadataIndex): requestID and the index of the nodes
+    """
+    metadataIndex = MetadataIndex()
+    metadataIndex.AddNodes(nodeHashTable)
+    return requestID, metadataIndex
@@ -0,0 +1,144 @@
+"""
+Description:    This python file provides the search index of a project's nodes.
+                The text of text nodes, node names, and file and image names are indexed by trigram, so substring searches only check nodes that contain the search's trigrams.
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# --Imports--
+import os
+
+
+def GetSearchText(nodeData):
+    """Get the searchable text of a node: the node name, the text of text nodes, and the name of the file of image and file nodes.
+    Default node names (i.e. "Image_Node") are the node type, so they are not searchable, as they would match every node of that type.
+
+    Returns:
+        str: lowercase text of the node
+    """
+    fields = []
+    if nodeData.get("nodeName", "") != nodeData["nodeType"]:
+        fields.append(nodeData.get("nodeName", ""))
+    if nodeData["nodeType"] == "Text_Node":
+        fields.append(nodeData.get("nodeText", ""))
+    elif nodeData["nodeType"] == "Image_Node":
+        fields.append(os.path.basename(nodeData.get("imagePath", "")))
+    elif nodeData["nodeType"] == "File_Node":
+        fields.append(os.path.basename(nodeData.get("filePath", "")))
+    return "\n".join(fields).lower()
+
+def GetTrigrams(text: str):
+    """Get every 3 character substring of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    def __init__(self) -> None:
+        """Inverted index from trigrams to the nodes that contain them.
+
+            A search gets the nodes that contain every trigram of the search text, starting from the rarest trigram, then checks that the text contains the search.
+            Searches shorter than 3 characters check the text of every node, stopping once enough results are found.
+        """
+        # Properties
+        self.nodeText = {}  # nodeID : lowercase searchable text (See GetSearchText)
+        self.trigrams = {}  # trigram : set of nodeIDs
+
+    def __len__(self):
+        return len(self.nodeText)
+
+    # ----- Update -----
+    def AddNodes(self, nodeHashTable):
+        """Index every node in nodeHashTable. This can be run on a background thread, if the index is not used until it finishes."""
+        for nodeID, nodeData in nodeHashTable.items():
+            self.UpdateNode(nodeID, nodeData)
+
+    def UpdateNode(self, nodeID: str, nodeData):
+        """Index a new or changed node. Only the trigrams that were added or removed from the node's text are updated."""
+        text = GetSearchText(nodeData)
+        oldText = self.nodeText.get(nodeID)
+        if text == oldText:
+            return
+
+        oldTrigrams = GetTrigrams(oldText) if oldText != None else set()
+        newTrigrams = GetTrigrams(text)
+        self.RemoveTrigrams(nodeID, oldTrigrams - newTrigrams)
+        for trigram in newTrigrams - oldTrigrams:
+            self.trigrams.setdefault(trigram, set()).add(nodeID)
+        self.nodeText[nodeID] = text
+
+    def RemoveNode(self, nodeID: str):
+        """Remove a node from the index"""
+        text = self.nodeText.pop(nodeID, None)
+        if text != None:
+            self.RemoveTrigrams(nodeID, GetTrigrams(text))
+
+    def RemoveTrigrams(self, nodeID: str, trigrams):
+        for trigram in trigrams:
+            nodeIDs = self.trigrams.get(trigram)
+            if nodeIDs != None:
+                nodeIDs.discard(nodeID)
+                if len(nodeIDs) == 0:
+                    del self.trigrams[trigram]
+
+    # ----- Search -----
+    def Search(self, query: str, limit: int = None):
+        """Find the nodes whose text contains query. The search is not case sensitive.
+
+        Args:
+            query (str): text to search for
+            limit (int, optional): max number of results. Defaults to no limit.
+
+        Returns:
+            str[]: nodeIDs of the matching nodes. Of the nodes found, nodes whose text starts with query are first.
+        """
+        query = query.lower().strip()
+        if query == "":
+            return []
+
+        if len(query) < 3:
+            candidates = self.nodeText.keys()
+        else:
+            postings = []
+            for trigram in GetTrigrams(query):
+                nodeIDs = self.trigrams.get(trigram)
+                if nodeIDs == None:     # No node contains this trigram
+                    return []
+                postings.append(nodeIDs)
+            postings.sort(key=len)
+            otherPostings = postings[1:]
+            candidates = (nodeID for nodeID in postings[0] if all(nodeID in nodeIDs for nodeIDs in otherPostings))   # Checked lazily, so the search stops at limit
+
+        prefixMatches, matches = [], []
+        for nodeID in candidates:
+            text = self.nodeText[nodeID]
+            if text.startswith(query):
+                prefixMatches.append(nodeID)
+            elif query in text:
+                matches.append(nodeID)
+            if limit != None and len(prefixMatches) + len(matches) >= limit:
+                break
+
+        return prefixMatches + matches
+
+
+def BuildSearchIndex(nodeHashTable):
+    """Create the search index of a project's nodes. Run on a background thread.
+
+    Args:
+        nodeHashTable (dict): nodeID : node data. A copy should be passed, as the project can be edited while the index is built.
+
+    Returns:
+        SearchIndex: index of the nodes
+    """
+    searchIndex = SearchIndex()
+    searchIndex.AddNodes(nodeHashTable)
+    return searchIndex
+
+def BuildSearchIndexRequest(requestID: int, nodeHashTable):
+    """Create the search index on a background thread, and return the requestID, so indexes of previously loaded projects can be ignored.
+
+    Returns:
+        (int, SearchIndex): requestID and the index of the nodes
+    """
+    return requestID, BuildSearchIndex(nodeHashTable)
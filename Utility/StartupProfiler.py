@@ -0,0 +1,99 @@
+"""
+Description: This python file records how long the software takes to start.
+             Every module imported during startup is timed, and a report is written to the startup report file, so import-time regressions are visible.
+
+Date Created: 10/19/26
+Date Updated: 10/19/26
+"""
+
+# Imports - Only the standard library is imported, so the profiler can be started before PySide6 is imported.
+import builtins
+import sys
+from datetime import datetime
+from time import perf_counter
+
+startupReportLocation = "Data/startupReport.log"
+maxReportedModules = 30     # Number of the slowest modules written to the report
+
+# Properties
+startTime = perf_counter()  # Time that the profiler was first imported. Used as the start of the software
+importTimes = {}            # Module name : (inclusive import time in seconds, import depth)
+phaseTimes = []             # List of (phase name, seconds since startTime)
+importDepth = 0
+originalImport = builtins.__import__
+
+
+def TimedImport(name, globals=None, locals=None, fromlist=(), level=0):
+    """Replacement for builtins.__import__ that records how long each new module takes to import."""
+    global importDepth
+
+    if level != 0 or name in sys.modules:   # Already imported modules and relative imports are not timed
+        return originalImport(name, globals, locals, fromlist, level)
+
+    depth = importDepth
+    importDepth += 1
+    start = perf_counter()
+    try:
+        return originalImport(name, globals, locals, fromlist, level)
+    finally:
+        importDepth -= 1
+        importTimes[name] = (perf_counter() - start, depth)
+
+def Start():
+    """Start timing imports. This should be called before any other software module is imported."""
+    builtins.__import__ = TimedImport
+
+def Stop():
+    """Stop timing imports"""
+    builtins.__import__ = originalImport
+
+def MarkPhase(name: str):
+    """Record the time a startup phase finished at
+
+    Args:
+        name (str): name of the startup phase. (i.e. "Window shown")
+    """
+    phaseTimes.append((name, perf_counter() - startTime))
+
+def GetTotalImportTime():
+    """Returns the total time (seconds) spent importing modules. Only top level imports are counted, as nested imports are included in their time."""
+    return sum(importTime for importTime, depth in importTimes.values() if depth == 0)
+
+def WriteReport():
+    """Stop timing imports and write the startup report.
+
+    A summary is also logged to the software log, so startup times can be compared between runs.
+    """
+    from Settings.settings import startupImportBudget
+    from Utility import ConsoleLog
+
+    Stop()
+    totalImportTime = GetTotalImportTime()
+
+    lines = ["Startup Report - " + datetime.now().__str__(), ""]
+    lines.append("Phases:")
+    for name, seconds in phaseTimes:
+        lines.append("    {:>9.1f} ms  {}".format(seconds * 1000, name))
+
+    lines.append("")
+    lines.append("Total import time: {:.1f} ms (budget {:.1f} ms)".format(totalImportTime * 1000, startupImportBudget * 1000))
+    lines.append("Slowest imports (inclusive):")
+    slowestImports = sorted(importTimes.items(), key=lambda item: item[1][0], reverse=True)[:maxReportedModules]
+    for name, (importTime, depth) in slowestImports:
+        lines.append("    {:>9.1f} ms  {}{}".format(importTime * 1000, "  " * depth, name))
+
+    try:
+        with open(startupReportLocation, "w") as reportFile:
+            reportFile.write("\n".join(lines))
+            reportFile.write("\n")
+    except:
+        ConsoleLog.error("Startup Report", "Unable to write startup report to " + startupReportLocation)
+
+    summary = "Imports: {:.1f} ms".format(totalImportTime * 1000)
+    for name, seconds in phaseTimes:
+        summary += ", " + name + ": {:.1f} ms".format(seconds * 1000)
+
+    if totalImportTime > startupImportBudget:   # Flag import time regressions
+        ConsoleLog.warning("Startup Import Budget Exceeded", summary)
+    else:
+        ConsoleLog.log("Startup", summary)
@@ -40,7 +40,8 @@ def GetFileType(string:str):
     return  split_tup[1]
 
 def CheckFileExists(filePath:str):
-    return os.path.exists(filePath)
+    from Utility.FileMetadata import FileExists     # Imported on use, as Settings imports this file
+    return FileExists(filePath)   # Uses the cached result if the file was recently checked
 
 def openFile(file):
     if sys.platform == 'linux2':
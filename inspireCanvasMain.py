@@ -8,6 +8,11 @@ Date Updated: 9/28/22
 
 # --Imports--
 import sys
+import multiprocessing
+
+# Startup Profiler - This is imported first, so every following import is timed.
+from Utility import StartupProfiler
+StartupProfiler.Start()
 
 #PySide
 from PySide6.QtGui import *
@@ -19,6 +24,7 @@ from Settings.settings import *
 
 #Components Used:
 from UI_Components.mainContent import *
+from UI_Components.Canvas.CanvasUtility.RenderCache import ReservePixmapCache
 from Utility.SideGrips import *
 
 
@@ -32,7 +38,7 @@ class MainWindow(QMainWindow):
         super(MainWindow, self).__init__(*args, **kwargs)
 
         # Set Attributes
-        self.setWindowTitle("Inspire Canvas")
+        self.setWindowTitle("Inspire Canvas[*]")   # [*] is replaced with * when the project has unsaved changes
         self.setWindowIcon(QIcon(softwareIconLocation))
         self.resize(startingWindowSize[0], startingWindowSize[1])   # Set default window size to window size set in settings
         self.setMinimumSize(650,400)
@@ -62,6 +68,11 @@ class MainWindow(QMainWindow):
         self.mainContent = MainContent(self)
         self.setCentralWidget(self.mainContent)
 
+    def closeEvent(self, event):
+        """Save a snapshot of the canvas, which is displayed on the next startup while the project loads"""
+        self.mainContent.SaveSnapshot()
+        return super().closeEvent(event)
+
     # Grips and Side grips
     def resizeEvent(self, event):
         """On resize, move grips"""
@@ -131,10 +142,14 @@ class MainWindow(QMainWindow):
 
 # Execute software.
 if __name__ == "__main__":
+    multiprocessing.freeze_support()    # In the packaged app, worker processes (See Utility/BulkImport.py) run this file. This runs the worker instead of opening a window
     app = QApplication(sys.argv)
+    ReservePixmapCache()    # CanvasItem render caches are stored in the QPixmapCache (See UI_Components/Canvas/CanvasUtility/RenderCache.py)
 
     window = MainWindow()
     window.show()
+    StartupProfiler.MarkPhase("Window shown")
 
+    QTimer.singleShot(0, window.mainContent.InitializeProject)  # Load the project after the first frame is shown
     app.exec()
 